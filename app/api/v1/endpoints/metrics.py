@@ -25,6 +25,14 @@ def get_metrics_summary(
         translations_completed = metrics.get_counter("translation.completed")
         translations_failed = metrics.get_counter("translation.failed")
         
+        # OCR cache metrics
+        ocr_cache_hits = metrics.get_counter("ocr.cache.hit")
+        ocr_cache_misses = metrics.get_counter("ocr.cache.miss")
+        
+        # Translation memory metrics
+        tm_hits = metrics.get_counter("translation_memory.hit")
+        tm_misses = metrics.get_counter("translation_memory.miss")
+        
         # Timing metrics
         translation_timing = metrics.get_timing_stats("translation.duration")
         api_timing = metrics.get_timing_stats("api.duration")
@@ -41,6 +49,14 @@ def get_metrics_summary(
                     "completed": translations_completed,
                     "failed": translations_failed,
                     "timing": translation_timing
+                },
+                "translation_memory": {
+                    "hits": tm_hits,
+                    "misses": tm_misses
+                },
+                "ocr": {
+                    "cache_hits": ocr_cache_hits,
+                    "cache_misses": ocr_cache_misses
                 }
             },
             "Metrics retrieved"
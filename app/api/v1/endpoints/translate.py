@@ -25,10 +25,12 @@ from app.operations.translation_manager import (
 from app.operations.batch_translation_manager import batch_translation_task
 from app.services.url_generator import URLGenerator
 from app.services.language_detector import LanguageDetector
+from app.services.blob_store import BlobStore, detect_content_type
 from app.core.rate_limit import rate_limit
 from app.core.metrics import metrics
 from app.core.enums import TranslateType
 from datetime import datetime
+import base64
 import uuid
 import time
 
@@ -195,6 +197,24 @@ def get_status(
     )
 
 
+def _page_url(blob_store: BlobStore, page_data: str) -> str:
+    """URL for a result page: CDN URL of the blob, or an inline data URL"""
+    if not blob_store.is_ref(page_data):
+        # Result stored before the blob store (base64 page)
+        return f"data:image/jpeg;base64,{page_data}"
+    url = blob_store.url(page_data)
+    if url:
+        return url
+    page_bytes = blob_store.get(page_data)
+    if page_bytes is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Page image not found"
+        )
+    encoded = base64.b64encode(page_bytes).decode('utf-8')
+    return f"data:{detect_content_type(page_bytes)};base64,{encoded}"
+
+
 @router.get("/result/{task_id}", response_model=BaseResponse[ChapterResponse])
 def get_result(
     task_id: str,
@@ -228,7 +248,7 @@ def get_result(
     
     # Build response
     result = job.result_data
-    pages_data = result.get("pages", [])
+    pages_data = result.get("page_refs") or result.get("pages", [])
     blocks_data = result.get("blocks", [])
     original_texts = result.get("original_texts", [])
     translated_texts = result.get("translated_texts", [])
@@ -236,6 +256,7 @@ def get_result(
     # Build pages
     pages = []
     text_index = 0
+    blob_store = BlobStore()
     
     for page_idx, page_data in enumerate(pages_data):
         page_blocks = blocks_data[page_idx]["blocks"] if page_idx < len(blocks_data) else []
@@ -253,7 +274,7 @@ def get_result(
         
         pages.append({
             "index": page_idx,
-            "processed_url": f"data:image/jpeg;base64,{page_data}",
+            "processed_url": _page_url(blob_store, page_data),
             "original_text": page_original,
             "translated_text": page_translated,
             "bubbles": [{"x": b["coords"][0], "y": b["coords"][1], 
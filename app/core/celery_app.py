@@ -2,6 +2,7 @@
 Celery Application Configuration
 """
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 from app.core.config import settings
 
 celery_app = Celery(
@@ -12,6 +13,7 @@ celery_app = Celery(
         "app.tasks.translation_tasks",
         "app.tasks.scraping_tasks",
         "app.tasks.notification_tasks",
+        "app.tasks.maintenance_tasks",
         "app.operations.translation_manager",  # Include translation manager tasks
         "app.operations.batch_translation_manager"  # Include batch translation tasks
     ]
@@ -29,6 +31,9 @@ celery_app.conf.update(
     task_soft_time_limit=25 * 60,  # 25 minutes
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=1000,
+    # Warmup runs inside worker_process_init and gives up after WARMUP_TIMEOUT;
+    # give it that long (plus the Redis announcement) before the child is considered dead
+    worker_proc_alive_timeout=settings.WARMUP_TIMEOUT + 30.0 if settings.WARMUP_ENABLED else 4.0,
 )
 
 # Task routes
@@ -37,5 +42,49 @@ celery_app.conf.task_routes = {
     "app.tasks.scraping_tasks.*": {"queue": "scraping"},
     "app.tasks.notification_tasks.*": {"queue": "notifications"},
     "batch_translation_task": {"queue": "translation"},  # Batch translation tasks
+    "batch_chapter_task": {"queue": "translation"},  # One chapter of a batch
+    "finalize_batch_translation_task": {"queue": "translation"},  # Batch result aggregation
     "process_chapter_task": {"queue": "translation"},  # Chapter translation tasks
+    "cleanup_blob_store": {"queue": "translation"},  # Runs where the page blobs are written
 }
+
+# Periodic tasks (celery beat)
+celery_app.conf.beat_schedule = {
+    "cleanup-blob-store": {
+        "task": "cleanup_blob_store",
+        "schedule": settings.BLOB_STORE_CLEANUP_INTERVAL,
+    },
+}
+
+
+@worker_process_init.connect
+def _warmup_worker_process(**kwargs):
+    """
+    Preload heavy singletons before the process accepts its first task
+    
+    The pool only hands tasks to a child once this handler returns, so chapter
+    tasks never land on a cold process (including children recycled by
+    worker_max_tasks_per_child).
+    """
+    if not settings.WARMUP_ENABLED:
+        return
+    from app.core.warmup import warmup_worker
+    warmup_worker()
+
+
+@worker_process_shutdown.connect
+def _withdraw_worker_readiness(**kwargs):
+    """Remove this process from the ready workers"""
+    if not settings.WARMUP_ENABLED:
+        return
+    from app.core.warmup import mark_not_ready
+    mark_not_ready()
+
+
+@worker_process_shutdown.connect
+def _shutdown_scraping(**kwargs):
+    """Close the process's scraping runtime and stop its pooled Chrome sessions"""
+    from app.services.scraping_runtime import shutdown_scraping_runtime
+    from app.services.scrapers.browser_pool import shutdown_browser_pool
+    shutdown_scraping_runtime()
+    shutdown_browser_pool()
@@ -2,7 +2,7 @@
 Application Configuration
 """
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 from pathlib import Path
 
 
@@ -29,6 +29,34 @@ class Settings(BaseSettings):
     # OpenAI
     OPENAI_API_KEY: str
     OPENAI_MODEL: str = "gpt-4o-mini"
+    AI_CONCURRENT_CHUNKING: bool = True  # Translate large-chapter chunks in parallel
+    AI_CHUNK_CONCURRENCY: int = 4  # Max chunks in flight at once
+    AI_GLOSSARY_MAX_TERMS: int = 100  # Max names in the chapter glossary pass
+    
+    # Batch translation (chapters fan out as a Celery chord)
+    BATCH_MAX_CONCURRENT_CHAPTERS: int = 4  # Chapters of one batch running at once, one task chain each (0 = no cap)
+    
+    # Translation Memory (segment-level reuse across chapters)
+    TRANSLATION_MEMORY_ENABLED: bool = True
+    TRANSLATION_MEMORY_TTL: int = 86400 * 90  # 90 days
+    
+    # Hugging Face (free translation, MarianMT models)
+    HF_BATCH_SIZE: int = 16  # Segments per generate() call
+    HF_MAX_LENGTH: int = 512  # Max tokens per segment (input and output)
+    HF_QUANTIZE_INT8: bool = False  # Dynamic int8 quantization of Linear layers (CPU only)
+    HF_MODEL_NAME_TEMPLATE: str = "Helsinki-NLP/opus-mt-{src}-{tgt}"  # Model per language pair
+    HF_MODEL_CACHE_MAX_MB: int = 2048  # Memory budget for loaded models, LRU eviction (0 = unbounded)
+    HF_PREWARM_PAIRS: List[str] = []  # Pairs loaded at worker boot, e.g. ["en-tr"]
+    HF_LOAD_MAX_ATTEMPTS: int = 3  # Failed loads before a pair is marked unavailable for the process
+    HF_LOAD_RETRY_SECONDS: int = 60  # Wait before retrying a failed load (doubles per failure)
+    
+    # Worker warmup (preload models on Celery worker process start)
+    WARMUP_ENABLED: bool = True  # Disable on workers that only consume the scraping/notification queues
+    WARMUP_OCR: bool = True  # Load the EasyOCR reader (or OCR process pool)
+    WARMUP_NER_LANGUAGES: List[str] = ["en"]  # spaCy models to load
+    WARMUP_BROWSERS: int = 0  # Chrome sessions started up front (scraping workers)
+    WARMUP_TIMEOUT: float = 300.0  # Seconds a worker process waits for warmup steps (the rest are skipped)
+    WORKER_READY_TTL: int = 60  # Readiness announcement TTL in Redis, refreshed every third of it (seconds)
     
     # Stripe
     STRIPE_SECRET_KEY: str = ""
@@ -42,17 +70,91 @@ class Settings(BaseSettings):
     STORAGE_PATH: str = "./storage"
     CACHE_PATH: str = "./cache"
     FONTS_PATH: str = "./fonts"
+    BLOB_STORE_BACKEND: str = "local"  # Page blobs in task results: "local" or "cdn"
+    BLOB_STORE_PATH: str = "./storage/blobs"  # Content-addressed page blobs (local backend)
+    BLOB_STORE_TTL: int = 86400 * 31  # Blobs no job references are deleted after this long unused (> 30-day result cache TTL, 0 = keep)
+    BLOB_STORE_CLEANUP_INTERVAL: int = 3600  # Seconds between blob store sweeps (Celery beat)
     
     # OCR Settings
     OCR_LANGUAGES: List[str] = ["en"]  # Add "tr" if needed
     OCR_GPU: bool = False
+    OCR_BACKEND: str = "easyocr"  # "easyocr", "easyocr_batched" or "opencv_dnn" (see ocr_backends)
+    OCR_BACKEND_FREE: str = ""  # Backend for Free translation jobs ("" = OCR_BACKEND)
+    OCR_BACKEND_BY_LANGUAGE: Dict[str, str] = {}  # Source language -> backend, e.g. {"ko": "easyocr"}
+    OCR_BACKEND_BY_SERIES: Dict[str, str] = {}  # Series name -> backend
+    OCR_RECOGNIZER_BATCH_SIZE: int = 32  # Crops per recognizer forward pass (easyocr_batched)
+    OCR_BATCH_PAGES: int = 8  # Pages whose crops share recognizer batches in a chapter (easyocr_batched)
+    OCR_CV_DETECTOR: str = "db"  # opencv_dnn detector: "db" or "east"
+    OCR_CV_DETECTOR_MODEL: str = ""  # DB/EAST model file
+    OCR_CV_RECOGNIZER_MODEL: str = ""  # CRNN ONNX model file
+    OCR_CV_VOCABULARY: str = ""  # Recognizer alphabet (one symbol per line)
+    OCR_CV_MAX_SIDE: int = 1280  # Longest detector input side
+    OCR_PROCESS_POOL: bool = False  # Run EasyOCR in a process pool (scales with CPU cores)
+    OCR_POOL_WORKERS: int = 0  # Pool size (0 = number of CPU cores)
+    OCR_POOL_TORCH_THREADS: int = 1  # torch intra-op threads per pool worker
+    OCR_TILING_ENABLED: bool = True  # OCR tall strips in overlapping tiles
+    OCR_TILE_HEIGHT: int = 2000  # Tile height (pages taller than this are tiled)
+    OCR_TILE_OVERLAP: int = 200  # Rows shared by adjacent tiles (must exceed a text line)
+    OCR_TILE_WORKERS: int = 2  # Tiles OCR'd concurrently with the in-process reader
+    BUBBLE_GROUPING_ENABLED: bool = True  # Merge OCR lines of a speech bubble into one block
+    BUBBLE_LINE_GAP: float = 0.8  # Max gap between lines of a bubble (x line height)
+    BUBBLE_MAX_HEIGHT_RATIO: float = 1.8  # Lines of more different heights stay separate
+    TEXT_PRECHECK_ENABLED: bool = True  # Skip OCR/in-painting for pages classified as textless
+    TEXT_PRECHECK_WIDTH: int = 400  # Pages are classified downscaled to this width
+    TEXT_PRECHECK_BLANK_RANGE: int = 24  # Gray-level range below which a page is blank
+    TEXT_PRECHECK_MIN_EDGES: int = 20  # Edge pixels below which a page is textless
+    OCR_MIN_CONFIDENCE: float = 0.5  # Drop OCR results below this confidence
+    OCR_CACHE_ENABLED: bool = True  # Cache OCR results by page image hash
+    OCR_CACHE_TTL: int = 86400 * 30  # OCR cache TTL in seconds (30 days)
     
     # Image Processing
     DEFAULT_FONT_SIZE: int = 20
     MIN_FONT_SIZE: int = 10
     MAX_FONT_SIZE: int = 40
+    IMAGE_WORKERS: int = 0  # Pages cleaned/rendered concurrently (0 = CPUs available to the worker)
+    IMAGE_CV2_THREADS: int = 1  # OpenCV threads per page (pages already run in parallel)
+    PROGRESS_UPDATE_INTERVAL_MS: int = 500  # Min interval between per-page task progress updates
+    PIPELINE_MAX_DECODED_MB: int = 1024  # Decoded cleaned pages kept per chapter for rendering
+    INPAINT_ROI_MARGIN: int = 16  # Context pixels around each in-painted region
+    INPAINT_MERGE_GAP: int = 24  # Text blocks closer than this share one region
+    INPAINT_FLAT_STD: float = 8.0  # Max color std around text for the flat-fill fast path
     USE_WEBP: bool = True  # Use WebP format for better compression
     IMAGE_QUALITY: int = 90  # WebP/JPEG quality (0-100)
+    # Encode profiles per output kind (final page, cleaned intermediate, thumbnail)
+    # FORMAT: "webp", "avif", "png" (lossless) or "jpeg"; "" = WebP/JPEG per USE_WEBP
+    # QUALITY: 0 = IMAGE_QUALITY; METHOD: WebP effort 0 (fastest) - 6 (smallest)
+    ENCODE_FINAL_FORMAT: str = ""
+    ENCODE_FINAL_QUALITY: int = 0
+    ENCODE_FINAL_METHOD: int = 6
+    ENCODE_CLEANED_FORMAT: str = ""
+    ENCODE_CLEANED_QUALITY: int = 0
+    ENCODE_CLEANED_METHOD: int = 2
+    ENCODE_THUMBNAIL_FORMAT: str = ""
+    ENCODE_THUMBNAIL_QUALITY: int = 75
+    ENCODE_THUMBNAIL_METHOD: int = 4
+    ENCODE_THUMBNAIL_MAX_WIDTH: int = 320
+    ENCODE_AVIF_SPEED: int = 8  # AVIF encoder speed 0 (slowest) - 10 (fastest)
+    ENCODE_PNG_COMPRESS_LEVEL: int = 1  # zlib level for lossless PNG (1 = fast)
+    
+    # Scraping (Chrome sessions for Cloudflare-protected sites)
+    BROWSER_POOL_SIZE: int = 1  # Concurrent Chrome sessions per worker process
+    BROWSER_MAX_PAGES: int = 50  # Page loads before a session is recycled
+    BROWSER_LEASE_TIMEOUT: float = 300.0  # Seconds before a held session is reclaimed
+    BROWSER_ACQUIRE_TIMEOUT: float = 120.0  # Seconds a task waits for a free session
+    BROWSER_MAX_RESTARTS: int = 3  # Unhealthy sessions replaced within one lease before giving up
+    BROWSER_HEADLESS: str = "auto"  # "auto" (headless in Celery workers), "true" or "false"
+    BROWSER_READY_TIMEOUT: float = 20.0  # Max seconds waiting for a page (Cloudflare challenge + reader images)
+    CLOUDFLARE_CLEARANCE_TTL: int = 1800  # Max seconds cf_clearance cookies are reused over httpx (0 = off)
+    SCRAPER_HTTP2: bool = True  # HTTP/2 for scraper clients (needs the h2 package)
+    SCRAPER_MAX_CONNECTIONS_PER_HOST: int = 6  # Concurrent page downloads per host
+    SCRAPER_DOWNLOAD_ATTEMPTS: int = 3  # Attempts per page (connection errors, 429, 5xx)
+    SCRAPER_RETRY_DELAY: float = 1.0  # First retry delay in seconds (doubles per attempt)
+    SCRAPER_KEEPALIVE_EXPIRY: float = 120.0  # Idle seconds before a kept-alive connection is closed
+    SOURCE_CACHE_ENABLED: bool = True  # On-disk cache of source pages and chapter HTML (shared by a host's workers)
+    SOURCE_CACHE_PATH: str = "./cache/sources"
+    SOURCE_CACHE_MAX_MB: int = 2048  # Least recently used entries are evicted beyond this size
+    SOURCE_CACHE_MAX_AGE: int = 86400  # Freshness of images without Cache-Control max-age (then revalidated)
+    SOURCE_CACHE_HTML_MAX_AGE: int = 3600  # Freshness of chapter HTML before revalidation
     
     # CDN Settings (S3/MinIO)
     CDN_ENABLED: bool = False  # Enable CDN for image storage
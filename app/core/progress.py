@@ -0,0 +1,55 @@
+"""
+Task Progress - Coalesced Celery progress updates
+"""
+import time
+from typing import Any, Optional
+from loguru import logger
+from app.core.config import settings
+
+
+class ProgressReporter:
+    """
+    Coalesces Celery task progress updates
+    
+    Every update_state call is a round-trip to the result backend (Redis),
+    and long chapters used to send one per page. Updates arriving within
+    PROGRESS_UPDATE_INTERVAL_MS of the last one sent are dropped; forced
+    updates (stage changes, the last page) are always sent.
+    """
+    
+    def __init__(self, task: Any, interval_ms: Optional[int] = None):
+        """
+        Args:
+            task: Bound Celery task (self inside a bind=True task)
+            interval_ms: Min interval between updates (default: PROGRESS_UPDATE_INTERVAL_MS)
+        """
+        self.task = task
+        interval_ms = settings.PROGRESS_UPDATE_INTERVAL_MS if interval_ms is None else interval_ms
+        self.interval = interval_ms / 1000
+        self._last_sent = 0.0
+    
+    def update(self, progress: int, message: str, force: bool = False, **meta) -> bool:
+        """
+        Send a PROCESSING progress update unless one was sent too recently
+        
+        Args:
+            progress: Progress percentage
+            message: Progress message
+            force: Send regardless of the interval
+            **meta: Extra fields for the task meta
+        
+        Returns:
+            Whether the update was sent
+        """
+        now = time.monotonic()
+        if not force and now - self._last_sent < self.interval:
+            return False
+        self._last_sent = now
+        try:
+            self.task.update_state(
+                state='PROCESSING',
+                meta={'progress': progress, 'message': message, **meta}
+            )
+        except Exception as e:
+            logger.warning(f"Error updating task progress: {e}")
+        return True
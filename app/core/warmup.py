@@ -0,0 +1,210 @@
+"""
+Worker Warmup - Preloads heavy singletons when a Celery worker process starts
+"""
+import json
+import os
+import socket
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+import redis
+from loguru import logger
+from app.core.config import settings
+from app.core.metrics import metrics
+
+# Set when this process withdraws its readiness (stops the heartbeat)
+_heartbeat_stop = threading.Event()
+# Keeps a heartbeat refresh from re-creating a withdrawn readiness key
+_announce_lock = threading.Lock()
+
+# Load time of each warmup step in this process (seconds)
+_timings: Dict[str, float] = {}
+
+
+def _ready_key() -> str:
+    """Redis key announcing this worker process as warm"""
+    return f"webtoon:worker:ready:{socket.gethostname()}:{os.getpid()}"
+
+
+def _redis_client():
+    """Redis client for readiness announcements (None if unavailable)"""
+    try:
+        return redis.from_url(settings.REDIS_URL, decode_responses=True)
+    except Exception as e:
+        logger.warning(f"Redis connection failed for worker readiness: {e}")
+        return None
+
+
+def _warm_ocr():
+    """Default OCR backend (or the OCR process pool with one reader per worker)"""
+    from app.services.ocr_backends import get_backend
+    from app.services.ocr_service import get_ocr_process_pool, warm_ocr_process_pool
+    if settings.OCR_PROCESS_POOL and get_ocr_process_pool() is not None:
+        warm_ocr_process_pool()
+    else:
+        get_backend(settings.OCR_BACKEND)
+
+
+def _warm_translation_models():
+    """Hugging Face translation pipelines for HF_PREWARM_PAIRS"""
+    from app.services.hf_model_registry import hf_model_registry
+    hf_model_registry.prewarm()
+
+
+def _warm_ner():
+    """spaCy models for WARMUP_NER_LANGUAGES"""
+    from app.services.advanced_ner_service import AdvancedNERService
+    for language in settings.WARMUP_NER_LANGUAGES:
+        AdvancedNERService(language=language)
+
+
+def _warm_fonts():
+    """Font discovery for text rendering"""
+    from app.services.image_processor import ImageProcessor
+    ImageProcessor()
+
+
+def _warm_browsers():
+    """Chrome sessions for Cloudflare-protected scrapers"""
+    from app.services.scrapers.browser_pool import get_browser_pool
+    get_browser_pool().warm(settings.WARMUP_BROWSERS)
+
+
+def _warmup_steps() -> List[Tuple[str, Callable[[], None]]]:
+    """Configured warmup steps as (name, loader) pairs"""
+    steps = []
+    if settings.WARMUP_OCR:
+        steps.append(("ocr", _warm_ocr))
+    if settings.HF_PREWARM_PAIRS:
+        steps.append(("translation_models", _warm_translation_models))
+    if settings.WARMUP_NER_LANGUAGES:
+        steps.append(("ner", _warm_ner))
+    if settings.WARMUP_BROWSERS > 0:
+        steps.append(("browsers", _warm_browsers))
+    steps.append(("fonts", _warm_fonts))
+    return steps
+
+
+def _run_step(step: Callable[[], None], timeout: float) -> bool:
+    """
+    Run a warmup step in a daemon thread, waiting at most timeout seconds
+    
+    Returns:
+        True if the step finished (its exception is re-raised), False on timeout
+    """
+    errors: List[Exception] = []
+    
+    def run():
+        try:
+            step()
+        except Exception as e:
+            errors.append(e)
+    
+    thread = threading.Thread(target=run, name="worker-warmup", daemon=True)
+    thread.start()
+    thread.join(max(0.0, timeout))
+    if thread.is_alive():
+        return False
+    if errors:
+        raise errors[0]
+    return True
+
+
+def warmup_worker() -> Dict[str, float]:
+    """
+    Preload the configured models in the current process
+    
+    Each step is timed and recorded as a "worker.warmup.<step>" timing metric.
+    A failing step is logged and skipped (that singleton is loaded lazily by
+    the first task instead). Warmup stops waiting once WARMUP_TIMEOUT is
+    spent: a step still running keeps loading in the background and the
+    remaining steps are skipped. The process is marked ready afterwards.
+    
+    Returns:
+        Load time of each step in seconds
+    """
+    total_start = time.time()
+    deadline = total_start + settings.WARMUP_TIMEOUT
+    for name, step in _warmup_steps():
+        start = time.time()
+        try:
+            finished = _run_step(step, deadline - start)
+        except Exception as e:
+            logger.warning(f"Worker warmup step '{name}' failed: {e}")
+            continue
+        if not finished:
+            metrics.increment_counter("worker.warmup.timeout")
+            logger.warning(f"Worker warmup timed out after {settings.WARMUP_TIMEOUT:g}s in step '{name}', skipping the rest")
+            break
+        duration = time.time() - start
+        _timings[name] = duration
+        metrics.record_timing(f"worker.warmup.{name}", duration)
+        logger.info(f"Worker warmup: {name} loaded in {duration:.2f}s")
+    
+    total = time.time() - total_start
+    _timings["total"] = total
+    metrics.record_timing("worker.warmup.total", total)
+    mark_ready()
+    logger.info(f"Worker process {os.getpid()} warm in {total:.2f}s")
+    return dict(_timings)
+
+
+def _announce(client) -> bool:
+    """Write this process's readiness key (expires after WORKER_READY_TTL)"""
+    try:
+        client.setex(_ready_key(), settings.WORKER_READY_TTL, json.dumps(_timings))
+        return True
+    except Exception as e:
+        logger.warning(f"Error announcing worker readiness: {e}")
+        return False
+
+
+def _heartbeat(client):
+    """Refresh the readiness key until the process withdraws it"""
+    interval = max(1.0, settings.WORKER_READY_TTL / 3)
+    while not _heartbeat_stop.wait(interval):
+        with _announce_lock:
+            if _heartbeat_stop.is_set():
+                return
+            _announce(client)
+
+
+def mark_ready():
+    """
+    Announce this process as warm in Redis
+    
+    The key expires after WORKER_READY_TTL and is refreshed by a heartbeat
+    thread, so a process killed without running its shutdown hooks drops
+    out of the ready workers within one TTL.
+    """
+    client = _redis_client()
+    if client is None:
+        return
+    _heartbeat_stop.clear()
+    if _announce(client):
+        threading.Thread(target=_heartbeat, args=(client,), name="worker-ready-heartbeat", daemon=True).start()
+
+
+def mark_not_ready():
+    """Withdraw this process's readiness (e.g. on shutdown)"""
+    _heartbeat_stop.set()
+    client = _redis_client()
+    if client is None:
+        return
+    try:
+        with _announce_lock:
+            client.delete(_ready_key())
+    except Exception as e:
+        logger.warning(f"Error withdrawing worker readiness: {e}")
+
+
+def ready_workers() -> int:
+    """Number of warm worker processes announced in Redis"""
+    client = _redis_client()
+    if client is None:
+        return 0
+    try:
+        return sum(1 for _ in client.scan_iter("webtoon:worker:ready:*"))
+    except Exception as e:
+        logger.warning(f"Error counting ready workers: {e}")
+        return 0
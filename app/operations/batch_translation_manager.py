@@ -1,16 +1,27 @@
 """
 Batch Translation Manager - Handles multiple chapter translations
 """
-from typing import List, Dict, Optional
-import time
+import uuid
+from typing import List, Dict, Optional, Any
+import redis
+from celery import chain, chord
+from celery.exceptions import Ignore
 from loguru import logger
 from app.core.celery_app import celery_app
+from app.core.config import settings
 from app.operations.translation_manager import process_chapter_task
 from app.services.url_generator import URLGenerator
 from app.services.language_detector import LanguageDetector
 from app.services.file_manager import FileManager
+from app.services.blob_store import result_pages
 from app.core.enums import TranslateType
 
+try:
+    redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+except Exception as e:
+    logger.warning(f"Redis connection failed for batch translation: {e}")
+    redis_client = None
+
 
 @celery_app.task(bind=True, name="batch_translation_task")
 def batch_translation_task(
@@ -26,6 +37,15 @@ def batch_translation_task(
     """
     Process multiple chapters in batch
     
+    The batch fans out as a chord of BATCH_MAX_CONCURRENT_CHAPTERS lanes,
+    each a chain of batch_chapter_task (chapters dealt round-robin, so they
+    start in order), and finalize_batch_translation_task to aggregate the
+    results. A lane queues its next chapter only when the previous one is
+    done, which caps the chapters running at once without any waiting or
+    polling. This task replaces itself with the chord, so the batch task ID
+    resolves to the aggregated result and no worker is blocked waiting on
+    chapters.
+    
     Args:
         base_url: Base URL pattern
         chapter_numbers: List of chapter numbers to translate
@@ -53,170 +73,48 @@ def batch_translation_task(
         logger.info(f"[DEBUG] Generated {len(chapter_urls)} URLs: {chapter_urls[:3]}..." if len(chapter_urls) > 3 else f"[DEBUG] Generated URLs: {chapter_urls}")
         
         total_chapters = len(chapter_urls)
-        results = {}
-        completed = 0
-        failed = 0
+        if not total_chapters:
+            return finalize_batch_translation_task([], batch_id=self.request.id, series_name=series_name)
         
-        logger.info(f"[DEBUG] Starting batch translation: {total_chapters} chapters")
+        self.update_state(
+            state='PROCESSING',
+            meta={
+                'progress': 0,
+                'message': f'Queued {total_chapters} chapters...',
+                'completed_chapters': 0,
+                'total_chapters': total_chapters
+            }
+        )
         
-        # Process each chapter
-        for idx, (chapter_num, chapter_url) in enumerate(zip(chapter_numbers, chapter_urls)):
-            try:
-                self.update_state(
-                    state='PROCESSING',
-                    meta={
-                        'progress': int((idx / total_chapters) * 100),
-                        'message': f'Processing chapter {chapter_num}/{chapter_numbers[-1]}...',
-                        'current_chapter': chapter_num,
-                        'total_chapters': total_chapters
-                    }
-                )
-                
-                logger.info(f"[DEBUG] Processing chapter {chapter_num}: {chapter_url}")
-                
-                # Start translation task for this chapter
-                logger.info(f"[DEBUG] Starting process_chapter_task for chapter {chapter_num}")
-                task = process_chapter_task.delay(
-                    chapter_url=chapter_url,
-                    target_lang=target_lang,
-                    source_lang=source_lang,
-                    mode=mode,
-                    use_cache=(translate_type == TranslateType.AI),  # Use Cached Input only for AI
-                    series_name=series_name,
-                    translate_type=translate_type
-                )
-                logger.info(f"[DEBUG] Chapter {chapter_num} task started with task_id: {task.id}")
-                
-                # Wait for completion using AsyncResult (Celery best practice)
-                # Cannot use .get() within a task - use AsyncResult polling instead
-                logger.info(f"[DEBUG] Waiting for chapter {chapter_num} to complete (timeout: 600s)")
-                try:
-                    import time
-                    from celery.result import AsyncResult
-                    async_result = AsyncResult(task.id, app=celery_app)
-                    
-                    # Poll for result (don't use .get() directly in task)
-                    # Increased timeout: 20 minutes per chapter (Cloudflare + translation can take time)
-                    task_result = None
-                    max_wait = 1200  # 20 minutes = 1200 seconds
-                    for wait_count in range(max_wait):
-                        if async_result.ready():
-                            if async_result.successful():
-                                task_result = async_result.result
-                                break
-                            else:
-                                error_info = async_result.info
-                                raise Exception(f"Task failed: {error_info}")
-                        time.sleep(1)  # Wait 1 second between checks
-                        
-                        # Log progress every 60 seconds
-                        if wait_count > 0 and wait_count % 60 == 0:
-                            logger.info(f"[DEBUG] Chapter {chapter_num} still processing... ({wait_count}/{max_wait} seconds)")
-                    
-                    if task_result is None:
-                        raise TimeoutError(f"Chapter {chapter_num} task timed out after {max_wait} seconds")
-                    
-                    logger.info(f"[DEBUG] Chapter {chapter_num} completed. Result type: {type(task_result)}, Keys: {list(task_result.keys()) if isinstance(task_result, dict) else 'Not a dict'}")
-                except Exception as e:
-                    logger.error(f"[DEBUG] Error getting task result for chapter {chapter_num}: {e}", exc_info=True)
-                    raise
-                
-                # Save to file system if series_name provided
-                if series_name and task_result and isinstance(task_result, dict):
-                    try:
-                        logger.info(f"[DEBUG] Saving chapter {chapter_num} to file system")
-                        file_manager = FileManager()
-                        pages_data = task_result.get("pages", [])
-                        logger.info(f"[DEBUG] Chapter {chapter_num} has {len(pages_data)} pages")
-                        
-                        if not pages_data or len(pages_data) == 0:
-                            logger.warning(f"[DEBUG] Chapter {chapter_num} has no pages data, skipping file save")
-                            results[chapter_num] = {
-                                "status": "completed",
-                                "task_id": task.id,
-                                "url": chapter_url,
-                                "warning": "No pages data in result"
-                            }
-                            completed += 1
-                            continue
-                        
-                        # Convert base64 to bytes
-                        import base64
-                        pages_bytes = []
-                        for idx, page in enumerate(pages_data):
-                            try:
-                                if isinstance(page, str):
-                                    pages_bytes.append(base64.b64decode(page))
-                                elif isinstance(page, bytes):
-                                    pages_bytes.append(page)
-                                else:
-                                    logger.warning(f"[DEBUG] Page {idx} of chapter {chapter_num} is not string or bytes, type: {type(page)}")
-                                    continue
-                            except Exception as e:
-                                logger.error(f"[DEBUG] Error decoding page {idx} of chapter {chapter_num}: {e}")
-                                raise
-                        
-                        if not pages_bytes:
-                            logger.warning(f"[DEBUG] No valid pages bytes for chapter {chapter_num}, skipping file save")
-                            results[chapter_num] = {
-                                "status": "completed",
-                                "task_id": task.id,
-                                "url": chapter_url,
-                                "warning": "No valid pages bytes"
-                            }
-                            completed += 1
-                            continue
-                        
-                        metadata = {
-                            "original_texts": task_result.get("original_texts", []),
-                            "translated_texts": task_result.get("translated_texts", []),
-                            "blocks": task_result.get("blocks", []),
-                            "source_lang": source_lang,
-                            "target_lang": target_lang
-                        }
-                        
-                        logger.info(f"[DEBUG] Saving chapter {chapter_num} with metadata keys: {list(metadata.keys())}")
-                        file_manager.save_chapter(
-                            series_name=series_name,
-                            chapter_number=chapter_num,
-                            pages=pages_bytes,
-                            metadata=metadata,
-                            source_lang=source_lang,
-                            target_lang=target_lang
-                        )
-                        logger.info(f"[DEBUG] Chapter {chapter_num} saved successfully to file system")
-                    except Exception as e:
-                        logger.error(f"[DEBUG] Failed to save chapter {chapter_num} to file: {e}", exc_info=True)
-                
-                results[chapter_num] = {
-                    "status": "completed",
-                    "task_id": task.id,
-                    "url": chapter_url
-                }
-                completed += 1
-                
-            except Exception as e:
-                logger.error(f"[DEBUG] Error processing chapter {chapter_num}: {e}", exc_info=True)
-                error_msg = str(e)
-                # Get more details if available
-                if hasattr(e, '__cause__') and e.__cause__:
-                    error_msg += f" (Cause: {str(e.__cause__)})"
-                results[chapter_num] = {
-                    "status": "failed",
-                    "error": error_msg,
-                    "url": chapter_url,
-                    "error_type": type(e).__name__
-                }
-                failed += 1
+        chapter_tasks = [
+            batch_chapter_task.s(
+                batch_id=self.request.id,
+                total_chapters=total_chapters,
+                chapter_num=chapter_num,
+                chapter_url=chapter_url,
+                source_lang=source_lang,
+                target_lang=target_lang,
+                mode=mode,
+                series_name=series_name,
+                translate_type=translate_type
+            )
+            for chapter_num, chapter_url in zip(chapter_numbers, chapter_urls)
+        ]
+        lanes = settings.BATCH_MAX_CONCURRENT_CHAPTERS
+        if lanes <= 0:
+            lanes = total_chapters
+        header = [chain(*chapter_tasks[lane::lanes]) for lane in range(min(lanes, total_chapters))]
+        callback = finalize_batch_translation_task.s(
+            batch_id=self.request.id,
+            series_name=series_name
+        )
         
-        return {
-            "total_chapters": total_chapters,
-            "completed": completed,
-            "failed": failed,
-            "results": results,
-            "series_name": series_name
-        }
+        logger.info(f"[DEBUG] Starting batch translation: {total_chapters} chapters (max {settings.BATCH_MAX_CONCURRENT_CHAPTERS} concurrent)")
+        return self.replace(chord(header, callback))
         
+    except Ignore:
+        # Raised by replace(): the chord now owns this task ID
+        raise
     except Exception as e:
         logger.error(f"Error in batch translation: {e}")
         self.update_state(
@@ -225,3 +123,236 @@ def batch_translation_task(
         )
         raise
 
+
+def _report_batch_progress(batch_id: str, total_chapters: int, chapter_num: int):
+    """Publish batch progress under the batch task ID"""
+    if redis_client is None:
+        return
+    try:
+        key = f"webtoon:batch:{batch_id}:done"
+        pipe = redis_client.pipeline()
+        pipe.incr(key)
+        pipe.expire(key, 86400)
+        done, _ = pipe.execute()
+        celery_app.backend.store_result(
+            batch_id,
+            {
+                'progress': int((done / total_chapters) * 100),
+                'message': f'Chapter {chapter_num} finished ({done}/{total_chapters})',
+                'current_chapter': chapter_num,
+                'completed_chapters': done,
+                'total_chapters': total_chapters
+            },
+            'PROCESSING'
+        )
+    except Exception as e:
+        logger.warning(f"Error reporting batch progress: {e}")
+
+
+def _store_chapter_result(task_id: str, result: Any, state: str):
+    """
+    Store the chapter pipeline's final state under its task ID
+    
+    process_chapter_task runs eagerly (apply()), which stores its progress
+    updates but not its return value, so the ID in the batch result would
+    otherwise stay PROCESSING.
+    """
+    try:
+        celery_app.backend.store_result(task_id, result, state)
+    except Exception as e:
+        logger.warning(f"Error storing chapter result {task_id}: {e}")
+
+
+def _save_chapter_result(
+    task_result: Dict[str, Any],
+    chapter_num: int,
+    series_name: str,
+    source_lang: str,
+    target_lang: str
+) -> Optional[str]:
+    """
+    Save a finished chapter to the file system
+    
+    Returns:
+        Warning message if nothing was saved, None otherwise
+    """
+    logger.info(f"[DEBUG] Saving chapter {chapter_num} to file system")
+    pages_data = task_result.get("page_refs") or task_result.get("pages", [])
+    logger.info(f"[DEBUG] Chapter {chapter_num} has {len(pages_data)} pages")
+    
+    if not pages_data:
+        logger.warning(f"[DEBUG] Chapter {chapter_num} has no pages data, skipping file save")
+        return "No pages data in result"
+    
+    # Load page bytes from the blob store
+    pages_bytes = result_pages(task_result)
+    if not pages_bytes:
+        logger.warning(f"[DEBUG] No valid pages bytes for chapter {chapter_num}, skipping file save")
+        return "No valid pages bytes"
+    
+    metadata = {
+        "original_texts": task_result.get("original_texts", []),
+        "translated_texts": task_result.get("translated_texts", []),
+        "blocks": task_result.get("blocks", []),
+        "source_lang": source_lang,
+        "target_lang": target_lang
+    }
+    
+    FileManager().save_chapter(
+        series_name=series_name,
+        chapter_number=chapter_num,
+        pages=pages_bytes,
+        metadata=metadata,
+        source_lang=source_lang,
+        target_lang=target_lang
+    )
+    logger.info(f"[DEBUG] Chapter {chapter_num} saved successfully to file system")
+    return None
+
+
+@celery_app.task(name="batch_chapter_task")
+def batch_chapter_task(
+    previous_entries: Optional[List[Dict[str, Any]]] = None,
+    *,
+    batch_id: str,
+    total_chapters: int,
+    chapter_num: int,
+    chapter_url: str,
+    source_lang: str = "en",
+    target_lang: str = "tr",
+    mode: str = "clean",
+    series_name: Optional[str] = None,
+    translate_type: int = TranslateType.AI
+) -> List[Dict[str, Any]]:
+    """
+    Translate one chapter of a batch, then save it
+    
+    The chapter pipeline runs in this worker (no second task to wait on).
+    Errors are returned as a "failed" entry instead of raised, so one bad
+    chapter does not stop its lane or fail the whole chord.
+    
+    Args:
+        previous_entries: Entries of the chapters before this one in the
+            lane (the previous task's return value in the chain)
+    
+    Returns:
+        Chapter entries of the lane so far, this chapter's last
+    """
+    entries = list(previous_entries or [])
+    entries.append(_translate_batch_chapter(
+        batch_id, total_chapters, chapter_num, chapter_url,
+        source_lang, target_lang, mode, series_name, translate_type
+    ))
+    return entries
+
+
+def _translate_batch_chapter(
+    batch_id: str,
+    total_chapters: int,
+    chapter_num: int,
+    chapter_url: str,
+    source_lang: str,
+    target_lang: str,
+    mode: str,
+    series_name: Optional[str],
+    translate_type: int
+) -> Dict[str, Any]:
+    """
+    Run the chapter pipeline for one batch chapter
+    
+    Returns:
+        Chapter entry for the batch result
+    """
+    chapter_task_id = str(uuid.uuid4())
+    try:
+        logger.info(f"[DEBUG] Processing chapter {chapter_num}: {chapter_url}")
+        chapter_task = process_chapter_task.apply(
+            kwargs={
+                "chapter_url": chapter_url,
+                "target_lang": target_lang,
+                "source_lang": source_lang,
+                "mode": mode,
+                "use_cache": (translate_type == TranslateType.AI),  # Use Cached Input only for AI
+                "series_name": series_name,
+                "translate_type": translate_type
+            },
+            task_id=chapter_task_id
+        )
+        task_result = chapter_task.get(disable_sync_subtasks=False)
+        _store_chapter_result(chapter_task_id, task_result, 'SUCCESS')
+        logger.info(f"[DEBUG] Chapter {chapter_num} completed. Keys: {list(task_result.keys()) if isinstance(task_result, dict) else 'Not a dict'}")
+        
+        entry = {
+            "status": "completed",
+            "task_id": chapter_task_id,
+            "url": chapter_url
+        }
+        
+        # Save to file system if series_name provided
+        if series_name and isinstance(task_result, dict):
+            try:
+                warning = _save_chapter_result(task_result, chapter_num, series_name, source_lang, target_lang)
+                if warning:
+                    entry["warning"] = warning
+            except Exception as e:
+                logger.error(f"[DEBUG] Failed to save chapter {chapter_num} to file: {e}", exc_info=True)
+        
+        return {"chapter": chapter_num, **entry}
+        
+    except Exception as e:
+        logger.error(f"[DEBUG] Error processing chapter {chapter_num}: {e}", exc_info=True)
+        _store_chapter_result(chapter_task_id, e, 'FAILURE')
+        error_msg = str(e)
+        # Get more details if available
+        if hasattr(e, '__cause__') and e.__cause__:
+            error_msg += f" (Cause: {str(e.__cause__)})"
+        return {
+            "chapter": chapter_num,
+            "status": "failed",
+            "error": error_msg,
+            "url": chapter_url,
+            "error_type": type(e).__name__
+        }
+    finally:
+        _report_batch_progress(batch_id, total_chapters, chapter_num)
+
+
+@celery_app.task(name="finalize_batch_translation_task")
+def finalize_batch_translation_task(
+    lane_results: List[List[Dict[str, Any]]],
+    batch_id: Optional[str] = None,
+    series_name: Optional[str] = None
+) -> Dict:
+    """
+    Aggregate the chapter entries of a batch (chord callback)
+    
+    Args:
+        lane_results: Chapter entries of each lane (last batch_chapter_task of each chain)
+        batch_id: Batch task ID
+        series_name: Series name
+        
+    Returns:
+        Dictionary with results for each chapter
+    """
+    entries = sorted((entry for lane in lane_results for entry in lane), key=lambda entry: entry["chapter"])
+    results = {}
+    for entry in entries:
+        entry = dict(entry)
+        results[entry.pop("chapter")] = entry
+    completed = sum(1 for entry in results.values() if entry["status"] == "completed")
+    failed = len(results) - completed
+    
+    if redis_client is not None and batch_id:
+        try:
+            redis_client.delete(f"webtoon:batch:{batch_id}:done")
+        except Exception as e:
+            logger.warning(f"Error cleaning up batch state: {e}")
+    
+    logger.info(f"Batch translation finished: {completed} completed, {failed} failed")
+    return {
+        "total_chapters": len(results),
+        "completed": completed,
+        "failed": failed,
+        "results": results,
+        "series_name": series_name
+    }
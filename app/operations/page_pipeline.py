@@ -0,0 +1,239 @@
+"""
+Page Pipeline - Streams chapter pages through OCR and in-painting as they arrive
+"""
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from loguru import logger
+from app.core.config import settings
+from app.services.ocr_service import OCRService, _ocr_executor, group_text_blocks
+from app.services.image_processor import ImageProcessor, _image_executor
+
+
+class PagePipeline:
+    """
+    Page-level pipeline for a single chapter
+    
+    Instead of strict stage barriers (download all -> OCR all -> clean all),
+    each page enters OCR as soon as it is downloaded and is handed to
+    in-painting as soon as its OCR finishes. Only translation needs the
+    whole chapter's text, so callers collect the OCR blocks once the
+    download is done and render after translation.
+    
+    Each page is decoded once; the same array is used for OCR and in-painting,
+    and the cleaned array is kept (up to PIPELINE_MAX_DECODED_MB) so rendering
+    does not decode the lossy cleaned page again.
+    
+    Pages without text (textless by the pre-check, or no OCR blocks) skip
+    in-painting and pass through with their original bytes.
+    
+    With an OCR backend that pools recognition (easyocr_batched), pages are
+    OCR'd in groups of OCR_BATCH_PAGES so the recognizer batches the text
+    crops of several pages together; the last group is flushed by
+    collect_blocks().
+    
+    Usage:
+        pipeline = PagePipeline(ocr, processor, clean=True)
+        await scraper.fetch_chapter_images(url, on_page=pipeline.submit_page)
+        pages = pipeline.collect_pages()
+        blocks = pipeline.collect_blocks()
+        cleaned = pipeline.collect_cleaned()
+    """
+    
+    def __init__(self, ocr: OCRService, processor: ImageProcessor, clean: bool = True):
+        """
+        Args:
+            ocr: OCR service used for text detection
+            processor: Image processor used for in-painting
+            clean: Whether pages should be in-painted (clean mode)
+        """
+        self.ocr = ocr
+        self.processor = processor
+        self.clean = clean
+        self._lock = threading.Lock()
+        self._pages: Dict[int, bytes] = {}
+        self._ocr_futures: Dict[int, Future] = {}
+        self._clean_futures: Dict[int, Future] = {}
+        self._cleaned_images: Dict[int, np.ndarray] = {}
+        self._retained_bytes = 0
+        # Pages waiting for a batched OCR job (batch mode only)
+        self._pending: List[int] = []
+        # Pages classified as textless by the pre-check (OCR and in-painting skipped)
+        self.skipped_pages = 0
+    
+    def submit_page(self, index: int, image_bytes: bytes):
+        """
+        Feed a downloaded page into the pipeline (non-blocking)
+        
+        Args:
+            index: Page index within the chapter
+            image_bytes: Raw page bytes
+        """
+        with self._lock:
+            if index in self._pages:
+                return
+            self._pages[index] = image_bytes
+            if not self.ocr.supports_batch:
+                self._ocr_futures[index] = _ocr_executor.submit(self._ocr_page, index, image_bytes)
+                return
+            # Resolved by the batch job that OCRs this page
+            self._ocr_futures[index] = Future()
+            self._pending.append(index)
+            if len(self._pending) >= max(1, settings.OCR_BATCH_PAGES):
+                self._flush_pending()
+    
+    def _flush_pending(self):
+        """Submit the pending pages as one batched OCR job (caller holds the lock)"""
+        if self._pending:
+            _ocr_executor.submit(self._ocr_batch, self._pending)
+            self._pending = []
+    
+    def _prepare_page(self, image_bytes: bytes) -> Tuple[Optional[np.ndarray], bool]:
+        """Decode a page for OCR and in-painting and run the text pre-check"""
+        # Decode once and share the array between OCR and in-painting
+        image = self.processor.decode_image(image_bytes) if self.clean else None
+        if settings.TEXT_PRECHECK_ENABLED and not self.ocr.may_contain_text(image_bytes, image):
+            with self._lock:
+                self.skipped_pages += 1
+            return image, False
+        return image, True
+    
+    def _ocr_page(self, index: int, image_bytes: bytes) -> List[Dict]:
+        """OCR a page, then schedule its in-painting before returning the blocks"""
+        image, has_text = self._prepare_page(image_bytes)
+        blocks = self.ocr.detect_text_blocks(image_bytes, image=image) if has_text else []
+        return self._finish_page(index, image_bytes, image, blocks)
+    
+    def _ocr_batch(self, indices: List[int]):
+        """OCR a group of pages with shared recognition batches, resolving their futures"""
+        with self._lock:
+            futures = {idx: self._ocr_futures[idx] for idx in indices}
+        # Pages cancelled meanwhile are dropped from the batch
+        indices = [idx for idx in indices if futures[idx].set_running_or_notify_cancel()]
+        try:
+            prepared = {idx: self._prepare_page(self._pages[idx]) for idx in indices}
+            to_ocr = [idx for idx in indices if prepared[idx][1]]
+            detected = dict(zip(to_ocr, self.ocr.detect_text_blocks_batch(
+                [self._pages[idx] for idx in to_ocr],
+                images=[prepared[idx][0] for idx in to_ocr]
+            )))
+            for idx in indices:
+                blocks = self._finish_page(idx, self._pages[idx], prepared[idx][0], detected.get(idx, []))
+                futures[idx].set_result(blocks)
+        except Exception as e:
+            for idx in indices:
+                if not futures[idx].done():
+                    futures[idx].set_exception(e)
+    
+    def _finish_page(
+        self,
+        index: int,
+        image_bytes: bytes,
+        image: Optional[np.ndarray],
+        blocks: List[Dict]
+    ) -> List[Dict]:
+        """Group OCR lines into bubbles and schedule the page's in-painting"""
+        if blocks and settings.BUBBLE_GROUPING_ENABLED:
+            # Translate and render each speech bubble as one unit
+            blocks = group_text_blocks(blocks)
+        
+        if self.clean and not blocks:
+            # Nothing to in-paint: the original bytes pass through as the cleaned page
+            passthrough = Future()
+            passthrough.set_result(image_bytes)
+            with self._lock:
+                self._clean_futures[index] = passthrough
+        elif self.clean:
+            # Register the clean future before this OCR future resolves, so that
+            # collect_cleaned() always sees it once collect_blocks() has returned
+            with self._lock:
+                self._clean_futures[index] = _image_executor.submit(
+                    self._clean_page, index, image_bytes, image, blocks
+                )
+        return blocks
+    
+    def _clean_page(
+        self,
+        index: int,
+        image_bytes: bytes,
+        image: Optional[np.ndarray],
+        blocks: List[Dict]
+    ) -> bytes:
+        """In-paint a decoded page, keep the cleaned array for rendering, return encoded bytes"""
+        if image is None:
+            # Decode failed earlier; clean_image raises the decode error
+            return self.processor.clean_image(image_bytes, blocks)
+        
+        cleaned = self.processor.clean_page(image, blocks)
+        with self._lock:
+            if self._retained_bytes + cleaned.nbytes <= settings.PIPELINE_MAX_DECODED_MB * 1024 * 1024:
+                self._cleaned_images[index] = cleaned
+                self._retained_bytes += cleaned.nbytes
+        return self.processor.encode_page(cleaned, "cleaned")
+    
+    def _indices(self) -> List[int]:
+        with self._lock:
+            return sorted(self._pages.keys())
+    
+    def collect_pages(self) -> List[bytes]:
+        """Get the downloaded pages in chapter order"""
+        with self._lock:
+            return [self._pages[idx] for idx in sorted(self._pages.keys())]
+    
+    def collect_blocks(self) -> List[List[Dict]]:
+        """Wait for OCR of every submitted page and return blocks in chapter order"""
+        with self._lock:
+            self._flush_pending()
+        all_pages_blocks = []
+        for idx in self._indices():
+            try:
+                all_pages_blocks.append(self._ocr_futures[idx].result())
+            except Exception as e:
+                logger.error(f"OCR failed for page {idx + 1}: {e}")
+                all_pages_blocks.append([])
+        return all_pages_blocks
+    
+    def collect_cleaned(self) -> List[Optional[bytes]]:
+        """
+        Wait for in-painting of every page and return cleaned bytes in chapter order
+        
+        Must be called after collect_blocks(). Returns None entries when the
+        pipeline is not in clean mode.
+        """
+        if not self.clean:
+            return [None] * len(self._indices())
+        
+        cleaned = []
+        for idx in self._indices():
+            future = self._clean_futures.get(idx)
+            if future is None:
+                # OCR failed for this page, clean without blocks (re-encode)
+                future = _image_executor.submit(self.processor.clean_image, self._pages[idx], [])
+            cleaned.append(future.result())
+        return cleaned
+    
+    def take_cleaned_image(self, index: int) -> Optional[np.ndarray]:
+        """
+        Take the decoded cleaned page for rendering (released from the pipeline)
+        
+        Must be called after collect_cleaned(). Returns None if the array was
+        not kept (memory budget, decode failure or overlay mode); callers then
+        fall back to the encoded cleaned page.
+        """
+        with self._lock:
+            image = self._cleaned_images.pop(index, None)
+            if image is not None:
+                self._retained_bytes -= image.nbytes
+            return image
+    
+    def cancel(self):
+        """Cancel pending work (e.g. when the task fails or no text was found)"""
+        with self._lock:
+            self._pending = []
+            futures = list(self._ocr_futures.values()) + list(self._clean_futures.values())
+        for future in futures:
+            future.cancel()
+        with self._lock:
+            self._cleaned_images.clear()
+            self._retained_bytes = 0
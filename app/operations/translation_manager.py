@@ -3,14 +3,14 @@ Translation Manager - Orchestrates the translation pipeline
 """
 from celery import Celery
 from celery.result import AsyncResult
-import base64
-import asyncio
-from typing import Dict, Any, Optional
+from concurrent.futures import as_completed
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 from loguru import logger
 from app.core.config import settings
-from app.services.scraper_service import ScraperService
+from app.services.scraping_runtime import get_scraping_runtime
 from app.services.ocr_service import OCRService
+from app.services.ocr_backends import select_backend_name
 from app.services.ai_translator import AITranslator
 from app.services.free_translator import FreeTranslator
 from app.services.ner_service import NERService
@@ -18,9 +18,12 @@ from app.services.advanced_ner_service import AdvancedNERService
 from app.services.alternative_translator import AlternativeTranslator
 from app.services.dictionary_service import DictionaryService
 from app.core.enums import TranslateType, TranslationMode
-from app.services.image_processor import ImageProcessor
+from app.services.image_processor import ImageProcessor, _image_executor
 from app.services.cache_service import CacheService
+from app.services.blob_store import BlobStore
+from app.operations.page_pipeline import PagePipeline
 from app.core.metrics import metrics
+from app.core.progress import ProgressReporter
 import time
 
 # Import Celery app from core (use centralized app)
@@ -43,9 +46,9 @@ def process_chapter_task(
     
     This task orchestrates the entire translation process:
     1. Fetch images from URL
-    2. OCR to extract text
-    3. AI translation (context-aware)
-    4. Image processing (in-painting + text rendering)
+    2. OCR to extract text (starts per page while later pages download)
+    3. AI translation (context-aware, waits for the whole chapter's text)
+    4. Image processing (in-painting overlaps OCR, text rendering after translation)
     
     Args:
         chapter_url: URL of the webtoon chapter
@@ -54,9 +57,9 @@ def process_chapter_task(
         use_cache: Whether to use Cached Input
         
     Returns:
-        Dictionary with processed pages (base64 encoded)
+        Dictionary with page blob references (see BlobStore) and block metadata
     """
-    scraper = None
+    pipeline = None
     start_time = time.time()
     try:
         logger.info(f"[TASK START] process_chapter_task started for: {chapter_url}")
@@ -65,8 +68,13 @@ def process_chapter_task(
         # Initialize services
         logger.info("[TASK START] Initializing services...")
         cache_service = CacheService()
-        scraper = ScraperService()
-        ocr = OCRService()
+        # Worker-wide scrapers, event loop and connection pool
+        scraping = get_scraping_runtime()
+        ocr = OCRService(backend=select_backend_name(
+            series_name=series_name,
+            source_lang=source_lang,
+            free_tier=translate_type == TranslateType.FREE
+        ))
         logger.info("[TASK START] Services initialized")
         ai_translator = AITranslator() if translate_type == TranslateType.AI else None
         free_translator = FreeTranslator() if translate_type == TranslateType.FREE else None
@@ -76,6 +84,7 @@ def process_chapter_task(
         except:
             ner_service = NERService() if translate_type == TranslateType.FREE else None
         processor = ImageProcessor()
+        blob_store = BlobStore()
         
         # Get database session for dictionary (for both AI and Free translation)
         db = None
@@ -107,62 +116,61 @@ def process_chapter_task(
                 db.close()
             return cached_result
         
-        # Step 1: Fetch images
+        # Step 1+2: Fetch images and OCR them as they arrive (page pipeline)
+        # Each page enters OCR as soon as it is downloaded and in-painting as soon
+        # as its OCR is done; only translation waits for the whole chapter.
         self.update_state(
             state='PROCESSING',
             meta={'progress': 10, 'message': 'Resimler indiriliyor...'}
         )
         logger.info(f"[TASK] Fetching images from: {chapter_url}")
         
-        # Run async scraper in sync context
-        logger.info("[TASK] Creating event loop for async scraper...")
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        is_clean_mode = mode == TranslationMode.CLEAN or mode == "clean"
+        pipeline = PagePipeline(ocr, processor, clean=is_clean_mode)
+        
+        # Run async scraper on the worker's scraping loop
         try:
             logger.info("[TASK] Calling scraper.fetch_chapter_images...")
-            images_bytes = loop.run_until_complete(scraper.fetch_chapter_images(chapter_url))
-            logger.info(f"[TASK] Scraper returned {len(images_bytes) if images_bytes else 0} images")
+            fetched = scraping.run(
+                scraping.scraper.fetch_chapter_images(chapter_url, on_page=pipeline.submit_page)
+            )
+            logger.info(f"[TASK] Scraper returned {len(fetched) if fetched else 0} images")
         except Exception as e:
             logger.error(f"[TASK] Error in scraper: {e}", exc_info=True)
             raise
-        finally:
-            loop.close()
-            logger.info("[TASK] Event loop closed")
         
+        images_bytes = pipeline.collect_pages()
         if not images_bytes:
             raise ValueError("No images found")
         
         logger.info(f"Fetched {len(images_bytes)} images")
         
-        # Step 2: OCR - Extract text from all pages
         self.update_state(
             state='PROCESSING',
             meta={'progress': 30, 'message': 'OCR yapılıyor...'}
         )
         
-        all_pages_blocks = []
+        all_pages_blocks = pipeline.collect_blocks()
         flat_text_list = []
         
-        for idx, img_bytes in enumerate(images_bytes):
-            logger.debug(f"Processing OCR for page {idx + 1}/{len(images_bytes)}")
-            blocks = ocr.detect_text_blocks(img_bytes)
-            all_pages_blocks.append(blocks)
-            
+        for blocks in all_pages_blocks:
             for block in blocks:
                 flat_text_list.append(block['text'])
         
-        logger.info(f"Extracted {len(flat_text_list)} text blocks from {len(images_bytes)} pages")
+        logger.info(
+            f"Extracted {len(flat_text_list)} text blocks from {len(images_bytes)} pages "
+            f"({pipeline.skipped_pages} textless pages skipped)"
+        )
         
         if not flat_text_list:
             logger.warning("No text found in images")
+            pipeline.cancel()
             # Return original images if no text found
-            processed_images_base64 = [
-                base64.b64encode(img).decode('utf-8')
-                for img in images_bytes
-            ]
+            page_refs = [blob_store.put(img) for img in images_bytes]
             return {
-                "pages": processed_images_base64,
-                "total": len(processed_images_base64),
+                "page_refs": page_refs,
+                "total": len(page_refs),
+                "skipped_pages": pipeline.skipped_pages,
                 "message": "No text found in images"
             }
         
@@ -206,7 +214,8 @@ def process_chapter_task(
                 source_lang=source_lang,
                 target_lang=target_lang,
                 use_cache=use_cache,
-                glossary_dict=glossary_dict
+                glossary_dict=glossary_dict,
+                series_name=series_name
             )
             
             # Update dictionary with detected proper nouns (for future use)
@@ -262,7 +271,8 @@ def process_chapter_task(
             translated_flat = free_translator.translate_batch(
                 texts=texts_with_dict,
                 source_lang=source_lang,
-                target_lang=target_lang
+                target_lang=target_lang,
+                series_name=series_name
             )
             
             # Step 3c: Detect new proper nouns and add to dictionary
@@ -313,55 +323,74 @@ def process_chapter_task(
             state='PROCESSING',
             meta={'progress': 70, 'message': 'Görüntüler işleniyor...'}
         )
+        progress_reporter = ProgressReporter(self)
         
-        processed_images_base64 = []
-        cleaned_images_base64 = []  # Store cleaned images
-        text_cursor = 0
+        # Cleaned pages were in-painted by the pipeline while OCR/translation ran
+        cleaned_pages = pipeline.collect_cleaned()
         
-        # We need to collect raw cleaned bytes to save them via FileManager later
-        # (Though current flow returns result dict, the auto-publisher uses it)
-        # We'll encode them to base64 for the result dict
+        # Offset of each page's first text block in the flat translation list
+        page_offsets = []
+        text_cursor = 0
+        for blocks in all_pages_blocks:
+            page_offsets.append(text_cursor)
+            text_cursor += len(blocks)
         
-        for page_idx, img_bytes in enumerate(images_bytes):
+        def finish_page(page_idx: int) -> Tuple[str, Optional[str]]:
+            """Render a page and store it; returns (page_ref, cleaned_page_ref)"""
             logger.debug(f"Processing image {page_idx + 1}/{len(images_bytes)}")
             
             blocks = all_pages_blocks[page_idx]
-            block_count = len(blocks)
+            offset = page_offsets[page_idx]
             
             # Get translations for this page
-            page_translations = translated_flat[text_cursor:text_cursor + block_count]
-            text_cursor += block_count
+            page_translations = translated_flat[offset:offset + len(blocks)]
             
-            # 1. Clean image (always clean if mode is clean, or if we want to support editing)
             # We always generate cleaned image for "clean" mode to enable Editor support
-            if mode == TranslationMode.CLEAN or mode == "clean":
-                cleaned_bytes = processor.clean_image(img_bytes, blocks)
-                # Store cleaned image
-                cleaned_b64 = base64.b64encode(cleaned_bytes).decode('utf-8')
-                cleaned_images_base64.append(cleaned_b64)
+            if not is_clean_mode:
+                # Overlay mode - no cleaning, no cleaned image
+                return blob_store.put(images_bytes[page_idx]), None
                 
-                if page_translations:
-                    # Render text on cleaned image
-                    final_img_bytes = processor.render_text(cleaned_bytes, blocks, page_translations)
+            cleaned_bytes = cleaned_pages[page_idx]
+            # Store cleaned image
+            cleaned_ref = blob_store.put(cleaned_bytes)
+                
+            # Decoded cleaned page kept by the pipeline (no second decode/encode)
+            cleaned_image = pipeline.take_cleaned_image(page_idx)
+            
+            if page_translations:
+                # Render text on cleaned image
+                if cleaned_image is not None:
+                    final_img_bytes = processor.render_page(cleaned_image, blocks, page_translations)
                 else:
-                    final_img_bytes = cleaned_bytes
+                    final_img_bytes = processor.render_text(cleaned_bytes, blocks, page_translations)
             else:
-                # Overlay mode - no cleaning
-                final_img_bytes = img_bytes
-                cleaned_images_base64.append("")  # No cleaned image for overlay mode
+                final_img_bytes = cleaned_bytes
             
-            # Encode to base64
-            b64_str = base64.b64encode(final_img_bytes).decode('utf-8')
-            processed_images_base64.append(b64_str)
+            return blob_store.put(final_img_bytes), cleaned_ref
             
-            # Update progress
-            progress = 70 + int((page_idx + 1) / len(images_bytes) * 20)
-            self.update_state(
-                state='PROCESSING',
-                meta={'progress': progress, 'message': f'Sayfa {page_idx + 1}/{len(images_bytes)} işlendi...'}
-            )
+        # Pages are rendered concurrently on the image pool (one thread per CPU);
+        # pages go to the blob store and the result only carries their references
+        total_pages = len(images_bytes)
+        page_refs = [None] * total_pages
+        cleaned_page_refs = [None] * total_pages  # Store cleaned images
+        futures = {_image_executor.submit(finish_page, idx): idx for idx in range(total_pages)}
+        try:
+            for done, future in enumerate(as_completed(futures), start=1):
+                page_idx = futures[future]
+                page_refs[page_idx], cleaned_page_refs[page_idx] = future.result()
+                
+                # Update progress (coalesced, at most one backend write per interval)
+                progress_reporter.update(
+                    70 + int(done / total_pages * 20),
+                    f'Sayfa {done}/{total_pages} işlendi...',
+                    force=done == total_pages
+                )
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
         
-        logger.info(f"Successfully processed {len(processed_images_base64)} pages")
+        logger.info(f"Successfully processed {len(page_refs)} pages")
         
         # Metrics
         duration = time.time() - start_time
@@ -370,9 +399,10 @@ def process_chapter_task(
         
         # Final result
         result = {
-            "pages": processed_images_base64,
-            "cleaned_pages": cleaned_images_base64,  # New field
-            "total": len(processed_images_base64),
+            "page_refs": page_refs,
+            "cleaned_page_refs": cleaned_page_refs,
+            "total": len(page_refs),
+            "skipped_pages": pipeline.skipped_pages,
             "original_texts": flat_text_list,
             "translated_texts": translated_flat,
             "blocks": [
@@ -421,6 +451,8 @@ def process_chapter_task(
     except Exception as e:
         logger.error(f"Error in translation task: {e}", exc_info=True)
         metrics.increment_counter("translation.failed")
+        if pipeline:
+            pipeline.cancel()
         self.update_state(
             state='FAILED',
             meta={'progress': 0, 'error': str(e)}
@@ -432,14 +464,6 @@ def process_chapter_task(
             pass
         raise
     finally:
-        if scraper:
-            try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                loop.run_until_complete(scraper.close())
-                loop.close()
-            except:
-                pass
         # Close database session if opened
         if 'db' in locals() and db:
             try:
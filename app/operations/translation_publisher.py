@@ -11,8 +11,8 @@ from app.services.notification_service import NotificationService
 from app.services.series_manager import SeriesManager
 from app.core.database import SessionLocal
 from app.core.enums import TranslationStatus
+from app.services.blob_store import BlobStore, result_pages, result_cleaned_pages
 from pathlib import Path
-import base64
 import re
 
 
@@ -124,22 +124,14 @@ def publish_translation_on_completion(
         logger.info(f"Using series: {series.id} - {series.title} (new: {is_new_series})")
         
         # Step 2: Save translation files
-        pages_data = result.get("pages", [])
-        cleaned_pages_data = result.get("cleaned_pages", [])  # Get cleaned pages
-        
-        if not pages_data:
+        if not (result.get("page_refs") or result.get("pages")):
             raise ValueError("No pages data in translation result")
         
         try:
-            pages_bytes = [base64.b64decode(page) for page in pages_data]
-            
-            # Decode cleaned pages if available
-            cleaned_pages_bytes = []
-            if cleaned_pages_data:
-                cleaned_pages_bytes = [
-                    base64.b64decode(page) if page else None 
-                    for page in cleaned_pages_data
-                ]
+            # Load pages (and cleaned pages if available) from the blob store
+            blob_store = BlobStore()
+            pages_bytes = result_pages(result, blob_store)
+            cleaned_pages_bytes = result_cleaned_pages(result, blob_store)
             
             metadata = {
                 "original_texts": result.get("original_texts", []),
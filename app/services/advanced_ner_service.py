@@ -3,6 +3,7 @@ Advanced NER Service - Uses spaCy for professional named entity recognition
 Falls back to regex-based NER if spaCy is not available
 """
 import re
+import threading
 from typing import List, Dict, Optional
 from loguru import logger
 
@@ -14,6 +15,19 @@ except (ImportError, Exception) as e:
     SPACY_AVAILABLE = False
     logger.warning(f"spaCy not available: {e}. Using regex-based NER fallback.")
 
+# Loaded spaCy models, shared by every AdvancedNERService in the process
+_spacy_models = {}
+_spacy_lock = threading.Lock()
+
+
+def get_spacy_model(model_name: str):
+    """Get or load a spaCy model (once per process)"""
+    with _spacy_lock:
+        if model_name not in _spacy_models:
+            _spacy_models[model_name] = spacy.load(model_name)
+            logger.info(f"Loaded spaCy model: {model_name}")
+        return _spacy_models[model_name]
+
 
 class AdvancedNERService:
     """Advanced NER service using spaCy with regex fallback"""
@@ -34,9 +48,8 @@ class AdvancedNERService:
                 # Try to load spaCy model
                 model_name = self._get_spacy_model(language)
                 if model_name:
-                    self.nlp = spacy.load(model_name)
+                    self.nlp = get_spacy_model(model_name)
                     self.use_spacy = True
-                    logger.info(f"Loaded spaCy model: {model_name}")
                 else:
                     logger.warning(f"No spaCy model found for {language}, using regex fallback")
             except Exception as e:
@@ -2,11 +2,14 @@
 AI Translator Service - Context-aware translation with Cached Input
 """
 import json
-from typing import List, Optional, Dict
-from openai import OpenAI
+import asyncio
+from typing import List, Optional, Dict, Tuple
+from openai import OpenAI, AsyncOpenAI
 from loguru import logger
 from app.core.config import settings
 from app.services.language_detector import LanguageDetector
+from app.services.translation_memory import TranslationMemory
+from app.services.ner_service import NERService
 
 
 class AITranslator:
@@ -18,6 +21,7 @@ class AITranslator:
         self.model = settings.OPENAI_MODEL
         self.system_prompt = self._get_system_prompt()
         self.cache_control = {"type": "ephemeral"}  # Enable Cached Input
+        self.translation_memory = TranslationMemory()
     
     def _get_system_prompt(self) -> str:
         """Get the system prompt for translation (English for global compatibility)"""
@@ -73,13 +77,16 @@ Do NOT use alternative translations, synonyms, or variations. Consistency is cri
         source_lang: str = "en",
         target_lang: str = "tr",
         use_cache: bool = True,
-        glossary_dict: Optional[Dict[str, str]] = None
+        glossary_dict: Optional[Dict[str, str]] = None,
+        series_name: Optional[str] = None
     ) -> List[str]:
         """
         Translate all texts in a batch with context awareness and glossary support
         
         This method sends all texts at once to maintain consistency
         across the entire chapter. Uses smart chunking for large texts.
+        Segments already in the translation memory are served locally;
+        only the misses are sent to OpenAI.
         
         Args:
             all_texts: List of all texts from the chapter
@@ -87,13 +94,44 @@ Do NOT use alternative translations, synonyms, or variations. Consistency is cri
             target_lang: Target language (default: "tr")
             use_cache: Whether to use Cached Input for system prompt
             glossary_dict: Dictionary of {original: translated} terms for consistency
-            
+            series_name: Series name (scopes the translation memory)
+        
         Returns:
             List of translated texts in the same order
         """
         if not all_texts:
             return []
         
+        return self.translation_memory.translate_with_memory(
+            all_texts,
+            lambda texts: self._translate_batch(
+                texts, source_lang, target_lang, use_cache, glossary_dict
+            ),
+            source_lang=source_lang,
+            target_lang=target_lang,
+            provider=f"ai:{self.model}",
+            series_name=series_name,
+            glossary=glossary_dict
+        )
+    
+    def _translate_batch(
+        self,
+        all_texts: List[str],
+        source_lang: str,
+        target_lang: str,
+        use_cache: bool,
+        glossary_dict: Optional[Dict[str, str]]
+    ) -> Tuple[List[str], List[bool]]:
+        """
+        Translate texts with OpenAI (no translation memory)
+        
+        Returns:
+            (translations in the same order, per-text success flags); texts
+            that failed or came from a misaligned response are not successes
+        """
+        if not all_texts:
+            return [], []
+        
         try:
             logger.info(f"Translating {len(all_texts)} texts to {target_lang}")
             
@@ -172,29 +210,41 @@ Input List:
                     result = self._fallback_parse(content)
                 
                 # Validate length
-                if len(result) != len(all_texts):
-                    logger.warning(
-                        f"Translation count mismatch: expected {len(all_texts)}, got {len(result)}"
-                    )
-                    # Pad or truncate as needed
-                    if len(result) < len(all_texts):
-                        result.extend([""] * (len(all_texts) - len(result)))
-                    else:
-                        result = result[:len(all_texts)]
+                result, succeeded = self._align_translations(result, len(all_texts), "Translation")
                 
                 logger.info(f"Successfully translated {len(result)} texts")
-                return result
+                return result, succeeded
                 
             except json.JSONDecodeError as e:
                 logger.error(f"JSON decode error: {e}")
                 logger.error(f"Response content: {content[:500]}")
                 # Fallback parsing
-                return self._fallback_parse(content)
+                return self._align_translations(self._fallback_parse(content), len(all_texts), "Translation")
                 
         except Exception as e:
             logger.error(f"AI Translation Error: {e}")
             # Return original texts on error
-            return all_texts
+            return list(all_texts), [False] * len(all_texts)
+    
+    @staticmethod
+    def _align_translations(translations: List[str], expected: int, label: str) -> Tuple[List[str], List[bool]]:
+        """
+        Pad or truncate translations to the expected count
+        
+        Returns:
+            (translations, per-text success flags); with the wrong count the
+            response is misaligned, so none of its texts are successes
+        """
+        translations = list(translations)
+        if len(translations) == expected:
+            return translations, [isinstance(translation, str) for translation in translations]
+        
+        logger.warning(f"{label} count mismatch: expected {expected}, got {len(translations)}")
+        if len(translations) < expected:
+            translations.extend([""] * (expected - len(translations)))
+        else:
+            translations = translations[:expected]
+        return translations, [False] * expected
     
     def _fallback_parse(self, content: str) -> List[str]:
         """Fallback parsing if JSON parsing fails"""
@@ -224,6 +274,82 @@ Input List:
         # Last resort: split by newlines
         return [line.strip() for line in content.split("\n") if line.strip()]
     
+    def _split_into_chunks(self, all_texts: List[str], chunk_size: int = 80000) -> List[List[str]]:
+        """Split texts into chunks of ~chunk_size characters (~80k characters = ~20k tokens)"""
+        chunks = []
+        current_chunk = []
+        current_size = 0
+        
+        for text in all_texts:
+            text_size = len(text)
+            if current_size + text_size > chunk_size and current_chunk:
+                chunks.append(current_chunk)
+                current_chunk = [text]
+                current_size = text_size
+            else:
+                current_chunk.append(text)
+                current_size += text_size
+        
+        if current_chunk:
+            chunks.append(current_chunk)
+        
+        return chunks
+    
+    def _build_chunk_prompt(
+        self,
+        chunk: List[str],
+        idx: int,
+        total_chunks: int,
+        source_lang: str,
+        target_lang: str,
+        context_prompt: str = ""
+    ) -> str:
+        """Build the user prompt for one chunk of a chapter"""
+        source_name = LanguageDetector.get_language_name(source_lang) or source_lang
+        target_name = LanguageDetector.get_language_name(target_lang) or target_lang
+        
+        return f"""Translate the following text list from {source_name} ({source_lang}) to {target_name} ({target_lang}).
+This is part {idx + 1} of {total_chunks} of a webtoon chapter.{context_prompt}
+
+IMPORTANT RULES:
+1. Keep character names consistent with previous parts
+2. Maintain consistent honorifics and addressing styles
+3. Preserve the tone of speech (formal, casual, rude, etc.)
+4. Translate webtoon slang and special terms correctly
+5. Output ONLY a JSON list, no other explanations
+
+Input List:
+{json.dumps(chunk, ensure_ascii=False, indent=2)}
+"""
+    
+    def _parse_chunk_response(self, content: str, chunk: List[str], idx: int) -> Tuple[List[str], List[bool]]:
+        """
+        Parse a chunk response into exactly len(chunk) translations
+        
+        Returns:
+            (translations, per-text success flags); the originals, all
+            failed, if the response cannot be parsed
+        """
+        try:
+            parsed = json.loads(content)
+            if isinstance(parsed, dict):
+                translations = parsed.get("translations") or parsed.get("texts") or list(parsed.values())[0]
+            else:
+                translations = parsed
+            
+            if isinstance(translations, list):
+                chunk_translations = translations
+            else:
+                chunk_translations = self._fallback_parse(content)
+            
+            # Validate length
+            return self._align_translations(chunk_translations, len(chunk), f"Chunk {idx + 1} translation")
+        
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON decode error in chunk {idx + 1}: {e}")
+            # Fallback: use original texts
+            return list(chunk), [False] * len(chunk)
+    
     def _translate_with_chunking(
         self,
         all_texts: List[str],
@@ -231,46 +357,71 @@ Input List:
         target_lang: str,
         use_cache: bool,
         glossary_dict: Optional[Dict[str, str]]
-    ) -> List[str]:
+    ) -> Tuple[List[str], List[bool]]:
         """
         Translate large texts using smart chunking to avoid token limits
         
+        With AI_CONCURRENT_CHUNKING enabled, chunks are translated in parallel
+        (see _translate_chunks_concurrently); otherwise one after another,
+        each with context from the previous chunk.
+        
         Args:
             all_texts: List of all texts
             source_lang: Source language code
             target_lang: Target language code
             use_cache: Whether to use Cached Input
             glossary_dict: Glossary dictionary
-            
+        
         Returns:
-            List of translated texts
+            (translated texts, per-text success flags)
         """
-        # Chunk size: ~20k tokens per chunk (safe limit)
-        chunk_size = 80000  # ~80k characters = ~20k tokens
-        chunks = []
-        current_chunk = []
-        current_size = 0
+        chunks = self._split_into_chunks(all_texts)
         
-        # Split texts into chunks
-        for text in all_texts:
-            text_size = len(text)
-            if current_size + text_size > chunk_size and current_chunk:
-                chunks.append(current_chunk)
-                current_chunk = [text]
-                current_size = text_size
-            else:
-                current_chunk.append(text)
-                current_size += text_size
+        logger.info(f"Split {len(all_texts)} texts into {len(chunks)} chunks")
         
-        if current_chunk:
-            chunks.append(current_chunk)
+        translated = None
+        if settings.AI_CONCURRENT_CHUNKING and len(chunks) > 1:
+            try:
+                asyncio.get_running_loop()
+                logger.warning("Event loop already running, translating chunks sequentially")
+            except RuntimeError:
+                translated = asyncio.run(
+                    self._translate_chunks_concurrently(
+                        chunks, all_texts, source_lang, target_lang, use_cache, glossary_dict
+                    )
+                )
         
-        logger.info(f"Split {len(all_texts)} texts into {len(chunks)} chunks")
+        if translated is None:
+            translated = self._translate_chunks_sequentially(
+                chunks, source_lang, target_lang, use_cache, glossary_dict
+            )
+        all_translations, succeeded = translated
         
-        # Translate each chunk with context from previous chunk
+        # Final validation
+        if len(all_translations) != len(all_texts):
+            all_translations, succeeded = self._align_translations(
+                all_translations, len(all_texts), "Final translation"
+            )
+        
+        logger.info(f"Successfully translated {len(all_translations)} texts using chunking")
+        return all_translations, succeeded
+    
+    def _translate_chunks_sequentially(
+        self,
+        chunks: List[List[str]],
+        source_lang: str,
+        target_lang: str,
+        use_cache: bool,
+        glossary_dict: Optional[Dict[str, str]]
+    ) -> Tuple[List[str], List[bool]]:
+        """Translate chunks one after another, each with context from the previous chunk"""
         all_translations = []
+        succeeded = []
         previous_context = None
         
+        # Build system prompt with glossary
+        system_prompt = self._build_system_prompt_with_glossary(glossary_dict, source_lang, target_lang)
+        
         for idx, chunk in enumerate(chunks):
             logger.info(f"Translating chunk {idx + 1}/{len(chunks)} ({len(chunk)} texts)")
             
@@ -283,34 +434,14 @@ The previous part of this chapter contained these key terms and character names:
 {json.dumps(previous_context[:10], ensure_ascii=False)}  # First 10 translations for context
 
 Maintain consistency with the previous translations, especially for character names and special terms.
-"""
-            
-            # Get language names
-            source_name = LanguageDetector.get_language_name(source_lang) or source_lang
-            target_name = LanguageDetector.get_language_name(target_lang) or target_lang
-            
-            # Build system prompt with glossary
-            system_prompt = self._build_system_prompt_with_glossary(glossary_dict, source_lang, target_lang)
-            
-            # Prepare user prompt
-            user_prompt = f"""Translate the following text list from {source_name} ({source_lang}) to {target_name} ({target_lang}).
-This is part {idx + 1} of {len(chunks)} of a webtoon chapter.{context_prompt}
-
-IMPORTANT RULES:
-1. Keep character names consistent with previous parts
-2. Maintain consistent honorifics and addressing styles
-3. Preserve the tone of speech (formal, casual, rude, etc.)
-4. Translate webtoon slang and special terms correctly
-5. Output ONLY a JSON list, no other explanations
-
-Input List:
-{json.dumps(chunk, ensure_ascii=False, indent=2)}
 """
             
             # Prepare messages
             messages = [
                 {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
+                {"role": "user", "content": self._build_chunk_prompt(
+                    chunk, idx, len(chunks), source_lang, target_lang, context_prompt
+                )}
             ]
             
             # Prepare cache control
@@ -327,58 +458,148 @@ Input List:
                     extra_body=extra_body if use_cache else None
                 )
                 
-                content = response.choices[0].message.content
-                
-                # Parse response
-                try:
-                    parsed = json.loads(content)
-                    if isinstance(parsed, dict):
-                        translations = parsed.get("translations") or parsed.get("texts") or list(parsed.values())[0]
-                    else:
-                        translations = parsed
-                    
-                    if isinstance(translations, list):
-                        chunk_translations = translations
-                    else:
-                        chunk_translations = self._fallback_parse(content)
-                    
-                    # Validate length
-                    if len(chunk_translations) != len(chunk):
-                        logger.warning(
-                            f"Chunk {idx + 1} translation count mismatch: "
-                            f"expected {len(chunk)}, got {len(chunk_translations)}"
-                        )
-                        # Pad or truncate
-                        if len(chunk_translations) < len(chunk):
-                            chunk_translations.extend([""] * (len(chunk) - len(chunk_translations)))
-                        else:
-                            chunk_translations = chunk_translations[:len(chunk)]
-                    
-                    all_translations.extend(chunk_translations)
-                    previous_context = chunk_translations  # Store for next chunk context
-                    
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSON decode error in chunk {idx + 1}: {e}")
-                    # Fallback: use original texts
-                    all_translations.extend(chunk)
-                    previous_context = chunk
-                    
+                chunk_translations, chunk_succeeded = self._parse_chunk_response(
+                    response.choices[0].message.content, chunk, idx
+                )
+            
             except Exception as e:
                 logger.error(f"Error translating chunk {idx + 1}: {e}")
                 # Fallback: use original texts
-                all_translations.extend(chunk)
-                previous_context = chunk
+                chunk_translations, chunk_succeeded = list(chunk), [False] * len(chunk)
+            
+            all_translations.extend(chunk_translations)
+            succeeded.extend(chunk_succeeded)
+            previous_context = chunk_translations  # Store for next chunk context
         
-        # Final validation
-        if len(all_translations) != len(all_texts):
-            logger.warning(
-                f"Final translation count mismatch: expected {len(all_texts)}, got {len(all_translations)}"
-            )
-            if len(all_translations) < len(all_texts):
-                all_translations.extend([""] * (len(all_texts) - len(all_translations)))
-            else:
-                all_translations = all_translations[:len(all_texts)]
+        return all_translations, succeeded
+    
+    async def _extract_chapter_glossary(
+        self,
+        client: AsyncOpenAI,
+        all_texts: List[str],
+        source_lang: str,
+        target_lang: str,
+        glossary_dict: Optional[Dict[str, str]]
+    ) -> Optional[Dict[str, str]]:
+        """
+        Quick name/term extraction pass over the whole chapter
         
-        logger.info(f"Successfully translated {len(all_translations)} texts using chunking")
-        return all_translations
+        Detects proper nouns locally (regex NER), translates the most frequent
+        ones not already in the glossary with a single small request, and
+        merges them into the glossary so every chunk shares the same names.
+        Existing glossary entries always win.
+        """
+        glossary_dict = glossary_dict or {}
+        
+        names = NERService().extract_all_names(all_texts)
+        names = [name for name in names if name not in glossary_dict]
+        if not names:
+            return glossary_dict or None
+        
+        # Keep the most frequent names (webtoon all-caps text produces many candidates)
+        chapter_text = "\n".join(all_texts)
+        names.sort(key=lambda name: chapter_text.count(name), reverse=True)
+        names = names[:settings.AI_GLOSSARY_MAX_TERMS]
+        
+        source_name = LanguageDetector.get_language_name(source_lang) or source_lang
+        target_name = LanguageDetector.get_language_name(target_lang) or target_lang
+        
+        try:
+            response = await client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": self.system_prompt},
+                    {"role": "user", "content": f"""These character names and special terms appear in a webtoon chapter written in {source_name} ({source_lang}).
+Give their {target_name} ({target_lang}) translation to use consistently across the whole chapter.
+Keep personal names as names (transliterate, do not translate their meaning).
+Output ONLY a JSON object: {{"original": "translation", ...}}
 
+Terms:
+{json.dumps(names, ensure_ascii=False)}
+"""}
+                ],
+                temperature=0,
+                response_format={"type": "json_object"}
+            )
+            extracted = json.loads(response.choices[0].message.content)
+            if not isinstance(extracted, dict):
+                return glossary_dict or None
+            
+            extracted = {
+                str(original): str(translated)
+                for original, translated in extracted.items()
+                if original in names and translated
+            }
+            logger.info(f"Chapter glossary pass: {len(extracted)} names/terms extracted")
+            return {**extracted, **glossary_dict}
+        
+        except Exception as e:
+            logger.warning(f"Chapter glossary pass failed, continuing without it: {e}")
+            return glossary_dict or None
+    
+    async def _translate_chunks_concurrently(
+        self,
+        chunks: List[List[str]],
+        all_texts: List[str],
+        source_lang: str,
+        target_lang: str,
+        use_cache: bool,
+        glossary_dict: Optional[Dict[str, str]]
+    ) -> Tuple[List[str], List[bool]]:
+        """
+        Translate all chunks in parallel with a shared chapter glossary
+        
+        Instead of feeding each chunk the previous chunk's translations (which
+        forces one round trip per chunk), a quick glossary pass runs over the
+        whole chapter first, then every chunk is sent at once with that shared
+        context (bounded by AI_CHUNK_CONCURRENCY).
+        """
+        client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        try:
+            shared_glossary = await self._extract_chapter_glossary(
+                client, all_texts, source_lang, target_lang, glossary_dict
+            )
+            system_prompt = self._build_system_prompt_with_glossary(shared_glossary, source_lang, target_lang)
+            
+            extra_body = {}
+            if use_cache:
+                extra_body["cache_control"] = self.cache_control
+            
+            semaphore = asyncio.Semaphore(max(1, settings.AI_CHUNK_CONCURRENCY))
+            
+            async def translate_chunk(idx: int, chunk: List[str]) -> Tuple[List[str], List[bool]]:
+                async with semaphore:
+                    logger.info(f"Translating chunk {idx + 1}/{len(chunks)} ({len(chunk)} texts)")
+                    messages = [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": self._build_chunk_prompt(
+                            chunk, idx, len(chunks), source_lang, target_lang
+                        )}
+                    ]
+                    try:
+                        response = await client.chat.completions.create(
+                            model=self.model,
+                            messages=messages,
+                            temperature=0.3,
+                            extra_body=extra_body if use_cache else None
+                        )
+                        return self._parse_chunk_response(
+                            response.choices[0].message.content, chunk, idx
+                        )
+                    except Exception as e:
+                        logger.error(f"Error translating chunk {idx + 1}: {e}")
+                        # Fallback: use original texts
+                        return list(chunk), [False] * len(chunk)
+            
+            results = await asyncio.gather(
+                *[translate_chunk(idx, chunk) for idx, chunk in enumerate(chunks)]
+            )
+        finally:
+            await client.close()
+        
+        all_translations = []
+        succeeded = []
+        for chunk_translations, chunk_succeeded in results:
+            all_translations.extend(chunk_translations)
+            succeeded.extend(chunk_succeeded)
+        return all_translations, succeeded
@@ -2,8 +2,10 @@
 Alternative Translation Services - Free/cheaper AI translation options
 Supports: Argos Translate (offline), Hugging Face models
 """
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from loguru import logger
+from app.core.config import settings
+from app.services.hf_model_registry import hf_model_registry
 
 # Try to import Argos Translate
 try:
@@ -16,7 +18,7 @@ except (ImportError, Exception) as e:
 
 # Try to import transformers (Hugging Face)
 try:
-    from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
+    import transformers
     import torch
     TRANSFORMERS_AVAILABLE = True
 except ImportError:
@@ -36,7 +38,7 @@ class AlternativeTranslator:
         """
         self.provider = provider
         self.argos_models = {}
-        self.hf_pipeline = None
+        self.hf_available = False
         self._init_provider()
     
     def _init_provider(self):
@@ -51,18 +53,8 @@ class AlternativeTranslator:
                 logger.warning(f"Argos Translate initialization failed: {e}")
         
         elif self.provider == "huggingface" and TRANSFORMERS_AVAILABLE:
-            try:
-                # Use a lightweight translation model
-                # Helsinki-NLP models are good for many language pairs
-                model_name = "Helsinki-NLP/opus-mt-en-tr"  # English to Turkish
-                self.hf_pipeline = pipeline(
-                    "translation",
-                    model=model_name,
-                    device=0 if torch.cuda.is_available() else -1  # Use GPU if available
-                )
-                logger.info(f"Hugging Face model loaded: {model_name}")
-            except Exception as e:
-                logger.warning(f"Hugging Face initialization failed: {e}")
+            # Models are loaded lazily per language pair by the process-wide registry
+            self.hf_available = hf_model_registry.available
     
     def translate_batch(
         self,
@@ -83,8 +75,24 @@ class AlternativeTranslator:
         Returns:
             List of translated texts
         """
+        return self.translate_batch_with_status(texts, source_lang, target_lang, provider)[0]
+    
+    def translate_batch_with_status(
+        self,
+        texts: List[str],
+        source_lang: str = "en",
+        target_lang: str = "tr",
+        provider: Optional[str] = None
+    ) -> Tuple[List[str], List[bool]]:
+        """
+        Translate batch of texts, reporting which ones were translated
+        
+        Returns:
+            (translated texts, per-text success flags); failed texts are
+            returned untranslated with a False flag
+        """
         if not texts:
-            return []
+            return [], []
         
         provider = provider or self.provider
         
@@ -94,58 +102,100 @@ class AlternativeTranslator:
             return self._translate_with_huggingface(texts, source_lang, target_lang)
         else:
             logger.warning(f"Provider {provider} not available, returning original texts")
-            return texts
+            return list(texts), [False] * len(texts)
     
-    def _translate_with_argos(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+    def _translate_with_argos(self, texts: List[str], source_lang: str, target_lang: str) -> Tuple[List[str], List[bool]]:
         """Translate using Argos Translate (offline, free)"""
         try:
             # Argos uses language codes like "en", "tr"
             translated = []
+            succeeded = []
             for text in texts:
                 if not text or not text.strip():
                     translated.append("")
+                    succeeded.append(False)
                     continue
                 
                 try:
                     result = argostranslate.translate.translate(text, source_lang, target_lang)
                     translated.append(result)
+                    succeeded.append(True)
                 except Exception as e:
                     logger.warning(f"Argos translation error: {e}")
                     translated.append(text)  # Fallback
+                    succeeded.append(False)
             
-            return translated
+            return translated, succeeded
         except Exception as e:
             logger.error(f"Argos Translate batch error: {e}")
-            return texts
+            return list(texts), [False] * len(texts)
+    
+    def supports_pair(self, source_lang: str, target_lang: str, provider: Optional[str] = None) -> bool:
+        """
+        Whether the provider can translate a language pair
+        
+        For Hugging Face this loads (or reuses) the pair's model from the registry.
+        """
+        provider = provider or self.provider
+        if provider == "huggingface":
+            return self.hf_available and hf_model_registry.get(source_lang, target_lang) is not None
+        return provider == "argos" and ARGOS_AVAILABLE
+    
+    @staticmethod
+    def _generate_batch(hf_pipeline, batch_texts: List[str]) -> List[str]:
+        """Run a single padded forward pass (generate) for a batch of segments"""
+        tokenizer = hf_pipeline.tokenizer
+        model = hf_pipeline.model
+        inputs = tokenizer(
+            batch_texts,
+            return_tensors="pt",
+            padding=True,
+            truncation=True,
+            max_length=settings.HF_MAX_LENGTH
+        ).to(model.device)
+        with torch.inference_mode():
+            output_ids = model.generate(**inputs, max_length=settings.HF_MAX_LENGTH)
+        return tokenizer.batch_decode(output_ids, skip_special_tokens=True)
     
-    def _translate_with_huggingface(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
-        """Translate using Hugging Face models (free, requires model download)"""
-        if not self.hf_pipeline:
-            logger.warning("Hugging Face pipeline not initialized")
-            return texts
+    def _translate_with_huggingface(self, texts: List[str], source_lang: str, target_lang: str) -> Tuple[List[str], List[bool]]:
+        """
+        Translate using Hugging Face models (free, requires model download)
+        
+        Segments are sorted by length and translated in padded batches of
+        HF_BATCH_SIZE (one generate() call per batch, minimal padding waste),
+        then restored to their original order.
+        """
+        hf_pipeline = hf_model_registry.get(source_lang, target_lang)
+        if not hf_pipeline:
+            logger.warning(f"No Hugging Face model for {source_lang}->{target_lang}")
+            return list(texts), [False] * len(texts)
         
         try:
-            translated = []
-            for text in texts:
-                if not text or not text.strip():
-                    translated.append("")
-                    continue
-                
+            translated = ["" for _ in texts]
+            succeeded = [False for _ in texts]
+            # Sort non-empty segments by length so each batch pads to a similar size
+            order = sorted(
+                (idx for idx, text in enumerate(texts) if text and text.strip()),
+                key=lambda idx: len(texts[idx])
+            )
+            batch_size = max(1, settings.HF_BATCH_SIZE)
+            
+            for start in range(0, len(order), batch_size):
+                batch = order[start:start + batch_size]
                 try:
-                    result = self.hf_pipeline(text, max_length=512)
-                    # Result format: [{"translation_text": "..."}]
-                    if isinstance(result, list) and len(result) > 0:
-                        translated.append(result[0].get("translation_text", text))
-                    else:
-                        translated.append(text)
+                    outputs = self._generate_batch(hf_pipeline, [texts[idx] for idx in batch])
+                    for idx, output in zip(batch, outputs):
+                        translated[idx] = output or texts[idx]
+                        succeeded[idx] = bool(output)
                 except Exception as e:
-                    logger.warning(f"Hugging Face translation error: {e}")
-                    translated.append(text)
+                    logger.warning(f"Hugging Face translation error (batch of {len(batch)}): {e}")
+                    for idx in batch:
+                        translated[idx] = texts[idx]
             
-            return translated
+            return translated, succeeded
         except Exception as e:
             logger.error(f"Hugging Face batch error: {e}")
-            return texts
+            return list(texts), [False] * len(texts)
     
     def translate_single(
         self,
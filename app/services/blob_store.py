@@ -0,0 +1,211 @@
+"""
+Blob Store - Content-addressed storage for page images
+"""
+import base64
+import hashlib
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+from loguru import logger
+from app.core.config import settings
+from app.services.cdn_service import CDNService
+
+_REF_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+def detect_content_type(data: bytes) -> str:
+    """Detect image content type from magic bytes"""
+    if data.startswith(b'RIFF') and b'WEBP' in data[:12]:
+        return "image/webp"
+    elif data.startswith(b'\x89PNG'):
+        return "image/png"
+    elif data[4:12] in (b'ftypavif', b'ftypavis'):
+        return "image/avif"
+    return "image/jpeg"
+
+
+class BlobStore:
+    """
+    Content-addressed blob store for page images
+    
+    Each blob is stored once under the SHA-256 of its bytes, on local disk
+    (BLOB_STORE_PATH) or through CDNService (BLOB_STORE_BACKEND="cdn").
+    Task results carry only these references instead of base64 pages, so
+    the Celery result backend and the result cache stay small.
+    
+    Blobs referenced by a translation job's stored result are kept for as
+    long as the job row exists. Other local blobs are only needed while a
+    cached task result can still point at them, so the periodic
+    cleanup_blob_store task deletes them once they have not been written or
+    reused for BLOB_STORE_TTL (longer than the result cache TTL). CDN blobs
+    (under "blobs/") are not swept.
+    """
+    
+    def __init__(self):
+        """Initialize blob store"""
+        self.path = Path(settings.BLOB_STORE_PATH)
+        self.cdn_service = None
+        if settings.BLOB_STORE_BACKEND == "cdn":
+            self.cdn_service = CDNService()
+            if not self.cdn_service.cdn_enabled:
+                logger.warning("CDN not available for blob store, using local disk")
+                self.cdn_service = None
+        if self.cdn_service is None:
+            self.path.mkdir(parents=True, exist_ok=True)
+    
+    @staticmethod
+    def is_ref(value: Any) -> bool:
+        """Whether a value is a blob reference"""
+        return isinstance(value, str) and bool(_REF_RE.match(value))
+    
+    def _local_path(self, ref: str) -> Path:
+        return self.path / ref[:2] / ref[2:4] / ref
+    
+    @staticmethod
+    def _object_key(ref: str) -> str:
+        return f"blobs/{ref[:2]}/{ref}"
+    
+    def put(self, data: bytes) -> str:
+        """
+        Store a blob (no-op if it already exists)
+        
+        Args:
+            data: Blob bytes
+        
+        Returns:
+            Blob reference (SHA-256 hex digest)
+        
+        Raises:
+            IOError: If the blob could not be stored
+        """
+        ref = hashlib.sha256(data).hexdigest()
+        
+        if self.cdn_service:
+            if not self.cdn_service.upload_image(data, self._object_key(ref), detect_content_type(data)):
+                raise IOError(f"Failed to upload blob {ref[:12]} to CDN")
+            return ref
+        
+        path = self._local_path(ref)
+        # Referenced by a new result: restart its retention period
+        try:
+            os.utime(path)
+            return ref
+        except FileNotFoundError:
+            pass
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename, so readers never see a partial blob
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        return ref
+    
+    def cleanup(self, referenced: Set[str], max_age: Optional[int] = None) -> int:
+        """
+        Delete unreferenced local blobs not written or reused within max_age
+        
+        Args:
+            referenced: Blob references still in use (never deleted)
+            max_age: Retention in seconds (default: BLOB_STORE_TTL)
+        
+        Returns:
+            Number of deleted blobs
+        """
+        if self.cdn_service:
+            return 0
+        cutoff = time.time() - (settings.BLOB_STORE_TTL if max_age is None else max_age)
+        deleted = 0
+        for path in self.path.glob("*/*/*"):
+            if path.name in referenced:
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    deleted += 1
+            except FileNotFoundError:
+                pass
+        if deleted:
+            logger.info(f"Blob store: deleted {deleted} expired blobs")
+        return deleted
+    
+    def get(self, ref: str) -> Optional[bytes]:
+        """
+        Read a blob
+        
+        Returns:
+            Blob bytes, or None if the reference is invalid or missing
+        """
+        if not self.is_ref(ref):
+            return None
+        
+        if self.cdn_service:
+            return self.cdn_service.download_image(self._object_key(ref))
+        
+        try:
+            return self._local_path(ref).read_bytes()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Error reading blob {ref[:12]}: {e}")
+            return None
+    
+    def url(self, ref: str) -> Optional[str]:
+        """Public URL of a blob (CDN backend only)"""
+        if self.cdn_service and self.is_ref(ref):
+            return self.cdn_service.get_url(self._object_key(ref))
+        return None
+    
+    def resolve(self, value: Optional[str]) -> Optional[bytes]:
+        """
+        Resolve a page entry from a task result to bytes
+        
+        Accepts blob references and base64 pages (results cached before the
+        blob store was introduced).
+        """
+        if not value:
+            return None
+        if self.is_ref(value):
+            data = self.get(value)
+            if data is None:
+                raise IOError(f"Blob not found: {value[:12]}")
+            return data
+        return base64.b64decode(value)
+
+
+def result_pages(result: Dict[str, Any], blob_store: Optional[BlobStore] = None) -> List[bytes]:
+    """Final page bytes of a task result (page_refs, or legacy base64 "pages")"""
+    blob_store = blob_store or BlobStore()
+    entries = result.get("page_refs") or result.get("pages") or []
+    return [blob_store.resolve(entry) for entry in entries]
+
+
+def result_cleaned_pages(
+    result: Dict[str, Any],
+    blob_store: Optional[BlobStore] = None
+) -> List[Optional[bytes]]:
+    """Cleaned page bytes of a task result (None for pages without a cleaned image)"""
+    blob_store = blob_store or BlobStore()
+    entries = result.get("cleaned_page_refs") or result.get("cleaned_pages") or []
+    return [blob_store.resolve(entry) for entry in entries]
+
+
+def result_refs(results: Iterable[Optional[Dict[str, Any]]]) -> Set[str]:
+    """Blob references of the final and cleaned pages of task results"""
+    refs = set()
+    for result in results:
+        if not isinstance(result, dict):
+            continue
+        for entry in (result.get("page_refs") or []) + (result.get("cleaned_page_refs") or []):
+            if BlobStore.is_ref(entry):
+                refs.add(entry)
+    return refs
@@ -3,7 +3,8 @@ Cache Service - Redis cache management
 """
 import json
 import base64
-from typing import Optional, Dict, Any
+import hashlib
+from typing import Optional, Dict, Any, List
 from redis import Redis
 from loguru import logger
 from app.core.config import settings
@@ -85,6 +86,90 @@ class CacheService:
         except Exception as e:
             logger.error(f"Error setting cache: {e}")
     
+    def _generate_ocr_cache_key(
+        self,
+        image_hash: str,
+        languages: List[str],
+        min_confidence: float,
+        backend: str = "easyocr"
+    ) -> str:
+        """
+        Generate content-addressed cache key for OCR results of a page
+        
+        Tiled OCR finds different blocks on tall pages, so the tiling settings
+        are part of the key (untiled keys are the same as before tiling).
+        """
+        key_string = f"{image_hash}:{','.join(sorted(languages))}:{min_confidence}"
+        if backend != "easyocr":
+            # Keys of the original EasyOCR backend stay unchanged (existing entries remain valid)
+            key_string += f":{backend}"
+        if settings.OCR_TILING_ENABLED:
+            key_string += f":tiles={settings.OCR_TILE_HEIGHT}/{settings.OCR_TILE_OVERLAP}"
+        return f"webtoon:ocr:{hashlib.sha256(key_string.encode()).hexdigest()}"
+    
+    def get_cached_ocr_blocks(
+        self,
+        image_hash: str,
+        languages: List[str],
+        min_confidence: float,
+        backend: str = "easyocr"
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get cached OCR text blocks for a page
+        
+        Args:
+            image_hash: SHA-256 hex digest of the raw page bytes
+            languages: OCR language set
+            min_confidence: OCR confidence threshold
+            backend: OCR backend name
+            
+        Returns:
+            Cached text blocks (may be empty) if exists, None otherwise
+        """
+        if not self.redis:
+            return None
+        
+        try:
+            cache_key = self._generate_ocr_cache_key(image_hash, languages, min_confidence, backend)
+            cached_data = self.redis.get(cache_key)
+            
+            if cached_data is not None:
+                return json.loads(cached_data)
+            
+            return None
+        except Exception as e:
+            logger.error(f"Error getting OCR cache: {e}")
+            return None
+    
+    def set_cached_ocr_blocks(
+        self,
+        image_hash: str,
+        languages: List[str],
+        min_confidence: float,
+        blocks: List[Dict[str, Any]],
+        ttl: int = 86400 * 30,  # 30 days
+        backend: str = "easyocr"
+    ):
+        """
+        Cache OCR text blocks for a page
+        
+        Args:
+            image_hash: SHA-256 hex digest of the raw page bytes
+            languages: OCR language set
+            min_confidence: OCR confidence threshold
+            blocks: Text blocks returned by OCRService.detect_text_blocks
+            ttl: Time to live in seconds (default: 30 days)
+            backend: OCR backend name
+        """
+        if not self.redis:
+            return
+        
+        try:
+            cache_key = self._generate_ocr_cache_key(image_hash, languages, min_confidence, backend)
+            self.redis.setex(cache_key, ttl, json.dumps(blocks))
+        except Exception as e:
+            logger.error(f"Error setting OCR cache: {e}")
+    
     def clear_cache(self, pattern: str = "webtoon:*"):
         """Clear cache entries matching pattern"""
         if not self.redis:
@@ -158,6 +158,34 @@ class CDNService:
             logger.error(f"Error uploading to MinIO: {e}")
             raise
     
+    def download_image(self, object_key: str) -> Optional[bytes]:
+        """
+        Download image from CDN
+        
+        Args:
+            object_key: S3/MinIO object key
+            
+        Returns:
+            Image bytes if successful, None otherwise
+        """
+        if not self.cdn_enabled or not self.cdn_client:
+            return None
+        
+        try:
+            if self.cdn_type == 's3':
+                response = self.cdn_client.get_object(Bucket=self.bucket_name, Key=object_key)
+                return response['Body'].read()
+            elif self.cdn_type == 'minio':
+                response = self.cdn_client.get_object(self.bucket_name, object_key)
+                try:
+                    return response.read()
+                finally:
+                    response.close()
+                    response.release_conn()
+        except Exception as e:
+            logger.error(f"Error downloading from CDN: {e}")
+            return None
+    
     def delete_image(self, object_key: str) -> bool:
         """
         Delete image from CDN
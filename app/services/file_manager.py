@@ -93,6 +93,7 @@ class FileManager:
                     cleaned_bytes = cleaned_pages[idx-1]
                     if cleaned_bytes:
                         cleaned_extension = self._detect_extension(cleaned_bytes)
+                        cleaned_content_type = f"image/{'jpeg' if cleaned_extension == 'jpg' else cleaned_extension}"
                         cleaned_key = f"{safe_series_name}/{source_lang}_to_{target_lang}/chapter_{chapter_number:04d}/cleaned/page_{idx:03d}.{cleaned_extension}"
                         
                         # Upload to CDN
@@ -100,7 +101,7 @@ class FileManager:
                             cleaned_url = self.cdn_service.upload_image(
                                 image_bytes=cleaned_bytes,
                                 object_key=cleaned_key,
-                                content_type=content_type
+                                content_type=cleaned_content_type
                             )
                             if cleaned_url:
                                 cleaned_cdn_urls.append(cleaned_url)
@@ -138,6 +139,8 @@ class FileManager:
             return "jpg"
         elif data.startswith(b'\x89PNG'):
             return "png"
+        elif data[4:12] in (b'ftypavif', b'ftypavis'):
+            return "avif"
         return "jpg"
     
     def _sanitize_filename(self, filename: str) -> str:
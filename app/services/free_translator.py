@@ -2,10 +2,11 @@
 Free Translation Service - Uses free translation APIs with automatic fallback
 Priority: Hugging Face > Argos Translate > Google Translate > DeepL
 """
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from loguru import logger
 from deep_translator import GoogleTranslator, DeeplTranslator
 from app.services.language_detector import LanguageDetector
+from app.services.translation_memory import TranslationMemory
 
 # Try to import alternative translators
 try:
@@ -30,6 +31,7 @@ class FreeTranslator:
         self._google_translator = None
         self._deepl_translator = None
         self._alternative_translator = None
+        self.translation_memory = TranslationMemory()
         
         # Initialize alternative translator if available
         if ALTERNATIVE_AVAILABLE and provider in ["auto", "huggingface", "argos"]:
@@ -37,7 +39,7 @@ class FreeTranslator:
                 # Try Hugging Face first (faster, better quality)
                 if provider in ["auto", "huggingface"]:
                     self._alternative_translator = AlternativeTranslator(provider="huggingface")
-                    if self._alternative_translator.hf_pipeline:
+                    if self._alternative_translator.hf_available:
                         logger.info("Using Hugging Face models for translation")
                         return
                 # Fallback to Argos if Hugging Face not available
@@ -83,17 +85,22 @@ class FreeTranslator:
         texts: List[str],
         source_lang: str = "en",
         target_lang: str = "tr",
-        provider: Optional[str] = None
+        provider: Optional[str] = None,
+        series_name: Optional[str] = None
     ) -> List[str]:
         """
         Translate a batch of texts using free translation service
         
+        Segments already in the translation memory are served locally;
+        only the misses are sent to the provider.
+        
         Args:
             texts: List of texts to translate
             source_lang: Source language code
             target_lang: Target language code
             provider: Override default provider ("google" or "deepl")
-            
+            series_name: Series name (scopes the translation memory)
+        
         Returns:
             List of translated texts
         """
@@ -106,6 +113,29 @@ class FreeTranslator:
         source_lang = LanguageDetector.normalize_language_code(source_lang)
         target_lang = LanguageDetector.normalize_language_code(target_lang)
         
+        return self.translation_memory.translate_with_memory(
+            texts,
+            lambda misses: self._translate_batch(misses, source_lang, target_lang, provider),
+            source_lang=source_lang,
+            target_lang=target_lang,
+            provider=f"free:{provider}",
+            series_name=series_name
+        )
+    
+    def _translate_batch(
+        self,
+        texts: List[str],
+        source_lang: str,
+        target_lang: str,
+        provider: str
+    ) -> Tuple[List[str], List[bool]]:
+        """
+        Translate texts with the free provider chain (no translation memory)
+        
+        Returns:
+            (translated texts, per-text success flags); failed texts are
+            returned untranslated with a False flag
+        """
         # Try alternative translators first (if auto mode or explicitly requested)
         if (provider == "auto" or provider in ["huggingface", "argos"]) and self._alternative_translator:
             try:
@@ -117,14 +147,17 @@ class FreeTranslator:
                     alt_provider = "argos"
                 elif provider == "auto":
                     # Try Hugging Face first, then Argos
-                    alt_provider = "huggingface" if self._alternative_translator.hf_pipeline else "argos"
+                    alt_provider = "huggingface" if self._alternative_translator.hf_available else "argos"
+                
+                if not self._alternative_translator.supports_pair(source_lang, target_lang, alt_provider):
+                    raise ValueError(f"{alt_provider} has no model for {source_lang}->{target_lang}")
                 
-                result = self._alternative_translator.translate_batch(
+                result, succeeded = self._alternative_translator.translate_batch_with_status(
                     texts, source_lang, target_lang, provider=alt_provider
                 )
-                if result and len(result) == len(texts) and any(r for r in result if r):
+                if len(result) == len(texts) and any(succeeded):
                     logger.info(f"Successfully translated using alternative translator ({alt_provider})")
-                    return result
+                    return result, succeeded
             except Exception as e:
                 logger.warning(f"Alternative translator failed: {e}, falling back to Google Translate")
         
@@ -137,49 +170,57 @@ class FreeTranslator:
                 
                 # Google Translate can handle batch translation
                 translated = []
+                succeeded = []
                 for text in texts:
                     try:
                         if not text or not text.strip():
                             translated.append("")
+                            succeeded.append(False)
                             continue
                         
                         result = translator.translate(text)
                         translated.append(result)
+                        succeeded.append(isinstance(result, str))
                     except Exception as e:
                         logger.warning(f"Translation error for text '{text[:50]}...': {e}")
                         translated.append(text)  # Fallback to original
+                        succeeded.append(False)
                 
-                return translated
+                return translated, succeeded
                 
             elif provider == "deepl":
                 translator = self._get_deepl_translator(source_lang, target_lang)
                 if translator is None:
                     # Fallback to Google
                     logger.warning("DeepL unavailable, falling back to Google")
-                    return self.translate_batch(texts, source_lang, target_lang, provider="google")
+                    return self._translate_batch(texts, source_lang, target_lang, provider="google")
                 
                 # DeepL batch translation
                 translated = []
+                succeeded = []
                 for text in texts:
                     try:
                         if not text or not text.strip():
                             translated.append("")
+                            succeeded.append(False)
                             continue
                         
                         result = translator.translate(text)
                         translated.append(result)
+                        succeeded.append(isinstance(result, str))
                     except Exception as e:
                         logger.warning(f"DeepL translation error: {e}")
                         translated.append(text)  # Fallback to original
+                        succeeded.append(False)
                 
-                return translated
+                return translated, succeeded
             else:
                 raise ValueError(f"Unknown provider: {provider}")
                 
         except Exception as e:
             logger.error(f"Free translation error: {e}")
             # Return original texts on error
-            return texts
+            return list(texts), [False] * len(texts)
     
     def translate_single(
         self,
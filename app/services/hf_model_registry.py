@@ -0,0 +1,199 @@
+"""
+Hugging Face Model Registry - Process-wide translation pipelines per language pair
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+from loguru import logger
+from app.core.config import settings
+
+# Try to import transformers (Hugging Face)
+try:
+    from transformers import pipeline
+    import torch
+    TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    TRANSFORMERS_AVAILABLE = False
+
+
+def _quantize_model(model):
+    """
+    Apply dynamic int8 quantization to the model's Linear layers (CPU serving)
+    
+    Returns:
+        Quantized model, or the original model if quantization fails
+    """
+    try:
+        quantized = torch.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        logger.info("Hugging Face model quantized to int8 (dynamic)")
+        return quantized
+    except Exception as e:
+        logger.warning(f"Hugging Face int8 quantization failed, using fp32 model: {e}")
+        return model
+
+
+def _model_nbytes(model) -> int:
+    """Estimate resident size of a model (parameters + buffers)"""
+    try:
+        tensors = list(model.parameters()) + list(model.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+    except Exception:
+        return 0
+
+
+class HFModelRegistry:
+    """
+    Process-wide registry of translation pipelines, one per language pair
+    
+    Pipelines are loaded lazily on first use (model name from
+    HF_MODEL_NAME_TEMPLATE, e.g. Helsinki-NLP/opus-mt-en-tr) and shared by
+    every translator in the process. Loaded models are kept in LRU order and
+    the least recently used ones are evicted once their combined size exceeds
+    HF_MODEL_CACHE_MAX_MB. A failed load is retried with backoff
+    (HF_LOAD_RETRY_SECONDS, doubled per failure); after HF_LOAD_MAX_ATTEMPTS
+    failures the pair is remembered as unavailable and not looked up again.
+    """
+    
+    def __init__(self, max_bytes: int):
+        """
+        Args:
+            max_bytes: Memory budget for loaded models (0 = unbounded)
+        """
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._pipelines: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._sizes: Dict[Tuple[str, str], int] = {}
+        self._unavailable: Set[Tuple[str, str]] = set()
+        # Failed loads per pair: (failures, monotonic time of the next attempt)
+        self._failures: Dict[Tuple[str, str], Tuple[int, float]] = {}
+        self._pair_locks: Dict[Tuple[str, str], threading.Lock] = {}
+    
+    @property
+    def available(self) -> bool:
+        """Whether transformers/torch are installed"""
+        return TRANSFORMERS_AVAILABLE
+    
+    @staticmethod
+    def model_name(source_lang: str, target_lang: str) -> str:
+        """Model name for a language pair"""
+        return settings.HF_MODEL_NAME_TEMPLATE.format(src=source_lang, tgt=target_lang)
+    
+    def get(self, source_lang: str, target_lang: str) -> Optional[Any]:
+        """
+        Get the translation pipeline for a language pair (loads it on first use)
+        
+        Returns:
+            Translation pipeline, or None if no model is available for the pair
+        """
+        if not TRANSFORMERS_AVAILABLE:
+            return None
+        
+        key = (source_lang, target_lang)
+        with self._lock:
+            if key in self._pipelines:
+                self._pipelines.move_to_end(key)
+                return self._pipelines[key]
+            if self._skip_load(key):
+                return None
+            pair_lock = self._pair_locks.setdefault(key, threading.Lock())
+        
+        # Load outside the registry lock so other pairs stay usable meanwhile
+        with pair_lock:
+            with self._lock:
+                if key in self._pipelines:
+                    self._pipelines.move_to_end(key)
+                    return self._pipelines[key]
+                if self._skip_load(key):
+                    return None
+            
+            hf_pipeline, size = self._load(source_lang, target_lang)
+            
+            with self._lock:
+                if hf_pipeline is None:
+                    self._record_failure(key)
+                    return None
+                self._failures.pop(key, None)
+                self._pipelines[key] = hf_pipeline
+                self._sizes[key] = size
+                self._evict()
+                return hf_pipeline
+    
+    def _skip_load(self, key: Tuple[str, str]) -> bool:
+        """Whether a pair is unavailable or waiting out its retry backoff (lock held)"""
+        if key in self._unavailable:
+            return True
+        failure = self._failures.get(key)
+        return failure is not None and time.monotonic() < failure[1]
+    
+    def _record_failure(self, key: Tuple[str, str]):
+        """Schedule a retry of a failed load, or give up on the pair (lock held)"""
+        failures = self._failures.get(key, (0, 0.0))[0] + 1
+        if failures >= settings.HF_LOAD_MAX_ATTEMPTS:
+            self._failures.pop(key, None)
+            self._unavailable.add(key)
+            logger.warning(f"Hugging Face model for {key[0]}->{key[1]} marked unavailable after {failures} failed loads")
+            return
+        delay = settings.HF_LOAD_RETRY_SECONDS * 2 ** (failures - 1)
+        self._failures[key] = (failures, time.monotonic() + delay)
+    
+    def _load(self, source_lang: str, target_lang: str) -> Tuple[Optional[Any], int]:
+        """Load a pipeline for a language pair"""
+        model_name = self.model_name(source_lang, target_lang)
+        try:
+            use_gpu = torch.cuda.is_available()
+            hf_pipeline = pipeline(
+                "translation",
+                model=model_name,
+                device=0 if use_gpu else -1  # Use GPU if available
+            )
+            # Size is measured before quantization (upper bound of resident memory)
+            size = _model_nbytes(hf_pipeline.model)
+            if settings.HF_QUANTIZE_INT8 and not use_gpu:
+                hf_pipeline.model = _quantize_model(hf_pipeline.model)
+            logger.info(f"Hugging Face model loaded: {model_name} ({size / 1024 / 1024:.0f} MB)")
+            return hf_pipeline, size
+        except Exception as e:
+            logger.warning(f"Hugging Face model unavailable for {source_lang}->{target_lang} ({model_name}): {e}")
+            return None, 0
+    
+    def _evict(self):
+        """Evict least recently used models until the memory budget is met (lock held)"""
+        if not self.max_bytes:
+            return
+        # Always keep the most recently used model, even if it alone exceeds the budget
+        while len(self._pipelines) > 1 and sum(self._sizes.values()) > self.max_bytes:
+            key, _ = self._pipelines.popitem(last=False)
+            self._sizes.pop(key, None)
+            logger.info(f"Evicted Hugging Face model {key[0]}->{key[1]} (memory budget)")
+    
+    def prewarm(self, pairs: Optional[List[str]] = None) -> int:
+        """
+        Load configured language pairs ahead of the first task
+        
+        Args:
+            pairs: Pairs as "src-tgt" strings (default: HF_PREWARM_PAIRS)
+        
+        Returns:
+            Number of pairs loaded
+        """
+        loaded = 0
+        for pair in (settings.HF_PREWARM_PAIRS if pairs is None else pairs):
+            try:
+                source_lang, target_lang = pair.split("-", 1)
+            except ValueError:
+                logger.warning(f"Invalid Hugging Face prewarm pair: {pair}")
+                continue
+            if self.get(source_lang.strip(), target_lang.strip()) is not None:
+                loaded += 1
+        return loaded
+    
+    def loaded_pairs(self) -> List[str]:
+        """Currently loaded pairs, least recently used first"""
+        with self._lock:
+            return [f"{src}-{tgt}" for src, tgt in self._pipelines.keys()]
+
+
+hf_model_registry = HFModelRegistry(max_bytes=settings.HF_MODEL_CACHE_MAX_MB * 1024 * 1024)
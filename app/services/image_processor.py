@@ -5,16 +5,103 @@ import cv2
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 import io
-import textwrap
+import os
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
-from typing import List, Dict, Optional
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, List, Dict, Optional, Tuple
 from pathlib import Path
 from loguru import logger
 from app.core.config import settings
 
+
+def _image_pool_size() -> int:
+    """Number of image threads (CPUs available to this worker unless configured)"""
+    if settings.IMAGE_WORKERS:
+        return settings.IMAGE_WORKERS
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
 # Thread pool for CPU-intensive operations (prevents event loop blocking)
-_image_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="image_processor")
+# Pages are processed concurrently on this pool (OpenCV releases the GIL), so
+# OpenCV's own threading is limited to avoid oversubscribing the cores
+_image_executor = ThreadPoolExecutor(max_workers=_image_pool_size(), thread_name_prefix="image_processor")
+cv2.setNumThreads(settings.IMAGE_CV2_THREADS)
+
+
+@lru_cache(maxsize=1)
+def _discover_font() -> Optional[str]:
+    """Find a suitable font file (searched once per process)"""
+    # Check fonts directory first
+    fonts_dir = Path(settings.FONTS_PATH)
+    if fonts_dir.exists():
+        # Look for common font files
+        font_extensions = ['.ttf', '.otf']
+        for ext in font_extensions:
+            for font_file in fonts_dir.glob(f'*{ext}'):
+                return str(font_file)
+    
+    # Try system fonts (Windows)
+    system_fonts = [
+        "C:/Windows/Fonts/arial.ttf",
+        "C:/Windows/Fonts/calibri.ttf",
+        "C:/Windows/Fonts/times.ttf",
+    ]
+    
+    for font_path in system_fonts:
+        if Path(font_path).exists():
+            return font_path
+    
+    return None
+
+
+@lru_cache(maxsize=256)
+def _get_font(font_path: Optional[str], size: int) -> ImageFont.FreeTypeFont:
+    """Load a font once per process, keyed by (path, size)"""
+    try:
+        if font_path:
+            return ImageFont.truetype(font_path, size)
+        return ImageFont.load_default(size)
+    except Exception as e:
+        logger.warning(f"Error loading font: {e}, using default")
+        return ImageFont.load_default()
+
+
+# Text layouts (chosen font size + wrapped lines), shared by all processors
+_LAYOUT_CACHE_SIZE = 4096
+_layout_cache: "OrderedDict[tuple, Tuple[int, Tuple[str, ...]]]" = OrderedDict()
+_layout_lock = threading.Lock()
+
+
+# Output kinds with their own encode profile (ENCODE_<KIND>_* settings)
+ENCODE_PROFILES = ("final", "cleaned", "thumbnail")
+
+
+def encode_profile(name: str) -> Dict[str, Any]:
+    """
+    Resolve an encode profile from settings
+    
+    Args:
+        name: Output kind ("final", "cleaned" or "thumbnail")
+    
+    Returns:
+        {"format", "quality", "method", "max_width"}
+    """
+    if name not in ENCODE_PROFILES:
+        raise ValueError(f"Unknown encode profile: {name}")
+    prefix = f"ENCODE_{name.upper()}_"
+    image_format = getattr(settings, prefix + "FORMAT") or ("webp" if settings.USE_WEBP else "jpeg")
+    return {
+        "format": image_format.lower(),
+        "quality": getattr(settings, prefix + "QUALITY") or settings.IMAGE_QUALITY,
+        "method": getattr(settings, prefix + "METHOD"),
+        "max_width": getattr(settings, prefix + "MAX_WIDTH", 0)
+    }
 
 
 class ImageProcessor:
@@ -29,38 +116,16 @@ class ImageProcessor:
     
     def _find_font(self) -> Optional[str]:
         """Find a suitable font file"""
-        # Check fonts directory first
-        fonts_dir = Path(settings.FONTS_PATH)
-        if fonts_dir.exists():
-            # Look for common font files
-            font_extensions = ['.ttf', '.otf']
-            for ext in font_extensions:
-                for font_file in fonts_dir.glob(f'*{ext}'):
-                    return str(font_file)
-        
-        # Try system fonts (Windows)
-        system_fonts = [
-            "C:/Windows/Fonts/arial.ttf",
-            "C:/Windows/Fonts/calibri.ttf",
-            "C:/Windows/Fonts/times.ttf",
-        ]
-        
-        for font_path in system_fonts:
-            if Path(font_path).exists():
-                return font_path
-        
-        return None
+        return _discover_font()
     
     def _load_font(self, size: int) -> ImageFont.FreeTypeFont:
-        """Load font with given size"""
-        try:
-            if self.font_path:
-                return ImageFont.truetype(self.font_path, size)
-            else:
-                return ImageFont.load_default()
-        except Exception as e:
-            logger.warning(f"Error loading font: {e}, using default")
-            return ImageFont.load_default()
+        """Load font with given size (cached per process)"""
+        return _get_font(self.font_path, size)
+    
+    @staticmethod
+    def _line_height(font: ImageFont.FreeTypeFont) -> int:
+        """Height of a text line (ascender to baseline of "A")"""
+        return font.getbbox("A")[3]
     
     def _calculate_font_size(
         self,
@@ -75,15 +140,39 @@ class ImageProcessor:
         Returns:
             (font_size, font_object)
         """
-        # Start with default size
-        font_size = self.default_font_size
+        font_size, _ = self._layout(text, max_width, max_height)
+        return font_size, self._load_font(font_size)
+        
+    def _layout(self, text: str, max_width: int, max_height: int) -> Tuple[int, Tuple[str, ...]]:
+        """
+        Font size and wrapped lines for text in a box (cached per process)
+        
+        Returns:
+            (font_size, wrapped_lines)
+        """
+        key = (text, max_width, max_height, self.font_path, self.min_font_size, self.max_font_size)
+        with _layout_lock:
+            layout = _layout_cache.get(key)
+            if layout is not None:
+                _layout_cache.move_to_end(key)
+                return layout
         
+        layout = self._compute_layout(text, max_width, max_height)
+        
+        with _layout_lock:
+            _layout_cache[key] = layout
+            if len(_layout_cache) > _LAYOUT_CACHE_SIZE:
+                _layout_cache.popitem(last=False)
+        return layout
+    
+    def _compute_layout(self, text: str, max_width: int, max_height: int) -> Tuple[int, Tuple[str, ...]]:
+        """Binary search for the largest font size whose wrapped text fits the box"""
         # Binary search for optimal size
         min_size = self.min_font_size
         max_size = self.max_font_size
         
-        best_font = None
         best_size = min_size
+        best_lines = None
         
         while min_size <= max_size:
             test_size = (min_size + max_size) // 2
@@ -93,65 +182,64 @@ class ImageProcessor:
             wrapped_lines = self._wrap_text(text, max_width, font)
             
             # Calculate total height
-            line_height = font.getsize("A")[1] if hasattr(font, 'getsize') else 20
+            line_height = self._line_height(font)
             total_height = len(wrapped_lines) * line_height * 1.2  # 1.2 for line spacing
             
             if total_height <= max_height and self._text_fits_width(wrapped_lines, max_width, font):
                 best_size = test_size
-                best_font = font
+                best_lines = wrapped_lines
                 min_size = test_size + 1
             else:
                 max_size = test_size - 1
         
-        if best_font is None:
-            best_font = self._load_font(best_size)
+        if best_lines is None:
+            best_lines = self._wrap_text(text, max_width, self._load_font(best_size))
         
-        return best_size, best_font
+        return best_size, tuple(best_lines)
     
     def _wrap_text(self, text: str, max_width: int, font: ImageFont.FreeTypeFont) -> List[str]:
         """
         Wrap text to fit within max_width with accurate width calculation
         
-        Uses textwrap for better handling of long words and proper wrapping
+        Greedy word wrap measured with the font's real advance widths;
+        words wider than the box are broken by characters.
         """
-        # Use textwrap for better word breaking
-        wrapped = textwrap.wrap(
-            text,
-            width=max_width // (font.size if hasattr(font, 'size') else 10) if max_width > 0 else 50,
-            break_long_words=True,
-            break_on_hyphens=True
-        )
-        
-        # Verify each line fits (with accurate measurement)
         lines = []
-        for line in wrapped:
-            # Get accurate width using font metrics
-            if hasattr(font, 'getsize'):
-                line_width = font.getsize(line)[0]
-            else:
-                # Fallback: approximate (0.6 is average character width ratio)
-                line_width = len(line) * (font.size if hasattr(font, 'size') else 10) * 0.6
-            
-            if line_width <= max_width or not lines:  # Always add at least one line
-                lines.append(line)
-            else:
-                # Line too wide, need to break further
-                # Split by characters if needed
-                chars_per_line = int(max_width / (font.size if hasattr(font, 'size') else 10) * 1.6)
-                if chars_per_line > 0:
-                    for i in range(0, len(line), chars_per_line):
-                        lines.append(line[i:i+chars_per_line])
+        current = ""
+        for word in text.split():
+            for piece in self._break_word(word, max_width, font):
+                candidate = f"{current} {piece}" if current else piece
+                if current and font.getlength(candidate) > max_width:
+                    lines.append(current)
+                    current = piece
+                else:
+                    current = candidate
+        if current:
+            lines.append(current)
         
         return lines if lines else [text]
     
+    @staticmethod
+    def _break_word(word: str, max_width: int, font: ImageFont.FreeTypeFont) -> List[str]:
+        """Split a word that is wider than max_width into pieces that fit"""
+        if font.getlength(word) <= max_width:
+            return [word]
+        
+        pieces = []
+        current = ""
+        for char in word:
+            if current and font.getlength(current + char) > max_width:
+                pieces.append(current)
+                current = char
+            else:
+                current += char
+        if current:
+            pieces.append(current)
+        return pieces
+    
     def _text_fits_width(self, lines: List[str], max_width: int, font: ImageFont.FreeTypeFont) -> bool:
         """Check if text lines fit within max_width"""
-        for line in lines:
-            # Approximate width check
-            width = len(line) * (font.size if hasattr(font, 'size') else 10)
-            if width > max_width:
-                return False
-        return True
+        return all(font.getlength(line) <= max_width for line in lines)
     
     async def process_image_async(
         self,
@@ -171,6 +259,161 @@ class ImageProcessor:
             translated_texts
         )
     
+    @staticmethod
+    def _text_rects(text_blocks: List[Dict], shape: tuple, pad: int = 5) -> np.ndarray:
+        """
+        Padded text rectangles clipped to the page
+        
+        Grouped (paragraph) blocks contribute the boxes of their lines, so
+        the gaps between lines are not in-painted.
+        
+        Returns:
+            int array of [x1, y1, x2, y2] rows (empty rectangles removed)
+        """
+        if not text_blocks:
+            return np.zeros((0, 4), dtype=np.int32)
+        boxes = [line for block in text_blocks for line in block.get('lines', [block['coords']])]
+        coords = np.array(boxes, dtype=np.int64).reshape(-1, 4)
+        rects = np.empty_like(coords)
+        rects[:, 0] = coords[:, 0] - pad
+        rects[:, 1] = coords[:, 1] - pad
+        rects[:, 2] = coords[:, 0] + coords[:, 2] + pad
+        rects[:, 3] = coords[:, 1] + coords[:, 3] + pad
+        rects[:, [0, 2]] = np.clip(rects[:, [0, 2]], 0, shape[1])
+        rects[:, [1, 3]] = np.clip(rects[:, [1, 3]], 0, shape[0])
+        keep = (rects[:, 2] > rects[:, 0]) & (rects[:, 3] > rects[:, 1])
+        return rects[keep].astype(np.int32)
+    
+    @staticmethod
+    def _group_regions(rects: np.ndarray, gap: int) -> List[List[int]]:
+        """
+        Group rectangles closer than `gap` pixels into regions of interest
+        
+        Returns:
+            List of rectangle index groups (one per region)
+        """
+        groups = [[i] for i in range(len(rects))]
+        boxes = [rects[i].tolist() for i in range(len(rects))]
+        merged = True
+        while merged:
+            merged = False
+            i = 0
+            while i < len(boxes):
+                j = i + 1
+                while j < len(boxes):
+                    a, b = boxes[i], boxes[j]
+                    if (a[0] - gap < b[2] and b[0] - gap < a[2] and
+                            a[1] - gap < b[3] and b[1] - gap < a[3]):
+                        boxes[i] = [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+                        groups[i].extend(groups.pop(j))
+                        boxes.pop(j)
+                        merged = True
+                    else:
+                        j += 1
+                i += 1
+        return groups
+    
+    def _inpaint_regions(self, img: np.ndarray, text_blocks: List[Dict]) -> np.ndarray:
+        """
+        Remove text by in-painting only the regions around text blocks
+        
+        Nearby blocks are grouped into regions of interest; each region is
+        cropped with a margin, in-painted and pasted back, so cleaning time
+        scales with text area instead of page area. Regions whose
+        surroundings are a flat color (typical speech-bubble interiors) are
+        filled with that color directly, without TELEA.
+        
+        Args:
+            img: BGR page (modified in place)
+            text_blocks: Text blocks to remove
+        
+        Returns:
+            Cleaned BGR page
+        """
+        rects = self._text_rects(text_blocks, img.shape)
+        if len(rects) == 0:
+            return img
+        
+        margin = settings.INPAINT_ROI_MARGIN
+        page_h, page_w = img.shape[:2]
+        ring_kernel = np.ones((7, 7), np.uint8)
+        
+        for group in self._group_regions(rects, settings.INPAINT_MERGE_GAP):
+            group_rects = rects[group]
+            rx1 = max(0, int(group_rects[:, 0].min()) - margin)
+            ry1 = max(0, int(group_rects[:, 1].min()) - margin)
+            rx2 = min(page_w, int(group_rects[:, 2].max()) + margin)
+            ry2 = min(page_h, int(group_rects[:, 3].max()) + margin)
+            
+            roi = img[ry1:ry2, rx1:rx2]
+            mask = np.zeros(roi.shape[:2], dtype=np.uint8)
+            for x1, y1, x2, y2 in group_rects:
+                mask[y1 - ry1:y2 - ry1, x1 - rx1:x2 - rx1] = 255
+            
+            # Flat-color fast path: the ring of pixels around the text is uniform
+            ring = cv2.dilate(mask, ring_kernel) & ~mask
+            ring_pixels = roi[ring > 0]
+            if len(ring_pixels) and ring_pixels.std(axis=0).max() <= settings.INPAINT_FLAT_STD:
+                roi[mask > 0] = np.median(ring_pixels, axis=0).astype(np.uint8)
+                continue
+            
+            img[ry1:ry2, rx1:rx2] = cv2.inpaint(roi, mask, 3, cv2.INPAINT_TELEA)
+        
+        return img
+    
+    @staticmethod
+    def decode_image(image_bytes: bytes) -> Optional[np.ndarray]:
+        """
+        Decode page bytes once for the whole page pipeline
+        
+        Returns:
+            BGR page, or None if the bytes could not be decoded
+        """
+        nparr = np.frombuffer(image_bytes, np.uint8)
+        return cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    
+    def clean_page(self, img: np.ndarray, text_blocks: List[Dict]) -> np.ndarray:
+        """
+        Remove text from a decoded page (In-painting only)
+        
+        Args:
+            img: BGR page (modified in place)
+            text_blocks: Text blocks to remove
+            
+        Returns:
+            Cleaned BGR page
+        """
+        return self._inpaint_regions(img, text_blocks)
+    
+    def render_page(
+        self,
+        img: np.ndarray,
+        text_blocks: List[Dict],
+        translated_texts: List[str]
+    ) -> bytes:
+        """
+        Render text onto a decoded page and encode the final image
+        
+        Unlike render_text, the background is not decoded again (and was
+        never re-encoded), so the final page is encoded exactly once.
+        
+        Args:
+            img: BGR background page (cleaned page, or original for overlay)
+            text_blocks: Text blocks with coordinates
+            translated_texts: Texts to render
+            
+        Returns:
+            Final image bytes
+        """
+        img_pil = Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+        self._draw_text(img_pil, text_blocks, translated_texts)
+        return self._encode_image(img_pil)
+    
+    def encode_page(self, img: np.ndarray, profile: str = "final") -> bytes:
+        """Encode a BGR page to bytes with an encode profile (see encode_profile)"""
+        # Convert BGR (OpenCV) to RGB (PIL) for consistent encoding
+        return self._encode_image(Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB)), profile)
+    
     def clean_image(
         self,
         image_bytes: bytes,
@@ -184,42 +427,79 @@ class ImageProcessor:
             text_blocks: Text blocks to remove
             
         Returns:
-            Cleaned image bytes (WebP/JPEG)
+            Cleaned image bytes (cleaned encode profile)
         """
         try:
             # 1. Convert bytes to OpenCV image
-            nparr = np.frombuffer(image_bytes, np.uint8)
-            img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            img = self.decode_image(image_bytes)
             
             if img is None:
                 raise ValueError("Could not decode image")
             
-            # 2. Create mask for in-painting
-            mask = np.zeros(img.shape[:2], dtype=np.uint8)
+            # 2+3. In-paint the text regions (only the cropped ROIs around text)
+            clean_img = self.clean_page(img, text_blocks)
             
-            for block in text_blocks:
-                x, y, w, h = block['coords']
-                # Add padding to mask (slightly larger area)
-                pad = 5
-                x1 = max(0, x - pad)
-                y1 = max(0, y - pad)
-                x2 = min(img.shape[1], x + w + pad)
-                y2 = min(img.shape[0], y + h + pad)
-                
-                cv2.rectangle(mask, (x1, y1), (x2, y2), 255, -1)
-            
-            # 3. In-paint to remove text
-            clean_img = cv2.inpaint(img, mask, 3, cv2.INPAINT_TELEA)
-            
-            # 4. Convert to bytes
-            # Convert BGR (OpenCV) to RGB (PIL) for consistent encoding
-            img_pil = Image.fromarray(cv2.cvtColor(clean_img, cv2.COLOR_BGR2RGB))
-            
-            return self._encode_image(img_pil)
+            # 4. Convert to bytes (intermediate layer, cleaned profile)
+            return self.encode_page(clean_img, "cleaned")
             
         except Exception as e:
             logger.error(f"Error cleaning image: {e}")
             raise
+    
+    def _draw_text(
+        self,
+        img_pil: Image.Image,
+        text_blocks: List[Dict],
+        translated_texts: List[str]
+    ):
+        """Draw translated texts into their blocks (in place)"""
+        draw = ImageDraw.Draw(img_pil)
+        
+        for i, block in enumerate(text_blocks):
+            if i >= len(translated_texts):
+                continue
+            
+            x, y, w, h = block['coords']
+            translated_text = translated_texts[i]
+            
+            if not translated_text:
+                continue
+            
+            # Optimal font size and wrapped lines (cached layout)
+            font_size, wrapped_lines = self._layout(translated_text, w, h)
+            font = self._load_font(font_size)
+            
+            # Calculate text position (centered)
+            line_height = self._line_height(font)
+            total_text_height = len(wrapped_lines) * line_height * 1.2
+            
+            # Start Y position (centered vertically)
+            start_y = y + (h - total_text_height) // 2
+            
+            # Draw each line
+            for line_idx, line in enumerate(wrapped_lines):
+                # Calculate line width for centering
+                line_width = font.getlength(line)
+                
+                line_x = x + (w - line_width) // 2
+                line_y = start_y + (line_idx * line_height * 1.2)
+                
+                # Draw text with outline for readability
+                # Outline
+                for adj in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
+                    draw.text(
+                        (line_x + adj[0], line_y + adj[1]),
+                        line,
+                        fill=(255, 255, 255),
+                        font=font
+                    )
+                # Main text
+                draw.text(
+                    (line_x, line_y),
+                    line,
+                    fill=(0, 0, 0),
+                    font=font
+                )
 
     def render_text(
         self,
@@ -251,59 +531,8 @@ class ImageProcessor:
                     raise ValueError("Could not decode background image")
                 img_pil = Image.fromarray(cv2.cvtColor(img_cv, cv2.COLOR_BGR2RGB))
             
-            draw = ImageDraw.Draw(img_pil)
-            
             # 2. Render translated text
-            for i, block in enumerate(text_blocks):
-                if i >= len(translated_texts):
-                    continue
-                
-                x, y, w, h = block['coords']
-                translated_text = translated_texts[i]
-                
-                if not translated_text:
-                    continue
-                
-                # Calculate optimal font size
-                font_size, font = self._calculate_font_size(translated_text, w, h)
-                
-                # Wrap text to fit
-                wrapped_lines = self._wrap_text(translated_text, w, font)
-                
-                # Calculate text position (centered)
-                line_height = font.getsize("A")[1] if hasattr(font, 'getsize') else font_size
-                total_text_height = len(wrapped_lines) * line_height * 1.2
-                
-                # Start Y position (centered vertically)
-                start_y = y + (h - total_text_height) // 2
-                
-                # Draw each line
-                for line_idx, line in enumerate(wrapped_lines):
-                    # Calculate line width for centering
-                    if hasattr(font, 'getsize'):
-                        line_width = font.getsize(line)[0]
-                    else:
-                        line_width = len(line) * font_size * 0.6  # Approximate
-                    
-                    line_x = x + (w - line_width) // 2
-                    line_y = start_y + (line_idx * line_height * 1.2)
-                    
-                    # Draw text with outline for readability
-                    # Outline
-                    for adj in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
-                        draw.text(
-                            (line_x + adj[0], line_y + adj[1]),
-                            line,
-                            fill=(255, 255, 255),
-                            font=font
-                        )
-                    # Main text
-                    draw.text(
-                        (line_x, line_y),
-                        line,
-                        fill=(0, 0, 0),
-                        font=font
-                    )
+            self._draw_text(img_pil, text_blocks, translated_texts)
             
             # 3. Return encoded bytes
             return self._encode_image(img_pil)
@@ -328,22 +557,37 @@ class ImageProcessor:
         # 2. Render text
         return self.render_text(cleaned_bytes, text_blocks, translated_texts)
 
-    def _encode_image(self, img_pil: Image.Image) -> bytes:
-        """Helper to encode PIL image to bytes (WebP/JPEG)"""
+    def _encode_image(self, img_pil: Image.Image, profile: str = "final") -> bytes:
+        """
+        Helper to encode PIL image to bytes
+        
+        Args:
+            img_pil: RGB image
+            profile: Encode profile ("final", "cleaned" or "thumbnail")
+        
+        Returns:
+            Encoded bytes (WebP/AVIF/PNG/JPEG); JPEG if the profile's encoder fails
+        """
+        options = encode_profile(profile)
+        if options["max_width"] and img_pil.width > options["max_width"]:
+            height = max(1, round(img_pil.height * options["max_width"] / img_pil.width))
+            img_pil = img_pil.resize((options["max_width"], height), Image.LANCZOS)
+        
+        image_format = options["format"]
         buf = io.BytesIO()
-        if settings.USE_WEBP:
-            try:
-                img_pil.save(
-                    buf,
-                    format='WEBP',
-                    quality=settings.IMAGE_QUALITY,
-                    method=6
-                )
-            except Exception as e:
-                logger.warning(f"WebP encode failed, fallback to JPEG: {e}")
-                buf = io.BytesIO()
-                img_pil.save(buf, format='JPEG', quality=settings.IMAGE_QUALITY)
-        else:
-            img_pil.save(buf, format='JPEG', quality=settings.IMAGE_QUALITY)
+        try:
+            if image_format == "webp":
+                img_pil.save(buf, format='WEBP', quality=options["quality"], method=options["method"])
+            elif image_format == "avif":
+                img_pil.save(buf, format='AVIF', quality=options["quality"], speed=settings.ENCODE_AVIF_SPEED)
+            elif image_format == "png":
+                img_pil.save(buf, format='PNG', compress_level=settings.ENCODE_PNG_COMPRESS_LEVEL)
+            else:
+                img_pil.save(buf, format='JPEG', quality=options["quality"])
+        except Exception as e:
+            if image_format == "jpeg":
+                raise
+            logger.warning(f"{image_format.upper()} encode failed, fallback to JPEG: {e}")
+            buf = io.BytesIO()
+            img_pil.save(buf, format='JPEG', quality=options["quality"])
         return buf.getvalue()
-
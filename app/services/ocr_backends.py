@@ -0,0 +1,290 @@
+"""
+OCR Backends - Pluggable text detection/recognition engines
+"""
+import math
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple, Type
+import cv2
+import numpy as np
+from loguru import logger
+from app.core.config import settings
+
+# readtext-style result: (four corner points, text, confidence)
+OCRResult = Tuple[List[List[float]], str, float]
+
+# Registered backend classes by name (see register_backend)
+_BACKENDS: Dict[str, Type["OCRBackend"]] = {}
+
+# Backend instances (one per process, models are loaded once)
+_instances: Dict[str, "OCRBackend"] = {}
+_instances_lock = threading.Lock()
+
+
+def register_backend(name: str):
+    """Class decorator registering an OCR backend under a name"""
+    def decorator(cls):
+        cls.name = name
+        _BACKENDS[name] = cls
+        return cls
+    return decorator
+
+
+class OCRBackend(ABC):
+    """
+    Base class for OCR backends
+    
+    A backend turns a decoded BGR page (or tile) into readtext-style results
+    in page coordinates. OCRService handles caching, tiling, the process
+    pool and confidence filtering around it.
+    """
+    
+    name = ""
+    
+    # Whether the backend implements detect() and recognize_pages(), so the
+    # crops of several pages can share recognizer batches
+    pools_recognition = False
+    
+    @classmethod
+    def is_available(cls) -> bool:
+        """Whether the backend can run here (models/dependencies present)"""
+        return True
+    
+    @abstractmethod
+    def readtext(self, img: np.ndarray) -> List[OCRResult]:
+        """
+        Detect and recognize text on a page
+        
+        Args:
+            img: BGR page
+        
+        Returns:
+            List of (corner points, text, confidence)
+        """
+        pass
+
+
+@register_backend("easyocr")
+class EasyOCRBackend(OCRBackend):
+    """EasyOCR readtext (CRAFT detector + recognizer, one box at a time on CPU)"""
+    
+    def __init__(self):
+        from app.services.ocr_service import get_ocr_reader
+        self.reader = get_ocr_reader()
+    
+    def readtext(self, img: np.ndarray) -> List[OCRResult]:
+        return self.reader.readtext(img)
+
+
+@register_backend("easyocr_batched")
+class EasyOCRBatchedBackend(EasyOCRBackend):
+    """
+    EasyOCR detector with batched recognition
+    
+    On CPU, readtext recognizes one box per forward pass regardless of its
+    batch_size. This backend runs the detector alone and feeds the crops to
+    the recognizer in batches of OCR_RECOGNIZER_BATCH_SIZE, grouped by width
+    so little padding is computed. recognize_pages() pools the crops of
+    several pages into the same batches.
+    """
+    
+    @property
+    def pools_recognition(self) -> bool:
+        # Right-to-left post-processing lives in readtext
+        return self.reader.model_lang != 'arabic'
+    
+    def detect(self, img: np.ndarray) -> Tuple[np.ndarray, List, List]:
+        """
+        Run the text detector on a page
+        
+        Returns:
+            (grayscale page, horizontal boxes, free-form boxes)
+        """
+        from easyocr.utils import reformat_input
+        img, img_grey = reformat_input(img)
+        horizontal_list, free_list = self.reader.detect(img, reformat=False)
+        return img_grey, horizontal_list[0], free_list[0]
+    
+    def recognize_pages(self, pages: List[Tuple[np.ndarray, List, List]]) -> List[List[OCRResult]]:
+        """
+        Recognize the detected boxes of several pages in shared batches
+        
+        Args:
+            pages: (grayscale page, horizontal boxes, free-form boxes) per page
+        
+        Returns:
+            readtext-style results per page (top to bottom)
+        """
+        from easyocr.easyocr import imgH
+        from easyocr.recognition import get_text
+        from easyocr.utils import get_image_list
+        
+        crops = []
+        for page_idx, (img_grey, horizontal_list, free_list) in enumerate(pages):
+            image_list, _ = get_image_list(
+                horizontal_list, free_list, img_grey, model_height=imgH, sort_output=False
+            )
+            crops.extend((page_idx, box, crop) for box, crop in image_list)
+        
+        # Crops are padded to the widest one in their batch, so a batch only takes
+        # crops up to 1.25x the width of its narrowest one
+        crops.sort(key=lambda item: item[2].shape[1])
+        batch_size = max(1, settings.OCR_RECOGNIZER_BATCH_SIZE)
+        batches = []
+        for item in crops:
+            if batches and len(batches[-1]) < batch_size and item[2].shape[1] <= 1.25 * batches[-1][0][2].shape[1]:
+                batches[-1].append(item)
+            else:
+                batches.append([item])
+        
+        ignore_char = ''.join(set(self.reader.character) - set(self.reader.lang_char))
+        results: List[List[OCRResult]] = [[] for _ in pages]
+        for batch in batches:
+            max_width = math.ceil(max(1.0, batch[-1][2].shape[1] / imgH)) * imgH
+            recognized = get_text(
+                self.reader.character, imgH, int(max_width),
+                self.reader.recognizer, self.reader.converter,
+                [(box, crop) for _, box, crop in batch],
+                ignore_char, 'greedy', 5, len(batch), 0.1, 0.5, 0.003, 0,
+                self.reader.device
+            )
+            for (page_idx, _, _), result in zip(batch, recognized):
+                results[page_idx].append(result)
+        
+        for page_results in results:
+            page_results.sort(key=lambda item: (item[0][0][1], item[0][0][0]))
+        return results
+    
+    def readtext(self, img: np.ndarray) -> List[OCRResult]:
+        if not self.pools_recognition:
+            return self.reader.readtext(img)
+        return self.recognize_pages([self.detect(img)])[0]
+
+
+@register_backend("opencv_dnn")
+class OpenCVTextBackend(OCRBackend):
+    """
+    OpenCV DNN text detector (DB or EAST) with a CRNN recognizer
+    
+    A lightweight CPU path: no torch, small ONNX models. Needs the model
+    files configured in OCR_CV_DETECTOR_MODEL, OCR_CV_RECOGNIZER_MODEL and
+    OCR_CV_VOCABULARY (e.g. the DB_TD500_resnet18 and CRNN_VGG_BiLSTM_CTC
+    models from the OpenCV text spotting samples). Confidence is the
+    detector's, as the CRNN decoder does not report one.
+    """
+    
+    @classmethod
+    def is_available(cls) -> bool:
+        paths = (
+            settings.OCR_CV_DETECTOR_MODEL,
+            settings.OCR_CV_RECOGNIZER_MODEL,
+            settings.OCR_CV_VOCABULARY
+        )
+        return all(path and os.path.exists(path) for path in paths)
+    
+    def __init__(self):
+        if settings.OCR_CV_DETECTOR == "east":
+            self.detector = cv2.dnn_TextDetectionModel_EAST(settings.OCR_CV_DETECTOR_MODEL)
+            self.detector.setConfidenceThreshold(0.5).setNMSThreshold(0.4)
+            self.detector.setInputParams(1.0, (320, 320), (123.68, 116.78, 103.94), True)
+        else:
+            self.detector = cv2.dnn_TextDetectionModel_DB(settings.OCR_CV_DETECTOR_MODEL)
+            self.detector.setBinaryThreshold(0.3).setPolygonThreshold(0.5)
+            self.detector.setMaxCandidates(500).setUnclipRatio(2.0)
+            self.detector.setInputParams(
+                1.0 / 255, (736, 736), (122.67891434, 116.66876762, 104.00698793), False
+            )
+        
+        with open(settings.OCR_CV_VOCABULARY, encoding="utf-8") as f:
+            vocabulary = [line.rstrip("\n") for line in f if line.rstrip("\n")]
+        self.recognizer = cv2.dnn_TextRecognitionModel(settings.OCR_CV_RECOGNIZER_MODEL)
+        self.recognizer.setDecodeType("CTC-greedy")
+        self.recognizer.setVocabulary(vocabulary)
+        self.recognizer.setInputParams(1.0 / 127.5, (100, 32), (127.5, 127.5, 127.5))
+        self._lock = threading.Lock()  # cv2.dnn models are not safe to share across threads
+    
+    def _input_size(self, img: np.ndarray) -> Tuple[int, int]:
+        """Detector input size: page aspect kept, longest side capped, multiples of 32"""
+        height, width = img.shape[:2]
+        scale = min(1.0, settings.OCR_CV_MAX_SIDE / max(height, width))
+        return (
+            max(32, int(round(width * scale / 32)) * 32),
+            max(32, int(round(height * scale / 32)) * 32)
+        )
+    
+    def readtext(self, img: np.ndarray) -> List[OCRResult]:
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        target = np.array([[0, 31], [0, 0], [99, 0], [99, 31]], dtype=np.float32)
+        
+        results = []
+        with self._lock:
+            self.detector.setInputSize(self._input_size(img))
+            quads, confidences = self.detector.detect(img)
+            for quad, confidence in zip(quads, confidences):
+                # Quad corners: bottom-left, top-left, top-right, bottom-right
+                points = np.asarray(quad, dtype=np.float32)
+                transform = cv2.getPerspectiveTransform(points, target)
+                crop = cv2.warpPerspective(gray, transform, (100, 32))
+                text = self.recognizer.recognize(crop)
+                if text:
+                    results.append((points.tolist(), text, float(confidence)))
+        return results
+
+
+def available_backends() -> List[str]:
+    """Names of the registered backends that can run here"""
+    return [name for name, cls in _BACKENDS.items() if cls.is_available()]
+
+
+def get_backend(name: str) -> OCRBackend:
+    """
+    Get a backend instance (created once per process)
+    
+    Raises:
+        ValueError: If the backend is unknown or unavailable
+    """
+    if name in _instances:
+        return _instances[name]
+    cls = _BACKENDS.get(name)
+    if cls is None:
+        raise ValueError(f"Unknown OCR backend: {name}")
+    if not cls.is_available():
+        raise ValueError(f"OCR backend not available: {name}")
+    with _instances_lock:
+        if name not in _instances:
+            logger.info(f"Initializing OCR backend: {name}")
+            _instances[name] = cls()
+        return _instances[name]
+
+
+def select_backend_name(
+    series_name: Optional[str] = None,
+    source_lang: Optional[str] = None,
+    free_tier: bool = False
+) -> str:
+    """
+    Choose the OCR backend for a job
+    
+    Order: OCR_BACKEND_BY_SERIES (series name, case-insensitive),
+    OCR_BACKEND_BY_LANGUAGE (source language), OCR_BACKEND_FREE (Free
+    translation jobs), then OCR_BACKEND. Configured backends that are not
+    available here are skipped.
+    """
+    candidates = []
+    if series_name:
+        series_backends = {k.strip().lower(): v for k, v in settings.OCR_BACKEND_BY_SERIES.items()}
+        candidates.append(series_backends.get(series_name.strip().lower()))
+    if source_lang:
+        candidates.append(settings.OCR_BACKEND_BY_LANGUAGE.get(source_lang))
+    if free_tier:
+        candidates.append(settings.OCR_BACKEND_FREE)
+    
+    for name in candidates:
+        if not name:
+            continue
+        cls = _BACKENDS.get(name)
+        if cls is not None and cls.is_available():
+            return name
+        logger.warning(f"OCR backend '{name}' unavailable, trying the next one")
+    return settings.OCR_BACKEND
@@ -1,20 +1,52 @@
 """
-OCR Service - Text detection using EasyOCR
+OCR Service - Text detection using EasyOCR (or another registered OCR backend)
 """
 import easyocr
 import numpy as np
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from typing import List, Dict, Any
+import hashlib
+import io
+import multiprocessing
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import List, Dict, Any, Optional, Tuple
+from PIL import Image
 from loguru import logger
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.cache_service import CacheService
+from app.services.ocr_backends import get_backend
 import cv2
 
 # Global OCR reader (lazy initialization)
 _ocr_reader = None
 
+# Process pool for OCR (lazy initialization, see get_ocr_process_pool)
+_ocr_process_pool = None
+# Set once this process turned out unable to start pool workers
+_ocr_process_pool_disabled = False
+
+
+def _ocr_pool_size() -> int:
+    """Number of OCR worker processes"""
+    return settings.OCR_POOL_WORKERS or os.cpu_count() or 1
+
+
 # Thread pool for CPU-intensive OCR operations (prevents event loop blocking)
-_ocr_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ocr_service")
+# In process-pool mode these threads only wait on pool results, so size it to the pool
+_ocr_executor = ThreadPoolExecutor(
+    max_workers=_ocr_pool_size() if settings.OCR_PROCESS_POOL else 2,
+    thread_name_prefix="ocr_service"
+)
+
+# Threads OCR'ing the tiles of a tall page with the in-process reader
+# (separate from _ocr_executor, whose threads wait on these tiles)
+_ocr_tile_executor = ThreadPoolExecutor(
+    max_workers=max(1, settings.OCR_TILE_WORKERS),
+    thread_name_prefix="ocr_tile"
+)
 
 
 def get_ocr_reader():
@@ -30,12 +62,495 @@ def get_ocr_reader():
     return _ocr_reader
 
 
+def _init_pool_worker(languages: List[str], gpu: bool, torch_threads: int):
+    """Pool worker initializer: load a warm EasyOCR reader once per process"""
+    global _ocr_reader
+    try:
+        import torch
+        torch.set_num_threads(max(1, torch_threads))
+    except Exception:
+        pass
+    cv2.setNumThreads(1)
+    # Backends in this worker use the warm reader through get_ocr_reader()
+    _ocr_reader = easyocr.Reader(languages, gpu=gpu)
+
+
+def _readtext_in_pool(shm_name: str, size: int, backend: str) -> Tuple[np.ndarray, List[str]]:
+    """
+    Run OCR inside a pool worker
+    
+    The page is read from a shared memory segment (no pickling of image bytes).
+    Results are returned as a compact float32 array of [x, y, w, h, confidence]
+    rows plus the list of texts.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        img = cv2.imdecode(
+            np.ndarray((size,), dtype=np.uint8, buffer=shm.buf),
+            cv2.IMREAD_COLOR
+        )
+    finally:
+        shm.close()
+    
+    if img is None:
+        return np.zeros((0, 5), dtype=np.float32), []
+    
+    return _compact_results(get_backend(backend).readtext(img))
+
+
+def _readtext_tile_in_pool(
+    shm_name: str,
+    shape: Tuple[int, ...],
+    top: int,
+    bottom: int,
+    backend: str
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Run OCR on one tile of a decoded page inside a pool worker
+    
+    The decoded page is shared by every tile of the page through one shared
+    memory segment; only the tile's rows are copied out.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        page = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        tile = page[top:bottom].copy()
+        del page  # Release the buffer before closing the segment
+    finally:
+        shm.close()
+    
+    return _compact_results(get_backend(backend).readtext(tile))
+
+
+def _compact_results(results) -> Tuple[np.ndarray, List[str]]:
+    """Convert EasyOCR readtext output to [x, y, w, h, confidence] rows plus texts"""
+    boxes = np.zeros((len(results), 5), dtype=np.float32)
+    texts = []
+    for i, (bbox, text, confidence) in enumerate(results):
+        points = np.asarray(bbox, dtype=np.float32)
+        x_min, y_min = points.min(axis=0)
+        x_max, y_max = points.max(axis=0)
+        boxes[i] = (x_min, y_min, x_max - x_min, y_max - y_min, confidence)
+        texts.append(text)
+    return boxes, texts
+
+
+def get_ocr_process_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Get or create the OCR process pool (singleton)
+    
+    Each worker process loads its own EasyOCR reader at startup, so OCR scales
+    with CPU cores instead of being bound by the GIL of a single process.
+    
+    Daemonic processes (Celery prefork children) cannot have children, so
+    they OCR with the in-process reader instead.
+    
+    Returns:
+        Process pool, or None if process-pool OCR is disabled or unavailable
+    """
+    global _ocr_process_pool, _ocr_process_pool_disabled
+    if not settings.OCR_PROCESS_POOL or _ocr_process_pool_disabled:
+        return None
+    if multiprocessing.current_process().daemon:
+        logger.info("OCR process pool unavailable in a daemonic worker process, using in-process reader")
+        _ocr_process_pool_disabled = True
+        return None
+    if _ocr_process_pool is None:
+        try:
+            workers = _ocr_pool_size()
+            logger.info(f"Starting OCR process pool with {workers} workers...")
+            _ocr_process_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_pool_worker,
+                initargs=(
+                    list(settings.OCR_LANGUAGES),
+                    settings.OCR_GPU,
+                    settings.OCR_POOL_TORCH_THREADS
+                )
+            )
+        except Exception as e:
+            logger.warning(f"OCR process pool unavailable, using in-process reader: {e}")
+            return None
+    return _ocr_process_pool
+
+
+def _pool_worker_ready() -> int:
+    """No-op task used to start pool workers (returns the worker PID)"""
+    return os.getpid()
+
+
+def warm_ocr_process_pool():
+    """Start every OCR pool worker so their readers are loaded before the first page"""
+    global _ocr_process_pool_disabled
+    pool = get_ocr_process_pool()
+    if pool is None:
+        return
+    try:
+        list(pool.map(_pool_worker_ready, range(_ocr_pool_size())))
+    except Exception as e:
+        logger.warning(f"OCR process pool failed to start, using in-process reader: {e}")
+        _ocr_process_pool_disabled = True
+        _discard_ocr_process_pool()
+
+
+def _discard_ocr_process_pool():
+    """Drop a broken OCR process pool so the next call can start a fresh one"""
+    global _ocr_process_pool
+    if _ocr_process_pool is not None:
+        _ocr_process_pool.shutdown(wait=False, cancel_futures=True)
+        _ocr_process_pool = None
+
+
+def _submit_to_pool(pool: ProcessPoolExecutor, fn, *args):
+    """
+    Submit a task to the OCR process pool
+    
+    Workers are started on submit, so a process that cannot start them fails
+    here. The pool is then disabled for this process and the error is raised
+    as BrokenProcessPool, so callers OCR the page in-process.
+    """
+    global _ocr_process_pool_disabled
+    try:
+        return pool.submit(fn, *args)
+    except BrokenProcessPool:
+        raise
+    except Exception as e:
+        _ocr_process_pool_disabled = True
+        raise BrokenProcessPool(f"Cannot start OCR pool workers: {e}") from e
+
+
+def _format_results(results, min_confidence: float) -> List[Dict[str, Any]]:
+    """Convert EasyOCR readtext output to text blocks"""
+    text_blocks = []
+    for (bbox, text, confidence) in results:
+        # Filter low confidence results
+        if confidence < min_confidence:
+            continue
+        
+        # Convert bbox to (x, y, w, h) format
+        x_coords = [point[0] for point in bbox]
+        y_coords = [point[1] for point in bbox]
+        x = int(min(x_coords))
+        y = int(min(y_coords))
+        w = int(max(x_coords) - min(x_coords))
+        h = int(max(y_coords) - min(y_coords))
+        
+        text_blocks.append({
+            "text": text.strip(),
+            "coords": [x, y, w, h],
+            "confidence": float(confidence)
+        })
+    return text_blocks
+
+
+def _format_pool_results(
+    boxes: np.ndarray,
+    texts: List[str],
+    min_confidence: float
+) -> List[Dict[str, Any]]:
+    """Convert compact pool results ([x, y, w, h, confidence] rows) to text blocks"""
+    text_blocks = []
+    for (x, y, w, h, confidence), text in zip(boxes.tolist(), texts):
+        # Filter low confidence results
+        if confidence < min_confidence:
+            continue
+        
+        text_blocks.append({
+            "text": text.strip(),
+            "coords": [int(x), int(y), int(w), int(h)],
+            "confidence": float(confidence)
+        })
+    return text_blocks
+
+
+def _tile_ranges(height: int, tile_height: int, overlap: int) -> List[Tuple[int, int]]:
+    """Row ranges [top, bottom) of overlapping tiles covering a page"""
+    step = max(1, tile_height - overlap)
+    tiles = []
+    top = 0
+    while True:
+        bottom = min(height, top + tile_height)
+        tiles.append((top, bottom))
+        if bottom >= height:
+            return tiles
+        top += step
+
+
+def _box_overlap(a: List[int], b: List[int]) -> float:
+    """Intersection area of two (x, y, w, h) boxes over the smaller box's area"""
+    ix = min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0])
+    iy = min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1])
+    if ix <= 0 or iy <= 0:
+        return 0.0
+    smaller = min(a[2] * a[3], b[2] * b[3])
+    return (ix * iy) / smaller if smaller > 0 else 0.0
+
+
+def _boxes_intersect(a: List[int], b: List[int]) -> bool:
+    """Whether two (x, y, w, h) boxes overlap"""
+    return (
+        min(a[0] + a[2], b[0] + b[2]) > max(a[0], b[0])
+        and min(a[1] + a[3], b[1] + b[3]) > max(a[1], b[1])
+    )
+
+
+def _union_box(a: List[int], b: List[int]) -> List[int]:
+    """Smallest (x, y, w, h) box containing both boxes"""
+    x = min(a[0], b[0])
+    y = min(a[1], b[1])
+    return [x, y, max(a[0] + a[2], b[0] + b[2]) - x, max(a[1] + a[3], b[1] + b[3]) - y]
+
+
+def _merge_tile_blocks(
+    tile_blocks: List[List[Dict[str, Any]]],
+    tiles: List[Tuple[int, int]],
+    height: int,
+    overlap: int
+) -> List[Dict[str, Any]]:
+    """
+    Merge per-tile text blocks into page coordinates
+    
+    Each seam is owned by the tile on either side up to the middle of the
+    overlap: a line is kept by the tile that contains its center in its own
+    band. A line cut by a tile's edge is dropped when a whole line of the
+    neighbouring tile covers it; lines taller than the overlap (SFX, titles)
+    are cut in both tiles, so their partial boxes are merged instead.
+    Remaining duplicates (the same line found by both tiles with slightly
+    different boxes) keep the more confident read.
+    """
+    whole = []
+    cut = []
+    for index, ((top, bottom), blocks) in enumerate(zip(tiles, tile_blocks)):
+        for block in blocks:
+            x, y, w, h = block["coords"]
+            y += top
+            block = {**block, "coords": [x, y, w, h]}
+            cut_at_top = top > 0 and y <= top + 1
+            cut_at_bottom = bottom < height and y + h >= bottom - 1
+            if cut_at_top or cut_at_bottom:
+                cut.append((index, cut_at_top, cut_at_bottom, block))
+            else:
+                whole.append((index, block))
+    
+    merged = []
+    for index, block in whole:
+        top, bottom = tiles[index]
+        band_top = top + overlap // 2 if top > 0 else 0
+        band_bottom = bottom - overlap // 2 if bottom < height else height
+        y, h = block["coords"][1], block["coords"][3]
+        if band_top <= y + h / 2 < band_bottom:
+            merged.append(block)
+    
+    # Partial boxes not covered by a whole line of the neighbouring tile
+    fragments = []
+    for index, cut_at_top, cut_at_bottom, block in cut:
+        neighbours = {index - 1} if cut_at_top else set()
+        if cut_at_bottom:
+            neighbours.add(index + 1)
+        if any(
+            other_index in neighbours and _box_overlap(block["coords"], other["coords"]) > 0.5
+            for other_index, other in whole
+        ):
+            continue
+        fragments.append((index, block))
+    
+    # Join the pieces of a line cut by one or more seams (tile order)
+    pieces: List[Tuple[set, Dict[str, Any]]] = []
+    for index, block in fragments:
+        for i, (piece_tiles, piece) in enumerate(pieces):
+            if index in piece_tiles or not _boxes_intersect(piece["coords"], block["coords"]):
+                continue
+            best = piece if piece["confidence"] >= block["confidence"] else block
+            pieces[i] = (piece_tiles | {index}, {**best, "coords": _union_box(piece["coords"], block["coords"])})
+            break
+        else:
+            pieces.append(({index}, block))
+    merged.extend(block for _, block in pieces)
+    
+    kept: List[Dict[str, Any]] = []
+    for block in sorted(merged, key=lambda b: b["confidence"], reverse=True):
+        if any(_box_overlap(block["coords"], other["coords"]) > 0.8 for other in kept):
+            continue
+        kept.append(block)
+    kept.sort(key=lambda b: (b["coords"][1], b["coords"][0]))
+    return kept
+
+
+def _same_bubble(a: List[int], b: List[int], line_gap: float, max_height_ratio: float) -> bool:
+    """Whether two OCR lines (x, y, w, h) belong to the same text paragraph"""
+    line_height = min(a[3], b[3])
+    if line_height <= 0 or max(a[3], b[3]) > max_height_ratio * line_height:
+        return False
+    
+    x_overlap = min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0])
+    y_overlap = min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1])
+    
+    # Stacked lines: overlapping columns, small vertical gap
+    if x_overlap > 0 and -y_overlap <= line_gap * line_height:
+        return True
+    # Pieces of one line: same row, small horizontal gap
+    return y_overlap >= 0.5 * line_height and -x_overlap <= line_height
+
+
+def _join_lines(lines: List[Dict[str, Any]]) -> str:
+    """Join OCR lines in reading order (rows top to bottom, left to right in a row)"""
+    rows: List[List[Dict[str, Any]]] = []
+    for line in sorted(lines, key=lambda l: l["coords"][1] + l["coords"][3] / 2):
+        x, y, w, h = line["coords"]
+        if rows:
+            last = rows[-1][-1]["coords"]
+            if min(y + h, last[1] + last[3]) - max(y, last[1]) >= 0.5 * min(h, last[3]):
+                rows[-1].append(line)
+                continue
+        rows.append([line])
+    
+    text = ""
+    for row in rows:
+        for line in sorted(row, key=lambda l: l["coords"][0]):
+            part = line["text"]
+            if not part:
+                continue
+            if text.endswith("-") and part[:1].islower():
+                # Word hyphenated across lines
+                text = text[:-1] + part
+            else:
+                text = f"{text} {part}" if text else part
+    return text
+
+
+def group_text_blocks(
+    text_blocks: List[Dict[str, Any]],
+    line_gap: Optional[float] = None,
+    max_height_ratio: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """
+    Merge OCR lines into speech-bubble paragraphs
+    
+    EasyOCR returns one block per line, so a three-line bubble would be
+    translated and rendered as three segments. Lines are merged when they
+    are stacked with overlapping columns and a small gap (or are pieces of
+    the same row) and have similar heights. Each paragraph block spans the
+    union of its lines and keeps their boxes in "lines" for in-painting.
+    
+    Args:
+        text_blocks: Line blocks from detect_text_blocks
+        line_gap: Max vertical gap in line heights (default: BUBBLE_LINE_GAP)
+        max_height_ratio: Max line height ratio (default: BUBBLE_MAX_HEIGHT_RATIO)
+    
+    Returns:
+        Paragraph blocks in reading order
+    """
+    if len(text_blocks) < 2:
+        return text_blocks
+    line_gap = settings.BUBBLE_LINE_GAP if line_gap is None else line_gap
+    max_height_ratio = settings.BUBBLE_MAX_HEIGHT_RATIO if max_height_ratio is None else max_height_ratio
+    
+    # Union-find over lines that belong together
+    parent = list(range(len(text_blocks)))
+    
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    for i in range(len(text_blocks)):
+        for j in range(i + 1, len(text_blocks)):
+            if _same_bubble(text_blocks[i]["coords"], text_blocks[j]["coords"], line_gap, max_height_ratio):
+                parent[find(j)] = find(i)
+    
+    groups: Dict[int, List[Dict[str, Any]]] = {}
+    for i, block in enumerate(text_blocks):
+        groups.setdefault(find(i), []).append(block)
+    
+    grouped = []
+    for lines in groups.values():
+        if len(lines) == 1:
+            grouped.append(lines[0])
+            continue
+        coords = np.array([line["coords"] for line in lines])
+        x1, y1 = coords[:, 0].min(), coords[:, 1].min()
+        x2, y2 = (coords[:, 0] + coords[:, 2]).max(), (coords[:, 1] + coords[:, 3]).max()
+        grouped.append({
+            "text": _join_lines(lines),
+            "coords": [int(x1), int(y1), int(x2 - x1), int(y2 - y1)],
+            "confidence": float(np.mean([line["confidence"] for line in lines])),
+            "lines": [list(line["coords"]) for line in lines]
+        })
+    grouped.sort(key=lambda b: (b["coords"][1], b["coords"][0]))
+    return grouped
+
+
+def _may_contain_text(gray: np.ndarray) -> bool:
+    """
+    Cheap text-likelihood check on a grayscale page (no OCR)
+    
+    The page is downscaled to TEXT_PRECHECK_WIDTH. Blank pages (tiny gray
+    range) and pages with almost no edges are textless. Otherwise edges are
+    closed into line-like components, and the page may contain text if any
+    component has the size and density of a line of lettering, at the
+    check width or, for large lettering, a quarter of it. The check is
+    conservative: detailed art may pass as text (and is OCR'd as before).
+    """
+    height, width = gray.shape[:2]
+    if width > settings.TEXT_PRECHECK_WIDTH:
+        scaled_height = max(1, round(height * settings.TEXT_PRECHECK_WIDTH / width))
+        gray = cv2.resize(gray, (settings.TEXT_PRECHECK_WIDTH, scaled_height), interpolation=cv2.INTER_AREA)
+    
+    if int(gray.max()) - int(gray.min()) < settings.TEXT_PRECHECK_BLANK_RANGE:
+        return False
+    
+    edges = cv2.Canny(gray, 50, 150)
+    if cv2.countNonZero(edges) < settings.TEXT_PRECHECK_MIN_EDGES:
+        return False
+    
+    if _has_line_components(edges):
+        return True
+    
+    # Large lettering (SFX, titles) is checked again at a coarser scale, where
+    # its glyphs close into line-sized components like regular text
+    coarse = cv2.resize(
+        gray,
+        (max(1, gray.shape[1] // 4), max(1, gray.shape[0] // 4)),
+        interpolation=cv2.INTER_AREA
+    )
+    return _has_line_components(cv2.Canny(coarse, 50, 150))
+
+
+def _has_line_components(edges: np.ndarray) -> bool:
+    """Whether an edge map has components with the size and density of a line of lettering"""
+    # Merge glyph edges into word/line components
+    lines = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (7, 3)))
+    _, _, stats, _ = cv2.connectedComponentsWithStats(lines, connectivity=8)
+    for _, _, w, h, area in stats[1:]:
+        if 2 <= h <= 40 and w >= 4 and area >= 0.3 * w * h:
+            return True
+    return False
+
+
 class OCRService:
     """Service for OCR operations"""
     
-    def __init__(self):
-        """Initialize OCR service"""
-        self.reader = get_ocr_reader()
+    def __init__(self, backend: Optional[str] = None):
+        """
+        Initialize OCR service
+        
+        Args:
+            backend: OCR backend name (default: OCR_BACKEND, see select_backend_name)
+        """
+        self.backend_name = backend or settings.OCR_BACKEND
+        self.pool = get_ocr_process_pool()
+        # In process-pool mode the backend (and its models) lives in the pool workers
+        self.backend = None if self.pool else get_backend(self.backend_name)
+        self.languages = list(settings.OCR_LANGUAGES)
+        self.min_confidence = settings.OCR_MIN_CONFIDENCE
+        # Content-addressed OCR cache (same page bytes are never OCR'd twice)
+        self.cache = CacheService() if settings.OCR_CACHE_ENABLED else None
+    
+    @property
+    def supports_batch(self) -> bool:
+        """Whether detect_text_blocks_batch pools recognition across pages"""
+        return self.backend is not None and getattr(self.backend, "pools_recognition", False)
     
     async def detect_text_blocks_async(
         self,
@@ -57,51 +572,216 @@ class OCRService:
             image_bytes
         )
     
+    def _detect_in_pool(self, image_bytes: bytes) -> List[Dict[str, Any]]:
+        """Run OCR in the process pool, passing the page through shared memory"""
+        shm = shared_memory.SharedMemory(create=True, size=max(1, len(image_bytes)))
+        try:
+            shm.buf[:len(image_bytes)] = image_bytes
+            boxes, texts = _submit_to_pool(
+                self.pool, _readtext_in_pool, shm.name, len(image_bytes), self.backend_name
+            ).result()
+        finally:
+            shm.close()
+            shm.unlink()
+        return _format_pool_results(boxes, texts, self.min_confidence)
+    
+    def _detect_tiles_in_pool(
+        self,
+        img: np.ndarray,
+        tiles: List[Tuple[int, int]]
+    ) -> List[List[Dict[str, Any]]]:
+        """OCR the tiles of a decoded page in parallel across the process pool"""
+        shm = shared_memory.SharedMemory(create=True, size=max(1, img.nbytes))
+        try:
+            shared = np.ndarray(img.shape, dtype=np.uint8, buffer=shm.buf)
+            shared[:] = img
+            del shared
+            futures = [
+                _submit_to_pool(self.pool, _readtext_tile_in_pool, shm.name, img.shape, top, bottom, self.backend_name)
+                for top, bottom in tiles
+            ]
+            results = [future.result() for future in futures]
+        finally:
+            shm.close()
+            shm.unlink()
+        return [_format_pool_results(boxes, texts, self.min_confidence) for boxes, texts in results]
+    
+    def _run_tiled_ocr(self, img: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        OCR a tall page as overlapping tiles
+        
+        Tiles are at most OCR_TILE_HEIGHT rows, so the detector never scales a
+        strip down to its canvas size (small text survives) and peak memory
+        per call is bounded by one tile. Tiles run in parallel on the process
+        pool (or OCR_TILE_WORKERS threads in-process).
+        """
+        height = img.shape[0]
+        overlap = settings.OCR_TILE_OVERLAP
+        tiles = _tile_ranges(height, settings.OCR_TILE_HEIGHT, overlap)
+        logger.debug(f"OCR tiling: {height}px page in {len(tiles)} tiles")
+        
+        tile_blocks = None
+        if self.pool:
+            try:
+                tile_blocks = self._detect_tiles_in_pool(img, tiles)
+            except BrokenProcessPool as e:
+                logger.warning(f"OCR process pool broken, falling back to in-process reader: {e}")
+                _discard_ocr_process_pool()
+                self.pool = None
+        
+        if tile_blocks is None:
+            if self.backend is None:
+                self.backend = get_backend(self.backend_name)
+            tile_blocks = list(_ocr_tile_executor.map(
+                lambda tile: _format_results(
+                    self.backend.readtext(img[tile[0]:tile[1]]), self.min_confidence
+                ),
+                tiles
+            ))
+        
+        return _merge_tile_blocks(tile_blocks, tiles, height, overlap)
+    
+    @staticmethod
+    def _page_height(image_bytes: bytes, image: Optional[np.ndarray]) -> int:
+        """Page height from the decoded page, or the image header (no decode)"""
+        if image is not None:
+            return image.shape[0]
+        try:
+            with Image.open(io.BytesIO(image_bytes)) as header:
+                return header.height
+        except Exception:
+            return 0
+    
+    def may_contain_text(
+        self,
+        image_bytes: bytes,
+        image: Optional[np.ndarray] = None
+    ) -> bool:
+        """
+        Pre-classify a page before OCR (see _may_contain_text)
+        
+        Args:
+            image_bytes: Image bytes
+            image: Already-decoded BGR page (otherwise a reduced grayscale decode is used)
+        
+        Returns:
+            False if the page is classified as textless (skip OCR and in-painting)
+        """
+        try:
+            if image is not None:
+                gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            else:
+                gray = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_REDUCED_GRAYSCALE_2)
+            if gray is None:
+                return True  # Let OCR report the decode error
+            if _may_contain_text(gray):
+                return True
+            metrics.increment_counter("ocr.precheck.skipped")
+            return False
+        except Exception as e:
+            logger.warning(f"Text pre-check failed, running OCR: {e}")
+            return True
+    
+    def _run_ocr(
+        self,
+        image_bytes: bytes,
+        image: Optional[np.ndarray] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Run OCR on a page (process pool or in-process reader)
+        
+        Pages taller than OCR_TILE_HEIGHT are OCR'd as overlapping tiles.
+        
+        Args:
+            image_bytes: Image bytes
+            image: Already-decoded BGR page (skips decoding in-process)
+        
+        Returns:
+            List of text blocks, or None if the image could not be decoded
+        """
+        if settings.OCR_TILING_ENABLED and self._page_height(image_bytes, image) > settings.OCR_TILE_HEIGHT:
+            img = image if image is not None else cv2.imdecode(
+                np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR
+            )
+            if img is None:
+                logger.error("Failed to decode image")
+                return None
+            return self._run_tiled_ocr(img)
+        
+        if self.pool:
+            try:
+                return self._detect_in_pool(image_bytes)
+            except BrokenProcessPool as e:
+                logger.warning(f"OCR process pool broken, falling back to in-process reader: {e}")
+                _discard_ocr_process_pool()
+                self.pool = None
+        
+        if self.backend is None:
+            self.backend = get_backend(self.backend_name)
+        
+        if image is not None:
+            img = image
+        else:
+            # Convert bytes to numpy array
+            nparr = np.frombuffer(image_bytes, np.uint8)
+            img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        
+        if img is None:
+            logger.error("Failed to decode image")
+            return None
+        
+        # Run OCR
+        results = self.backend.readtext(img)
+        
+        # Format results
+        return _format_results(results, self.min_confidence)
+    
     def detect_text_blocks(
         self,
-        image_bytes: bytes
+        image_bytes: bytes,
+        image: Optional[np.ndarray] = None
     ) -> List[Dict[str, Any]]:
         """
         Detect text blocks in an image
         
+        Results are cached by a hash of the page bytes plus the OCR language
+        set and confidence threshold, so retries, re-translation into another
+        language and mode/type switches skip OCR entirely.
+        
         Args:
             image_bytes: Image bytes
-            
+            image: Already-decoded BGR page, if the caller has one
+                (avoids decoding the page again for in-process OCR)
+        
         Returns:
             List of text blocks with coordinates and text
         """
         try:
-            # Convert bytes to numpy array
-            nparr = np.frombuffer(image_bytes, np.uint8)
-            img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            image_hash = None
+            if self.cache:
+                image_hash = hashlib.sha256(image_bytes).hexdigest()
+                cached_blocks = self.cache.get_cached_ocr_blocks(
+                    image_hash, self.languages, self.min_confidence, backend=self.backend_name
+                )
+                if cached_blocks is not None:
+                    metrics.increment_counter("ocr.cache.hit")
+                    logger.debug(f"OCR cache hit: {image_hash[:12]} ({len(cached_blocks)} blocks)")
+                    return cached_blocks
+                metrics.increment_counter("ocr.cache.miss")
             
-            if img is None:
-                logger.error("Failed to decode image")
+            text_blocks = self._run_ocr(image_bytes, image)
+            if text_blocks is None:
                 return []
             
-            # Run OCR
-            results = self.reader.readtext(img)
-            
-            # Format results
-            text_blocks = []
-            for (bbox, text, confidence) in results:
-                # Filter low confidence results
-                if confidence < 0.5:
-                    continue
-                
-                # Convert bbox to (x, y, w, h) format
-                x_coords = [point[0] for point in bbox]
-                y_coords = [point[1] for point in bbox]
-                x = int(min(x_coords))
-                y = int(min(y_coords))
-                w = int(max(x_coords) - min(x_coords))
-                h = int(max(y_coords) - min(y_coords))
-                
-                text_blocks.append({
-                    "text": text.strip(),
-                    "coords": [x, y, w, h],
-                    "confidence": float(confidence)
-                })
+            if self.cache:
+                self.cache.set_cached_ocr_blocks(
+                    image_hash,
+                    self.languages,
+                    self.min_confidence,
+                    text_blocks,
+                    ttl=settings.OCR_CACHE_TTL,
+                    backend=self.backend_name
+                )
             
             logger.info(f"Detected {len(text_blocks)} text blocks")
             return text_blocks
@@ -109,3 +789,121 @@ class OCRService:
         except Exception as e:
             logger.error(f"Error in OCR detection: {e}", exc_info=True)
             return []
+    
+    def _recognize_batched(
+        self,
+        pages: List[Tuple[bytes, Optional[np.ndarray]]]
+    ) -> List[Optional[List[Dict[str, Any]]]]:
+        """
+        Detect text per page (tile) and recognize all crops in shared batches
+        
+        Args:
+            pages: (image bytes, already-decoded BGR page or None) per page
+        
+        Returns:
+            Text blocks per page (None if the page could not be decoded)
+        """
+        overlap = settings.OCR_TILE_OVERLAP
+        layouts = []  # Per page: (height, tile ranges), or None if undecodable
+        detected = []  # Detector output per tile, across all pages
+        for image_bytes, image in pages:
+            img = image if image is not None else cv2.imdecode(
+                np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR
+            )
+            if img is None:
+                logger.error("Failed to decode image")
+                layouts.append(None)
+                continue
+            height = img.shape[0]
+            if settings.OCR_TILING_ENABLED and height > settings.OCR_TILE_HEIGHT:
+                tiles = _tile_ranges(height, settings.OCR_TILE_HEIGHT, overlap)
+            else:
+                tiles = [(0, height)]
+            layouts.append((height, tiles))
+            detected.extend(self.backend.detect(img[top:bottom]) for top, bottom in tiles)
+        
+        recognized = iter(self.backend.recognize_pages(detected)) if detected else iter(())
+        results = []
+        for layout in layouts:
+            if layout is None:
+                results.append(None)
+                continue
+            height, tiles = layout
+            tile_blocks = [_format_results(next(recognized), self.min_confidence) for _ in tiles]
+            if len(tiles) == 1:
+                results.append(tile_blocks[0])
+            else:
+                results.append(_merge_tile_blocks(tile_blocks, tiles, height, overlap))
+        return results
+    
+    def detect_text_blocks_batch(
+        self,
+        pages: List[bytes],
+        images: Optional[List[Optional[np.ndarray]]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Detect text blocks in several pages of a chapter
+        
+        With a backend that pools recognition (easyocr_batched), the detector
+        runs per page and the text crops of all pages are recognized together,
+        so the recognizer sees full batches even on pages with a handful of
+        lines. Other backends (and process-pool mode) OCR page by page.
+        Cached pages are not OCR'd again.
+        
+        Args:
+            pages: Image bytes per page
+            images: Already-decoded BGR pages (None entries are decoded here)
+        
+        Returns:
+            List of text blocks per page, in input order
+        """
+        images = images if images is not None else [None] * len(pages)
+        if not self.supports_batch:
+            return [self.detect_text_blocks(page, image) for page, image in zip(pages, images)]
+        
+        results: List[Optional[List[Dict[str, Any]]]] = [None] * len(pages)
+        hashes: List[Optional[str]] = [None] * len(pages)
+        if self.cache:
+            for idx, image_bytes in enumerate(pages):
+                hashes[idx] = hashlib.sha256(image_bytes).hexdigest()
+                cached_blocks = self.cache.get_cached_ocr_blocks(
+                    hashes[idx], self.languages, self.min_confidence, backend=self.backend_name
+                )
+                if cached_blocks is not None:
+                    metrics.increment_counter("ocr.cache.hit")
+                    results[idx] = cached_blocks
+                else:
+                    metrics.increment_counter("ocr.cache.miss")
+        
+        misses = [idx for idx in range(len(pages)) if results[idx] is None]
+        if not misses:
+            return results
+        
+        try:
+            recognized = self._recognize_batched([(pages[idx], images[idx]) for idx in misses])
+        except Exception as e:
+            logger.error(f"Error in batched OCR, falling back to per-page OCR: {e}", exc_info=True)
+            for idx in misses:
+                results[idx] = self.detect_text_blocks(pages[idx], images[idx])
+            return results
+        
+        for idx, text_blocks in zip(misses, recognized):
+            if text_blocks is None:
+                results[idx] = []
+                continue
+            results[idx] = text_blocks
+            if self.cache:
+                self.cache.set_cached_ocr_blocks(
+                    hashes[idx],
+                    self.languages,
+                    self.min_confidence,
+                    text_blocks,
+                    ttl=settings.OCR_CACHE_TTL,
+                    backend=self.backend_name
+                )
+        
+        logger.info(
+            f"Detected {sum(len(blocks) for blocks in results)} text blocks "
+            f"on {len(pages)} pages ({len(misses)} OCR'd in shared batches)"
+        )
+        return results
@@ -3,7 +3,8 @@ Web Scraper Service - Fetches images from webtoon sites
 Uses adapter pattern to support multiple sites
 """
 import re
-from typing import List
+from typing import List, Optional, Callable
+import httpx
 from loguru import logger
 from app.services.scrapers.base_scraper import BaseScraper
 from app.services.scrapers.webtoons_scraper import WebtoonsScraper
@@ -13,12 +14,18 @@ from app.services.scrapers.asura_scraper import AsuraScraper
 class ScraperService:
     """Service for scraping webtoon images with multi-site support"""
     
-    def __init__(self):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        """
+        Args:
+            client: HTTP client shared by all scrapers (see ScrapingRuntime)
+        """
+        # The Asura domains share one scraper (same site layout and browser pool)
+        asura = AsuraScraper(client=client)
         self.scrapers = {
-            'webtoons.com': WebtoonsScraper(),
-            'asurascans.com.tr': AsuraScraper(),
-            'asuracomic.net': AsuraScraper(),
-            'asuracomic.com': AsuraScraper(),
+            'webtoons.com': WebtoonsScraper(client=client),
+            'asurascans.com.tr': asura,
+            'asuracomic.net': asura,
+            'asuracomic.com': asura,
         }
     
     def _detect_site(self, url: str) -> str:
@@ -41,7 +48,11 @@ class ScraperService:
         site = self._detect_site(url)
         return self.scrapers.get(site, self.scrapers['asuracomic.net'])
     
-    async def fetch_chapter_images(self, chapter_url: str) -> List[bytes]:
+    async def fetch_chapter_images(
+        self,
+        chapter_url: str,
+        on_page: Optional[Callable[[int, bytes], None]] = None
+    ) -> List[bytes]:
         """
         Fetch all images from a chapter URL
         
@@ -49,6 +60,8 @@ class ScraperService:
         
         Args:
             chapter_url: URL of the webtoon chapter
+            on_page: Optional callback called with (page_index, image_bytes)
+                as each page finishes downloading (enables page pipelining)
             
         Returns:
             List of image bytes
@@ -57,7 +70,7 @@ class ScraperService:
             logger.info(f"Fetching images from: {chapter_url}")
             
             scraper = self._get_scraper(chapter_url)
-            images = await scraper.fetch_chapter_images(chapter_url)
+            images = await scraper.fetch_chapter_images(chapter_url, on_page=on_page)
             
             if not images:
                 raise ValueError(f"No images found for URL: {chapter_url}")
@@ -92,7 +105,7 @@ class ScraperService:
     
     async def close(self):
         """Close all scraper HTTP clients"""
-        for scraper in self.scrapers.values():
+        for scraper in {id(scraper): scraper for scraper in self.scrapers.values()}.values():
             try:
                 await scraper.close()
             except:
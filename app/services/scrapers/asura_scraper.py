@@ -3,25 +3,142 @@ AsuraComic.net Scraper
 """
 import re
 import asyncio
-from typing import List, Dict
+from typing import List, Dict, Optional, Callable, Tuple
+import httpx
 from bs4 import BeautifulSoup
 from loguru import logger
-import undetected_chromedriver as uc
 import time
+from urllib.parse import urlsplit
+from app.core.config import settings
 from app.services.scrapers.base_scraper import BaseScraper
+from app.services.scrapers.source_cache import cache_lifetime
+from app.services.scrapers.browser_pool import (
+    drop_clearance,
+    get_browser_pool,
+    get_clearance,
+    is_challenge_page,
+    save_clearance
+)
+
+# Reader images: a chapter page is ready once one of them is in the DOM
+READER_IMAGES_SELECTOR = (
+    "div[class*='reading-content'] img, div[class*='reader'] img, div[class*='chapter'] img"
+)
 
 
 class AsuraScraper(BaseScraper):
     """Scraper for asuracomic.net"""
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        super().__init__(client)
         self.base_url = "https://asurascans.com.tr"  # Updated to .com.tr domain
-        # Use undetected-chromedriver for Cloudflare bypass
-        # Note: Non-headless mode required for Cloudflare bypass
-        self.driver = None
+        # Chrome sessions (undetected-chromedriver, Cloudflare bypass) are leased
+        # from the worker's browser pool instead of being started per scraper
+        self.browser_pool = get_browser_pool()
+    
+    def _fetch_html(self, url: str, ready_selector: Optional[str] = None) -> str:
+        """Load a page in a pooled Chrome session and return its HTML (blocking)"""
+        with self.browser_pool.lease() as session:
+            logger.info(f"[SCRAPER] Fetching URL: {url}")
+            start = time.time()
+            session.get(url)
+            # Wait for the Cloudflare challenge to pass and the content to appear
+            if session.wait_until_ready(ready_selector):
+                logger.info(f"[SCRAPER] Page ready in {time.time() - start:.1f}s")
+            else:
+                logger.warning(
+                    f"[SCRAPER] Page not ready after {settings.BROWSER_READY_TIMEOUT:g}s, using current HTML"
+                )
+            html = session.driver.page_source
+            if not is_challenge_page(html):
+                save_clearance(urlsplit(url).hostname, session.driver.get_cookies())
+            logger.info(f"[SCRAPER] HTML retrieved, length: {len(html)}")
+            return html
+    
+    def _apply_clearance(self, host: str) -> bool:
+        """Copy a host's Cloudflare clearance cookies into the httpx client"""
+        cookies = get_clearance(host)
+        if not cookies:
+            return False
+        for cookie in cookies:
+            self.client.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain") or host,
+                path=cookie.get("path") or "/"
+            )
+        return True
+    
+    async def _load_html(self, url: str, ready_selector: Optional[str] = None) -> str:
+        """
+        Get a page's HTML from the source cache, httpx or Chrome
+        
+        Fresh cached HTML skips the site entirely. HTML fetched over httpx is
+        cached as its Cache-Control allows (SOURCE_CACHE_HTML_MAX_AGE without
+        max-age). Chrome does not expose response headers, so rendered HTML is
+        kept SOURCE_CACHE_HTML_MAX_AGE: chapter pages are public and the same
+        for every visitor, and only complete, non-challenge pages are stored.
+        
+        Args:
+            url: Page URL
+            ready_selector: CSS selector the page must contain
+        """
+        cached = await asyncio.to_thread(self.source_cache.get, url) if self.source_cache else None
+        if cached and cached["fresh"]:
+            logger.info(f"[SCRAPER] Source cache hit: {url}")
+            return cached["body"].decode("utf-8", errors="replace")
+        
+        html, max_age = await self._fetch_page(url, ready_selector)
+        complete = not ready_selector or BeautifulSoup(html, 'html.parser').select_one(ready_selector) is not None
+        # Stored without validators, so entries that need revalidation (max-age 0) are not worth keeping
+        if self.source_cache and max_age and complete and not is_challenge_page(html):
+            await asyncio.to_thread(self.source_cache.put, url, html.encode("utf-8"), max_age)
+        return html
     
-    async def fetch_chapter_images(self, chapter_url: str) -> List[bytes]:
+    async def _fetch_page(self, url: str, ready_selector: Optional[str] = None) -> Tuple[str, Optional[int]]:
+        """
+        Fetch a page's HTML, skipping the browser while a Cloudflare clearance is valid
+        
+        With a stored clearance for the host the page is fetched over httpx; a
+        challenge or error response drops the clearance and falls back to
+        Chrome. HTML without the expected content (e.g. rendered by scripts)
+        also falls back to Chrome.
+        
+        Args:
+            url: Page URL
+            ready_selector: CSS selector the page must contain
+        
+        Returns:
+            (HTML, seconds it may be cached, None if it must not be stored)
+        """
+        host = urlsplit(url).hostname
+        if self._apply_clearance(host):
+            try:
+                response = await self.client.get(url)
+                if response.status_code in (403, 503) or is_challenge_page(response.text):
+                    logger.info(f"[SCRAPER] Cloudflare clearance rejected for {host}")
+                    drop_clearance(host)
+                else:
+                    response.raise_for_status()
+                    soup = BeautifulSoup(response.text, 'html.parser')
+                    if not ready_selector or soup.select_one(ready_selector) is not None:
+                        logger.info(f"[SCRAPER] Fetched {url} over httpx (Cloudflare clearance)")
+                        return response.text, cache_lifetime(
+                            response.headers, settings.SOURCE_CACHE_HTML_MAX_AGE
+                        )
+            except Exception as e:
+                logger.warning(f"[SCRAPER] Direct fetch failed, using Chrome: {e}")
+        
+        html = await asyncio.to_thread(self._fetch_html, url, ready_selector)
+        # Image downloads reuse the clearance as well
+        self._apply_clearance(host)
+        return html, settings.SOURCE_CACHE_HTML_MAX_AGE
+    
+    async def fetch_chapter_images(
+        self,
+        chapter_url: str,
+        on_page: Optional[Callable[[int, bytes], None]] = None
+    ) -> List[bytes]:
         """
         Fetch images from AsuraScans.com.tr chapter
         
@@ -30,54 +147,8 @@ class AsuraScraper(BaseScraper):
         try:
             logger.info(f"Fetching AsuraScans chapter: {chapter_url}")
             
-            # Get the chapter page using undetected-chromedriver (Cloudflare bypass)
-            def fetch_with_selenium(url):
-                # Initialize driver if not already done
-                if self.driver is None:
-                    logger.info("[SCRAPER] Initializing Chrome driver...")
-                    options = uc.ChromeOptions()
-                    # Try headless mode first (works in Celery worker)
-                    # If Cloudflare blocks, we'll need to use non-headless
-                    try:
-                        # For Celery worker, we need headless mode
-                        import os
-                        if os.getenv('CELERY_WORKER', '').lower() == 'true' or 'celery' in os.getenv('_', '').lower():
-                            # Running in Celery worker - use headless
-                            options.add_argument('--headless=new')
-                            logger.info("[SCRAPER] Using headless mode (Celery worker detected)")
-                        else:
-                            # Running in main process - try non-headless for Cloudflare
-                            logger.info("[SCRAPER] Using non-headless mode (main process)")
-                    except:
-                        # Default to headless for safety
-                        options.add_argument('--headless=new')
-                        logger.info("[SCRAPER] Using headless mode (default)")
-                    
-                    options.add_argument('--no-sandbox')
-                    options.add_argument('--disable-dev-shm-usage')
-                    options.add_argument('--disable-blink-features=AutomationControlled')
-                    options.add_argument('--disable-gpu')
-                    options.add_argument('--window-size=1920,1080')
-                    options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-                    
-                    try:
-                        self.driver = uc.Chrome(options=options, version_main=None)
-                        logger.info("[SCRAPER] Chrome driver initialized successfully")
-                    except Exception as e:
-                        logger.error(f"[SCRAPER] Failed to initialize Chrome driver: {e}")
-                        raise
-                
-                logger.info(f"[SCRAPER] Fetching URL: {url}")
-                self.driver.get(url)
-                # Wait for Cloudflare challenge to complete
-                logger.info("[SCRAPER] Waiting for page to load (10 seconds)...")
-                time.sleep(10)  # Wait for page to load
-                logger.info("[SCRAPER] Page loaded, getting HTML...")
-                html = self.driver.page_source
-                logger.info(f"[SCRAPER] HTML retrieved, length: {len(html)}")
-                return html
-            
-            html = await asyncio.to_thread(fetch_with_selenium, chapter_url)
+            # Get the chapter page (pooled Chrome session or reused Cloudflare clearance)
+            html = await self._load_html(chapter_url, ready_selector=READER_IMAGES_SELECTOR)
             soup = BeautifulSoup(html, 'html.parser')
             
             image_urls = []
@@ -180,7 +251,9 @@ class AsuraScraper(BaseScraper):
             logger.info(f"Found {len(unique_urls)} images, downloading...")
             
             # Download images in parallel with referer
-            images = await self._download_images_parallel(unique_urls, chapter_url=chapter_url)
+            images = await self.download_pages(
+                unique_urls, referer=chapter_url or self.base_url, on_page=on_page
+            )
             
             return images
             
@@ -188,34 +261,11 @@ class AsuraScraper(BaseScraper):
             logger.error(f"Error fetching AsuraScans images: {e}")
             raise
     
-    async def _download_images_parallel(self, image_urls: List[str], chapter_url: str = None) -> List[bytes]:
-        """Download multiple images in parallel"""
-        # Use httpx client for image downloads with referer header
-        referer = chapter_url or self.base_url
-        tasks = [self.download_image(url, referer=referer) for url in image_urls]
-        images = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Filter out exceptions
-        valid_images = [img for img in images if isinstance(img, bytes)]
-        logger.info(f"Downloaded {len(valid_images)}/{len(image_urls)} images")
-        return valid_images
-    
     async def analyze_url(self, url: str) -> Dict:
         """Analyze AsuraComic URL"""
         try:
-            # Use undetected-chromedriver for Cloudflare bypass
-            def fetch_with_selenium(url):
-                if self.driver is None:
-                    options = uc.ChromeOptions()
-                    options.add_argument('--no-sandbox')
-                    options.add_argument('--disable-dev-shm-usage')
-                    self.driver = uc.Chrome(options=options, version_main=None)
-                
-                self.driver.get(url)
-                time.sleep(10)
-                return self.driver.page_source
-            
-            html = await asyncio.to_thread(fetch_with_selenium, url)
+            # Pooled Chrome session or reused Cloudflare clearance
+            html = await self._load_html(url)
             soup = BeautifulSoup(html, 'html.parser')
             
             # Extract title
@@ -244,15 +294,9 @@ class AsuraScraper(BaseScraper):
             }
     
     async def close(self):
-        """Close HTTP client and Selenium driver"""
-        try:
-            await self.client.aclose()
-        except:
-            pass
+        """Close HTTP client (pooled Chrome sessions outlive the scraper)"""
         try:
-            if self.driver:
-                self.driver.quit()
-                self.driver = None
+            await super().close()
         except:
             pass
 
@@ -1,33 +1,90 @@
 """
 Base Scraper Interface
 """
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict, Optional, Callable, Tuple
+from urllib.parse import urlsplit
 import httpx
 from bs4 import BeautifulSoup
 from loguru import logger
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.retry import retry
+from app.services.scrapers.browser_pool import USER_AGENT
+from app.services.scrapers.source_cache import cache_lifetime, get_source_cache
+
+try:
+    import h2  # noqa: F401 (httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class RetryableHTTPError(Exception):
+    """Transient HTTP status (429/5xx), retried with backoff"""
+
+
+class PageDownloadError(Exception):
+    """A chapter page could not be downloaded, even after retries"""
+    
+    def __init__(self, index: int, url: str, cause: Exception):
+        super().__init__(f"Page {index + 1} failed to download ({url}): {cause}")
+        self.index = index
+        self.url = url
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """HTTP client for scrapers (browser-like headers, long-lived keep-alive connections)"""
+    return httpx.AsyncClient(
+        timeout=30.0,
+        follow_redirects=True,
+        http2=settings.SCRAPER_HTTP2 and HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=100,
+            max_keepalive_connections=20,
+            keepalive_expiry=settings.SCRAPER_KEEPALIVE_EXPIRY
+        ),
+        headers={
+            "User-Agent": USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.5",
+            "Accept-Encoding": "gzip, deflate, br",
+            "Connection": "keep-alive",
+            "Upgrade-Insecure-Requests": "1"
+        }
+    )
 
 
 class BaseScraper(ABC):
     """Base class for webtoon site scrapers"""
     
-    def __init__(self):
-        self.client = httpx.AsyncClient(
-            timeout=30.0,
-            follow_redirects=True,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.5",
-                "Accept-Encoding": "gzip, deflate, br",
-                "Connection": "keep-alive",
-                "Upgrade-Insecure-Requests": "1"
-            }
-        )
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        """
+        Args:
+            client: Shared HTTP client (see ScrapingRuntime); a private one is created if None
+        """
+        self._owns_client = client is None
+        self.client = client if client is not None else create_http_client()
+        # Download slots per host (see _host_limit)
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        # On-disk cache of source pages and chapter HTML (None if disabled)
+        self.source_cache = get_source_cache()
     
     @abstractmethod
-    async def fetch_chapter_images(self, chapter_url: str) -> List[bytes]:
-        """Fetch all images from a chapter URL"""
+    async def fetch_chapter_images(
+        self,
+        chapter_url: str,
+        on_page: Optional[Callable[[int, bytes], None]] = None
+    ) -> List[bytes]:
+        """
+        Fetch all images from a chapter URL
+        
+        Args:
+            chapter_url: URL of the chapter
+            on_page: Optional callback called with (page_index, image_bytes)
+                as soon as each page finishes downloading
+        """
         pass
     
     @abstractmethod
@@ -35,20 +92,167 @@ class BaseScraper(ABC):
         """Analyze URL and extract chapter info"""
         pass
     
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        """Semaphore bounding concurrent downloads from the URL's host"""
+        host = urlsplit(url).hostname or ""
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(max(1, settings.SCRAPER_MAX_CONNECTIONS_PER_HOST))
+        return self._host_limits[host]
+    
+    async def _cached_get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        default_max_age: Optional[int] = None
+    ) -> Tuple[bytes, Optional[str]]:
+        """
+        One GET attempt through the source cache, holding a slot of the host's limit
+        
+        Fresh cache entries are returned without a request; stale ones are
+        revalidated with their ETag / Last-Modified.
+        
+        Args:
+            url: Request URL
+            headers: Extra request headers
+            default_max_age: Freshness when Cache-Control has no max-age
+                (default: SOURCE_CACHE_MAX_AGE)
+        
+        Returns:
+            (body, text encoding)
+        """
+        headers = dict(headers or {})
+        cached = await asyncio.to_thread(self.source_cache.get, url) if self.source_cache else None
+        if cached and cached["fresh"]:
+            metrics.increment_counter("scraper.source_cache.hit")
+            return cached["body"], cached["encoding"]
+        if cached:
+            if cached["etag"]:
+                headers['If-None-Match'] = cached["etag"]
+            if cached["last_modified"]:
+                headers['If-Modified-Since'] = cached["last_modified"]
+        
+        async with self._host_limit(url):
+            response = await self.client.get(url, headers=headers)
+        if response.status_code == 429 or response.status_code >= 500:
+            raise RetryableHTTPError(f"HTTP {response.status_code} for {url}")
+        
+        lifetime = cache_lifetime(
+            response.headers,
+            settings.SOURCE_CACHE_MAX_AGE if default_max_age is None else default_max_age
+        )
+        if cached and response.status_code == 304:
+            metrics.increment_counter("scraper.source_cache.revalidated")
+            await asyncio.to_thread(
+                self.source_cache.refresh, url, lifetime or 0,
+                response.headers.get("etag"), response.headers.get("last-modified")
+            )
+            return cached["body"], cached["encoding"]
+        response.raise_for_status()
+        
+        if self.source_cache:
+            metrics.increment_counter("scraper.source_cache.miss")
+            if lifetime is not None:
+                await asyncio.to_thread(
+                    self.source_cache.put, url, response.content, lifetime,
+                    response.headers.get("etag"), response.headers.get("last-modified"), response.encoding
+                )
+        return response.content, response.encoding
+    
+    async def _get_image(self, img_url: str, referer: str = None) -> bytes:
+        """One download attempt (see _cached_get)"""
+        headers = {}
+        if referer:
+            headers['Referer'] = referer
+        body, _ = await self._cached_get(img_url, headers=headers)
+        return body
+    
+    def _with_retry(self, func: Callable) -> Callable:
+        """Retry connection errors, 429 and 5xx with backoff"""
+        return retry(
+            max_attempts=max(1, settings.SCRAPER_DOWNLOAD_ATTEMPTS),
+            delay=settings.SCRAPER_RETRY_DELAY,
+            exceptions=(httpx.TransportError, RetryableHTTPError)
+        )(func)
+    
+    async def fetch_html(self, url: str) -> str:
+        """
+        Fetch a page's HTML through the source cache
+        
+        Chapter HTML without a Cache-Control max-age is kept
+        SOURCE_CACHE_HTML_MAX_AGE seconds before it is revalidated.
+        """
+        body, encoding = await self._with_retry(self._cached_get)(
+            url, default_max_age=settings.SOURCE_CACHE_HTML_MAX_AGE
+        )
+        return body.decode(encoding or "utf-8", errors="replace")
+    
     async def download_image(self, img_url: str, referer: str = None) -> bytes:
-        """Download a single image"""
+        """Download a single image (source cache, retries with backoff)"""
         try:
-            headers = {}
-            if referer:
-                headers['Referer'] = referer
-            response = await self.client.get(img_url, headers=headers)
-            response.raise_for_status()
-            return response.content
+            return await self._with_retry(self._get_image)(img_url, referer=referer)
         except Exception as e:
             logger.error(f"Error downloading image {img_url}: {e}")
             raise
     
+    async def iter_pages(
+        self,
+        image_urls: List[str],
+        referer: str = None
+    ) -> AsyncIterator[Tuple[int, bytes]]:
+        """
+        Download chapter pages, yielding (page_index, image_bytes) as each arrives
+        
+        At most SCRAPER_MAX_CONNECTIONS_PER_HOST downloads run per host. A page
+        that still fails after retries raises PageDownloadError (the remaining
+        downloads are cancelled) rather than leaving a gap in the chapter.
+        
+        Args:
+            image_urls: Page image URLs in chapter order
+            referer: Referer header sent with every request
+        """
+        async def fetch(index: int, url: str) -> Tuple[int, bytes]:
+            try:
+                return index, await self.download_image(url, referer=referer)
+            except Exception as e:
+                raise PageDownloadError(index, url, e) from e
+        
+        tasks = [asyncio.ensure_future(fetch(idx, url)) for idx, url in enumerate(image_urls)]
+        try:
+            for next_page in asyncio.as_completed(tasks):
+                yield await next_page
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def download_pages(
+        self,
+        image_urls: List[str],
+        referer: str = None,
+        on_page: Optional[Callable[[int, bytes], None]] = None
+    ) -> List[bytes]:
+        """
+        Download chapter pages, returned in chapter order
+        
+        Args:
+            image_urls: Page image URLs in chapter order
+            referer: Referer header sent with every request
+            on_page: Optional callback called with (page_index, image_bytes)
+                as soon as each page arrives (pages arrive out of order)
+        
+        Raises:
+            PageDownloadError: If a page could not be downloaded
+        """
+        images: List[Optional[bytes]] = [None] * len(image_urls)
+        async for index, image_bytes in self.iter_pages(image_urls, referer=referer):
+            images[index] = image_bytes
+            if on_page:
+                on_page(index, image_bytes)
+        logger.info(f"Downloaded {len(images)} images")
+        return images
+    
     async def close(self):
-        """Close HTTP client"""
-        await self.client.aclose()
+        """Close HTTP client (unless it is shared)"""
+        if self._owns_client:
+            await self.client.aclose()
 
@@ -0,0 +1,381 @@
+"""
+Browser Pool - Worker-scoped pool of warm Chrome sessions for Cloudflare-protected sites
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+import undetected_chromedriver as uc
+from loguru import logger
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from app.core.config import settings
+from app.core.metrics import metrics
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Worker-wide pool (see get_browser_pool)
+_browser_pool = None
+_browser_pool_pid = None
+_browser_pool_lock = threading.Lock()
+
+# Cloudflare clearance cookies per host: {"cookies": [...], "expires_at": epoch}
+_clearances: Dict[str, Dict] = {}
+_clearances_lock = threading.Lock()
+
+# Markers of a Cloudflare interstitial ("Just a moment...") instead of the page
+CHALLENGE_MARKERS = ("<title>Just a moment", "cf-chl-", "_cf_chl_opt", 'id="challenge-form"')
+
+# True once the challenge is gone, the document is loaded and, if a CSS
+# selector is passed, at least one matching element exists
+READY_SCRIPT = """
+if (document.title.indexOf('Just a moment') !== -1 || document.getElementById('challenge-form')) {
+    return false;
+}
+if (document.readyState !== 'complete') {
+    return false;
+}
+return !arguments[0] || document.querySelectorAll(arguments[0]).length > 0;
+"""
+
+
+def is_challenge_page(html: str) -> bool:
+    """Whether HTML is a Cloudflare challenge rather than the requested page"""
+    return any(marker in html for marker in CHALLENGE_MARKERS)
+
+
+def save_clearance(host: str, cookies: List[Dict]):
+    """
+    Remember a host's cookies once a browser passed its Cloudflare challenge
+    
+    Only stored when a cf_clearance cookie is present. The clearance is bound
+    to the browser's User-Agent (the same one the httpx clients send) and
+    expires with the cookie, or after CLOUDFLARE_CLEARANCE_TTL at the latest.
+    """
+    clearance = next((c for c in cookies if c.get("name") == "cf_clearance"), None)
+    if clearance is None or settings.CLOUDFLARE_CLEARANCE_TTL <= 0:
+        return
+    expires_at = time.time() + settings.CLOUDFLARE_CLEARANCE_TTL
+    if clearance.get("expiry"):
+        expires_at = min(expires_at, float(clearance["expiry"]))
+    with _clearances_lock:
+        _clearances[host] = {"cookies": cookies, "expires_at": expires_at}
+    logger.info(f"[SCRAPER] Cloudflare clearance stored for {host} ({expires_at - time.time():.0f}s)")
+
+
+def get_clearance(host: str) -> Optional[List[Dict]]:
+    """Unexpired clearance cookies for a host (None if the browser is needed)"""
+    with _clearances_lock:
+        entry = _clearances.get(host)
+        if entry is None:
+            return None
+        if entry["expires_at"] <= time.time():
+            del _clearances[host]
+            return None
+        return entry["cookies"]
+
+
+def drop_clearance(host: str):
+    """Forget a host's clearance (rejected by Cloudflare)"""
+    with _clearances_lock:
+        _clearances.pop(host, None)
+
+
+def _use_headless() -> bool:
+    """Headless in Celery workers, visible Chrome in the main process (Cloudflare)"""
+    if settings.BROWSER_HEADLESS.lower() in ("true", "false"):
+        return settings.BROWSER_HEADLESS.lower() == "true"
+    return os.getenv('CELERY_WORKER', '').lower() == 'true' or 'celery' in os.getenv('_', '').lower()
+
+
+def _start_driver():
+    """Start a Chrome session (undetected-chromedriver)"""
+    options = uc.ChromeOptions()
+    if _use_headless():
+        options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument(f'--user-agent={USER_AGENT}')
+    return uc.Chrome(options=options, version_main=None)
+
+
+class BrowserSession:
+    """A pooled Chrome session (driver plus usage bookkeeping)"""
+    
+    def __init__(self, driver):
+        self.driver = driver
+        self.created_at = time.monotonic()
+        self.pages = 0  # Page loads since start (recycled after BROWSER_MAX_PAGES)
+        self.leased_at: Optional[float] = None
+        self.closed = False
+    
+    def get(self, url: str):
+        """Load a URL in this session"""
+        if self.closed:
+            raise RuntimeError("Browser session was reclaimed (lease timeout)")
+        self.pages += 1
+        self.driver.get(url)
+    
+    def wait_until_ready(self, selector: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the loaded page instead of sleeping a fixed time
+        
+        Args:
+            selector: CSS selector that must match (e.g. the reader images)
+            timeout: Max seconds to wait (default: BROWSER_READY_TIMEOUT)
+        
+        Returns:
+            Whether the page became ready (False on timeout)
+        """
+        timeout = settings.BROWSER_READY_TIMEOUT if timeout is None else timeout
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.25).until(
+                lambda driver: driver.execute_script(READY_SCRIPT, selector)
+            )
+            return True
+        except TimeoutException:
+            return False
+    
+    def is_healthy(self) -> bool:
+        """Whether the browser still answers (crashed or hung sessions are replaced)"""
+        if self.closed:
+            return False
+        try:
+            self.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+    
+    def quit(self):
+        """Stop the browser"""
+        self.closed = True
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.debug(f"Error stopping Chrome session: {e}")
+
+
+class BrowserPool:
+    """
+    Pool of warm Chrome sessions leased to scraping tasks
+    
+    Starting Chrome takes seconds, and ScraperService is built per task, so
+    each Asura chapter used to pay a cold browser start. The pool lives for
+    the worker process and keeps up to BROWSER_POOL_SIZE sessions:
+    
+    - lease() hands out an idle session (health-checked first) or starts a
+      new one, waiting up to BROWSER_ACQUIRE_TIMEOUT when all are leased
+    - sessions are recycled after BROWSER_MAX_PAGES page loads (Chrome
+      memory grows with use)
+    - a lease held longer than BROWSER_LEASE_TIMEOUT (a hung task) is
+      reclaimed: its browser is stopped and the slot freed
+    - a lease gives up after BROWSER_MAX_RESTARTS unhealthy sessions instead
+      of restarting Chrome forever
+    """
+    
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        lease_timeout: Optional[float] = None,
+        max_restarts: Optional[int] = None
+    ):
+        """
+        Args:
+            size: Max concurrent sessions (default: BROWSER_POOL_SIZE)
+            max_pages: Page loads before a session is recycled (default: BROWSER_MAX_PAGES)
+            lease_timeout: Seconds before a lease is reclaimed (default: BROWSER_LEASE_TIMEOUT)
+            max_restarts: Unhealthy sessions replaced per lease (default: BROWSER_MAX_RESTARTS)
+        """
+        self.size = max(1, size if size is not None else settings.BROWSER_POOL_SIZE)
+        self.max_pages = max_pages if max_pages is not None else settings.BROWSER_MAX_PAGES
+        self.lease_timeout = lease_timeout if lease_timeout is not None else settings.BROWSER_LEASE_TIMEOUT
+        self.max_restarts = max(0, max_restarts if max_restarts is not None else settings.BROWSER_MAX_RESTARTS)
+        self._idle: List[BrowserSession] = []
+        self._leased: List[BrowserSession] = []
+        self._starting = 0  # Sessions being started (count towards size)
+        self._condition = threading.Condition()
+        self._closed = False
+    
+    def _reclaim_expired(self) -> List[BrowserSession]:
+        """
+        Take back sessions whose lease timed out (caller holds the condition)
+        
+        Returns:
+            Reclaimed sessions, to be stopped once the condition is released
+        """
+        now = time.monotonic()
+        expired = []
+        for session in list(self._leased):
+            if now - session.leased_at > self.lease_timeout:
+                logger.warning(f"Browser lease expired after {self.lease_timeout:g}s, reclaiming session")
+                metrics.increment_counter("browser_pool.lease_expired")
+                self._leased.remove(session)
+                # Fails the hung task's next page load (see BrowserSession.get)
+                session.closed = True
+                expired.append(session)
+        return expired
+    
+    def _acquire(self, timeout: float) -> BrowserSession:
+        deadline = time.monotonic() + timeout
+        restarts = 0
+        while True:
+            expired = []
+            try:
+                with self._condition:
+                    while True:
+                        if self._closed:
+                            raise RuntimeError("Browser pool is closed")
+                        expired.extend(self._reclaim_expired())
+                        if self._idle:
+                            # Leased right away, health-checked below without the lock
+                            session = self._idle.pop()
+                            session.leased_at = time.monotonic()
+                            self._leased.append(session)
+                            break
+                        if len(self._leased) + self._starting < self.size:
+                            self._starting += 1
+                            session = None
+                            break
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise TimeoutError(f"No browser session available within {timeout:g}s")
+                        # Wake up in time to reclaim the oldest lease if it expires first
+                        if self._leased:
+                            oldest = min(leased.leased_at for leased in self._leased)
+                            remaining = min(remaining, max(0.1, oldest + self.lease_timeout - time.monotonic()))
+                        self._condition.wait(remaining)
+            finally:
+                for stale in expired:
+                    stale.quit()
+            
+            started = session is None
+            if started:
+                session = self._start_session()
+            # A chromedriver round trip, so other leases and releases go on meanwhile
+            if session.is_healthy():
+                if not started:
+                    metrics.increment_counter("browser_pool.reused")
+                return session
+            logger.warning("Discarding unhealthy Chrome session")
+            with self._condition:
+                if session in self._leased:
+                    self._leased.remove(session)
+                self._condition.notify()
+            session.quit()
+            restarts += 1
+            if restarts > self.max_restarts:
+                raise RuntimeError(f"Chrome sessions still unhealthy after {self.max_restarts} restarts")
+    
+    def _start_session(self) -> BrowserSession:
+        """Start Chrome for a reserved slot and lease the new session"""
+        # Outside the lock, other leases and releases go on meanwhile
+        try:
+            logger.info("[SCRAPER] Starting Chrome session...")
+            start = time.time()
+            session = BrowserSession(_start_driver())
+            metrics.record_timing("browser_pool.start", time.time() - start)
+            logger.info(f"[SCRAPER] Chrome session started in {time.time() - start:.1f}s")
+        except Exception:
+            with self._condition:
+                self._starting -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._starting -= 1
+            session.leased_at = time.monotonic()
+            self._leased.append(session)
+        return session
+    
+    def _release(self, session: BrowserSession):
+        # Health-check before taking the lock (a chromedriver round trip)
+        recycle = session.pages >= self.max_pages or not session.is_healthy()
+        with self._condition:
+            if session not in self._leased:
+                # Reclaimed after its lease expired, already stopped
+                return
+            self._leased.remove(session)
+            session.leased_at = None
+            recycle = recycle or self._closed
+            if not recycle:
+                self._idle.append(session)
+            self._condition.notify()
+        if recycle:
+            logger.info(f"Recycling Chrome session after {session.pages} pages")
+            session.quit()
+    
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Iterator[BrowserSession]:
+        """
+        Lease a Chrome session for the duration of the block
+        
+        Args:
+            timeout: Seconds to wait for a free session (default: BROWSER_ACQUIRE_TIMEOUT)
+        
+        Raises:
+            TimeoutError: If no session became available in time
+        """
+        session = self._acquire(settings.BROWSER_ACQUIRE_TIMEOUT if timeout is None else timeout)
+        try:
+            yield session
+        except Exception:
+            # The page state is unknown after an error, don't hand it to the next task
+            session.pages = max(session.pages, self.max_pages)
+            raise
+        finally:
+            self._release(session)
+    
+    def warm(self, count: int):
+        """Start sessions up front so the first tasks find a warm browser"""
+        count = min(count, self.size)
+        sessions = []
+        try:
+            for _ in range(count):
+                sessions.append(self._acquire(settings.BROWSER_ACQUIRE_TIMEOUT))
+        finally:
+            for session in sessions:
+                self._release(session)
+    
+    def stats(self) -> dict:
+        """Current pool occupancy"""
+        with self._condition:
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "leased": len(self._leased),
+                "starting": self._starting
+            }
+    
+    def close(self):
+        """Stop every session (leased sessions are stopped on release)"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for session in idle:
+            session.quit()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Get or create the worker's browser pool (singleton)"""
+    global _browser_pool, _browser_pool_pid
+    # Chrome sessions and their chromedriver connections do not survive a fork (Celery prefork children)
+    if _browser_pool is None or _browser_pool_pid != os.getpid():
+        with _browser_pool_lock:
+            if _browser_pool is None or _browser_pool_pid != os.getpid():
+                _browser_pool = BrowserPool()
+                _browser_pool_pid = os.getpid()
+    return _browser_pool
+
+
+def shutdown_browser_pool():
+    """Stop the worker's Chrome sessions (worker shutdown)"""
+    global _browser_pool
+    with _browser_pool_lock:
+        pool, _browser_pool = _browser_pool, None
+    if pool is not None and _browser_pool_pid == os.getpid():
+        pool.close()
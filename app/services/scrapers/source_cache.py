@@ -0,0 +1,233 @@
+"""
+Source Cache - On-disk HTTP cache for scraped pages and chapter HTML
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+from loguru import logger
+from app.core.config import settings
+
+# Process-wide cache (see get_source_cache)
+_source_cache = None
+_source_cache_pid = None
+_source_cache_lock = threading.Lock()
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def cache_lifetime(headers: Mapping[str, str], default: int) -> Optional[int]:
+    """
+    Seconds a response stays fresh, from its Cache-Control header
+    
+    Returns:
+        None if the response must not be stored (no-store, or private: the
+        cache is shared by all jobs), 0 if it must be revalidated before
+        every use, else max-age (default when absent)
+    """
+    cache_control = headers.get("cache-control", "").lower()
+    if "no-store" in cache_control or "private" in cache_control:
+        return None
+    if "no-cache" in cache_control:
+        return 0
+    match = _MAX_AGE_RE.search(cache_control)
+    return int(match.group(1)) if match else default
+
+
+class SourceCache:
+    """
+    On-disk HTTP cache for source images and chapter HTML
+    
+    Re-translating a chapter (another target language, a retry, clean mode)
+    used to download every page again. Responses are stored by URL under
+    SOURCE_CACHE_PATH:
+    
+    - fresh entries are served without a request
+    - stale entries are revalidated with If-None-Match / If-Modified-Since
+      (a 304 costs no body transfer)
+    - the least recently used entries are evicted beyond SOURCE_CACHE_MAX_MB
+    
+    The index is a SQLite database (WAL mode) next to the body files, so all
+    worker processes on a host share one cache.
+    """
+    
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None):
+        """
+        Args:
+            path: Cache directory (default: SOURCE_CACHE_PATH)
+            max_bytes: Size limit of stored bodies (default: SOURCE_CACHE_MAX_MB)
+        """
+        self.path = Path(path or settings.SOURCE_CACHE_PATH)
+        self.max_bytes = max_bytes if max_bytes is not None else settings.SOURCE_CACHE_MAX_MB * 1024 * 1024
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            str(self.path / "index.sqlite3"),
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, url TEXT, etag TEXT, last_modified TEXT, encoding TEXT, "
+            "size INTEGER, expires_at REAL, accessed_at REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+    
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+    
+    def _body_path(self, key: str) -> Path:
+        return self.path / key[:2] / key
+    
+    def _execute(self, sql: str, params: tuple = ()) -> list:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+    
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response
+        
+        Returns:
+            Dict with body, etag, last_modified, encoding and fresh (False:
+            revalidate before use), or None on a miss
+        """
+        key = self._key(url)
+        try:
+            rows = self._execute(
+                "SELECT etag, last_modified, encoding, expires_at FROM entries WHERE key = ?", (key,)
+            )
+            if not rows:
+                return None
+            etag, last_modified, encoding, expires_at = rows[0]
+            try:
+                body = self._body_path(key).read_bytes()
+            except FileNotFoundError:
+                # Evicted by another process meanwhile
+                self._execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            now = time.time()
+            self._execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            return {
+                "body": body,
+                "etag": etag,
+                "last_modified": last_modified,
+                "encoding": encoding,
+                "fresh": expires_at > now
+            }
+        except Exception as e:
+            logger.warning(f"Source cache read failed for {url}: {e}")
+            return None
+    
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        max_age: int,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        encoding: Optional[str] = None
+    ):
+        """
+        Store a response
+        
+        Args:
+            url: Request URL
+            body: Response body
+            max_age: Seconds the entry is served without revalidation
+            etag: ETag validator
+            last_modified: Last-Modified validator
+            encoding: Text encoding (HTML responses)
+        """
+        key = self._key(url)
+        path = self._body_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and rename, so readers never see a partial body
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(body)
+                os.replace(tmp_path, path)
+            except Exception:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+            now = time.time()
+            self._execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, etag, last_modified, encoding, len(body), now + max_age, now)
+            )
+            self._evict()
+        except Exception as e:
+            logger.warning(f"Source cache write failed for {url}: {e}")
+    
+    def refresh(
+        self,
+        url: str,
+        max_age: int,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        """Mark an entry fresh again after a 304 (new validators, if sent, replace the old ones)"""
+        try:
+            self._execute(
+                "UPDATE entries SET expires_at = ?, accessed_at = ?, "
+                "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE key = ?",
+                (time.time() + max_age, time.time(), etag, last_modified, self._key(url))
+            )
+        except Exception as e:
+            logger.warning(f"Source cache refresh failed for {url}: {e}")
+    
+    def _evict(self):
+        """Drop least recently used entries until the cache is below 90% of its limit"""
+        if self.max_bytes <= 0:
+            return
+        total = self._execute("SELECT COALESCE(SUM(size), 0) FROM entries")[0][0]
+        if total <= self.max_bytes:
+            return
+        target = self.max_bytes * 0.9
+        evicted = 0
+        for key, size in self._execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+            if total <= target:
+                break
+            self._execute("DELETE FROM entries WHERE key = ?", (key,))
+            try:
+                self._body_path(key).unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted += 1
+        logger.info(f"Source cache: evicted {evicted} entries ({total / 1024 / 1024:.0f} MB kept)")
+
+
+def get_source_cache() -> Optional[SourceCache]:
+    """
+    Get the process's source cache (singleton)
+    
+    Returns:
+        Source cache, or None if disabled or the cache directory is unusable
+    """
+    global _source_cache, _source_cache_pid
+    if not settings.SOURCE_CACHE_ENABLED:
+        return None
+    # SQLite connections must not cross a fork (Celery prefork children)
+    if _source_cache is None or _source_cache_pid != os.getpid():
+        with _source_cache_lock:
+            if _source_cache is None or _source_cache_pid != os.getpid():
+                try:
+                    _source_cache = SourceCache()
+                    _source_cache_pid = os.getpid()
+                except Exception as e:
+                    logger.warning(f"Source cache unavailable: {e}")
+                    return None
+    return _source_cache
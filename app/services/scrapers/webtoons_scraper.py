@@ -3,8 +3,8 @@ Webtoons.com Scraper
 """
 import re
 import json
-import asyncio
-from typing import List, Dict
+from typing import List, Dict, Optional, Callable
+import httpx
 from bs4 import BeautifulSoup
 from loguru import logger
 from app.services.scrapers.base_scraper import BaseScraper
@@ -13,17 +13,28 @@ from app.services.scrapers.base_scraper import BaseScraper
 class WebtoonsScraper(BaseScraper):
     """Scraper for webtoons.com"""
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        super().__init__(client)
         self.base_url = "https://www.webtoons.com"
     
-    async def fetch_chapter_images(self, chapter_url: str) -> List[bytes]:
+    async def fetch_chapter_images(
+        self,
+        chapter_url: str,
+        on_page: Optional[Callable[[int, bytes], None]] = None
+    ) -> List[bytes]:
         """
         Fetch images from webtoons.com chapter
         
         Webtoons.com uses API endpoints to load images. We extract title_no and episode_no
         from URL and call the API endpoint.
         """
+        # Pages already handed to on_page (no HTML fallback once the pipeline has pages)
+        streamed = []
+        
+        def stream_page(index: int, data: bytes):
+            streamed.append(index)
+            on_page(index, data)
+        
         try:
             logger.info(f"Fetching Webtoons.com chapter: {chapter_url}")
             
@@ -40,10 +51,8 @@ class WebtoonsScraper(BaseScraper):
             # Method 2: Look for JavaScript variables with image URLs
             # Method 3: Try API endpoint if available
             
-            # First, get the HTML page
-            response = await self.client.get(chapter_url)
-            response.raise_for_status()
-            html = response.text
+            # First, get the HTML page (source cache)
+            html = await self.fetch_html(chapter_url)
             soup = BeautifulSoup(html, 'html.parser')
             
             image_urls = []
@@ -111,7 +120,7 @@ class WebtoonsScraper(BaseScraper):
             if not image_urls:
                 logger.warning("All methods failed, trying HTML parsing fallback...")
                 # This will raise an error if no images found
-                return await self._fetch_from_html(chapter_url)
+                return await self._fetch_from_html(chapter_url, on_page=on_page)
             
             # Clean and validate URLs
             unique_urls = []
@@ -132,22 +141,25 @@ class WebtoonsScraper(BaseScraper):
             logger.info(f"Found {len(unique_urls)} images from API, downloading...")
             
             # Download images in parallel
-            images = await self._download_images_parallel(unique_urls)
+            images = await self.download_pages(unique_urls, on_page=stream_page if on_page else None)
             
             return images
             
         except Exception as e:
             logger.error(f"Error fetching Webtoons.com images: {e}")
-            # Fallback to HTML parsing
-            try:
-                return await self._fetch_from_html(chapter_url)
-            except:
+            if streamed:
+                # The fallback finds its own URL list, its pages would mix with the streamed ones
                 raise
+            # Fallback to HTML parsing
+            return await self._fetch_from_html(chapter_url, on_page=on_page)
     
-    async def _fetch_from_html(self, chapter_url: str) -> List[bytes]:
+    async def _fetch_from_html(
+        self,
+        chapter_url: str,
+        on_page: Optional[Callable[[int, bytes], None]] = None
+    ) -> List[bytes]:
         """Fallback method: Parse HTML to find images"""
-        response = await self.client.get(chapter_url)
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(await self.fetch_html(chapter_url), 'html.parser')
         
         image_urls = []
         
@@ -173,7 +185,7 @@ class WebtoonsScraper(BaseScraper):
         if not image_urls:
             raise ValueError(f"No images found in HTML for: {chapter_url}")
         
-        return await self._download_images_parallel(list(set(image_urls)))
+        return await self.download_pages(list(dict.fromkeys(image_urls)), on_page=on_page)
     
     def _extract_title_no(self, url: str) -> str:
         """Extract title_no from URL"""
@@ -189,17 +201,6 @@ class WebtoonsScraper(BaseScraper):
             return match.group(1)
         return None
     
-    
-    async def _download_images_parallel(self, image_urls: List[str]) -> List[bytes]:
-        """Download multiple images in parallel"""
-        tasks = [self.download_image(url) for url in image_urls]
-        images = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Filter out exceptions
-        valid_images = [img for img in images if isinstance(img, bytes)]
-        logger.info(f"Downloaded {len(valid_images)}/{len(image_urls)} images")
-        return valid_images
-    
     async def analyze_url(self, url: str) -> Dict:
         """Analyze Webtoons.com URL"""
         try:
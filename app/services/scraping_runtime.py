@@ -0,0 +1,100 @@
+"""
+Scraping Runtime - Long-lived event loop, HTTP client and scrapers per worker process
+"""
+import asyncio
+import os
+import threading
+from typing import Any, Awaitable, Optional
+from loguru import logger
+from app.services.scraper_service import ScraperService
+from app.services.scrapers.base_scraper import create_http_client
+
+# Process-wide runtime (see get_scraping_runtime)
+_runtime = None
+_runtime_pid = None
+_runtime_lock = threading.Lock()
+
+
+class ScrapingRuntime:
+    """
+    Per-worker scraping runtime
+    
+    Chapter tasks used to build a ScraperService (four scrapers, each with
+    its own httpx client) and two throwaway event loops per chapter, so every
+    chapter paid new TCP/TLS handshakes to the same CDNs. The runtime owns,
+    for the life of the worker process:
+    
+    - one event loop running in a background thread
+    - one httpx client shared by every scraper (keep-alive connections and
+      TLS sessions per host, SCRAPER_KEEPALIVE_EXPIRY)
+    - one ScraperService with its scrapers registered once
+    
+    Sync callers (Celery tasks) submit coroutines with run().
+    """
+    
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="scraping-loop", daemon=True)
+        self._thread.start()
+        # The client is created on the runtime loop, where all its requests run
+        self.client = self.run(self._create_client())
+        self.scraper = ScraperService(client=self.client)
+        logger.info("Scraping runtime started")
+    
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+    
+    @staticmethod
+    async def _create_client():
+        return create_http_client()
+    
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the runtime loop and wait for its result
+        
+        Args:
+            coro: Coroutine to run (e.g. scraper.fetch_chapter_images(...))
+            timeout: Max seconds to wait (None = no limit)
+        
+        Returns:
+            The coroutine's result (its exception is raised here)
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            # Timeout or task interruption (e.g. soft time limit): stop the coroutine too
+            future.cancel()
+            raise
+    
+    def close(self):
+        """Close the scrapers and the shared client, then stop the loop"""
+        try:
+            self.run(self.scraper.close(), timeout=10)
+            self.run(self.client.aclose(), timeout=10)
+        except Exception as e:
+            logger.warning(f"Error closing scraping runtime: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+
+
+def get_scraping_runtime() -> ScrapingRuntime:
+    """Get or create the process's scraping runtime (singleton)"""
+    global _runtime, _runtime_pid
+    # The loop thread does not survive a fork (Celery prefork children)
+    if _runtime is None or _runtime_pid != os.getpid():
+        with _runtime_lock:
+            if _runtime is None or _runtime_pid != os.getpid():
+                _runtime = ScrapingRuntime()
+                _runtime_pid = os.getpid()
+    return _runtime
+
+
+def shutdown_scraping_runtime():
+    """Close the process's scraping runtime (worker shutdown)"""
+    global _runtime
+    with _runtime_lock:
+        runtime, _runtime = _runtime, None
+    if runtime is not None and _runtime_pid == os.getpid():
+        runtime.close()
@@ -0,0 +1,203 @@
+"""
+Translation Memory Service - Segment-level reuse of previous translations
+"""
+import re
+import json
+import unicodedata
+import hashlib
+from typing import List, Optional, Callable, Dict, Tuple
+from redis import Redis
+from loguru import logger
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+class TranslationMemory:
+    """
+    Segment-level translation memory (Redis-backed)
+    
+    Webtoon text is highly repetitive (SFX, "...", "What?!", catchphrases,
+    recap panels). Each segment is stored under its normalized source text,
+    scoped by language pair, series, provider and glossary. Exact hits are
+    served locally and only misses are sent to the translation backend.
+    """
+    
+    _WHITESPACE_RE = re.compile(r"\s+")
+    
+    def __init__(self):
+        """Initialize Redis client"""
+        self.enabled = settings.TRANSLATION_MEMORY_ENABLED
+        self.redis = None
+        if not self.enabled:
+            return
+        try:
+            self.redis = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+            self.redis.ping()
+        except Exception as e:
+            logger.warning(f"Translation memory Redis connection failed: {e}")
+            self.redis = None
+    
+    @classmethod
+    def normalize_segment(cls, text: str) -> str:
+        """Normalize a source segment (unicode form and whitespace)"""
+        if not text:
+            return ""
+        text = unicodedata.normalize("NFKC", text)
+        return cls._WHITESPACE_RE.sub(" ", text).strip()
+    
+    def _generate_key(
+        self,
+        source_lang: str,
+        target_lang: str,
+        provider: str,
+        series_name: Optional[str] = None,
+        glossary: Optional[Dict[str, str]] = None
+    ) -> str:
+        """Generate Redis hash key for a language pair, series, provider and glossary"""
+        series_part = hashlib.md5((series_name or "").strip().lower().encode()).hexdigest()[:16]
+        key = f"webtoon:tm:{provider}:{source_lang}:{target_lang}:{series_part}"
+        if glossary:
+            # Editing the glossary starts a new memory (old entries ignore the new terms)
+            glossary_json = json.dumps(sorted(glossary.items()), ensure_ascii=False)
+            key += f":{hashlib.md5(glossary_json.encode()).hexdigest()[:16]}"
+        return key
+    
+    def lookup(
+        self,
+        texts: List[str],
+        source_lang: str,
+        target_lang: str,
+        provider: str,
+        series_name: Optional[str] = None,
+        glossary: Optional[Dict[str, str]] = None
+    ) -> List[Optional[str]]:
+        """
+        Look up translations for segments
+        
+        Returns:
+            List aligned with texts: stored translation, or None on miss
+        """
+        if not self.redis or not texts:
+            return [None] * len(texts)
+        
+        try:
+            key = self._generate_key(source_lang, target_lang, provider, series_name, glossary)
+            return self.redis.hmget(key, [self.normalize_segment(t) for t in texts])
+        except Exception as e:
+            logger.error(f"Error reading translation memory: {e}")
+            return [None] * len(texts)
+    
+    def store(
+        self,
+        translations: Dict[str, str],
+        source_lang: str,
+        target_lang: str,
+        provider: str,
+        series_name: Optional[str] = None,
+        glossary: Optional[Dict[str, str]] = None
+    ):
+        """
+        Store translations
+        
+        Args:
+            translations: {source_segment: translated_segment}
+        """
+        if not self.redis or not translations:
+            return
+        
+        try:
+            key = self._generate_key(source_lang, target_lang, provider, series_name, glossary)
+            mapping = {
+                self.normalize_segment(source): translated
+                for source, translated in translations.items()
+            }
+            pipe = self.redis.pipeline()
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, settings.TRANSLATION_MEMORY_TTL)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Error writing translation memory: {e}")
+    
+    def translate_with_memory(
+        self,
+        texts: List[str],
+        translate_fn: Callable[[List[str]], Tuple[List[str], List[bool]]],
+        source_lang: str,
+        target_lang: str,
+        provider: str,
+        series_name: Optional[str] = None,
+        glossary: Optional[Dict[str, str]] = None
+    ) -> List[str]:
+        """
+        Translate texts, serving exact hits from memory
+        
+        Only unique misses are passed to translate_fn. Translations the
+        backend reports as successful are written back to memory; failed
+        items, and every item of a response with the wrong count, are not.
+        
+        Args:
+            texts: Source segments
+            translate_fn: Backend call, takes a list of segments and returns
+                (translations in the same order, per-segment success flags)
+            source_lang: Source language code
+            target_lang: Target language code
+            provider: Provider identifier (e.g. "ai:gpt-4o-mini", "free:auto")
+            series_name: Series name (scopes character names and terms)
+            glossary: Glossary passed to the backend ({original: translated})
+        
+        Returns:
+            List of translated texts in the same order
+        """
+        if not texts:
+            return []
+        if not self.redis:
+            return translate_fn(texts)[0]
+        
+        cached = self.lookup(texts, source_lang, target_lang, provider, series_name, glossary)
+        
+        results: List[Optional[str]] = list(cached)
+        miss_segments: List[str] = []
+        miss_positions: Dict[str, List[int]] = {}
+        hits = 0
+        
+        for idx, text in enumerate(texts):
+            segment = self.normalize_segment(text)
+            if not segment:
+                results[idx] = ""
+                continue
+            if cached[idx] is not None:
+                hits += 1
+                continue
+            if segment not in miss_positions:
+                miss_positions[segment] = []
+                miss_segments.append(segment)
+            miss_positions[segment].append(idx)
+        
+        misses = sum(len(positions) for positions in miss_positions.values())
+        if hits:
+            metrics.increment_counter("translation_memory.hit", hits)
+        if misses:
+            metrics.increment_counter("translation_memory.miss", misses)
+        logger.info(
+            f"Translation memory ({provider}): {hits} hits, {misses} misses "
+            f"({len(miss_segments)} unique segments sent to backend)"
+        )
+        
+        if miss_segments:
+            translated, succeeded = translate_fn(miss_segments)
+            aligned = len(translated) == len(succeeded) == len(miss_segments)
+            if not aligned:
+                logger.warning(
+                    f"Translation backend returned {len(translated)} results for "
+                    f"{len(miss_segments)} segments, not memorizing them"
+                )
+            new_entries = {}
+            for seg_idx, segment in enumerate(miss_segments):
+                value = translated[seg_idx] if seg_idx < len(translated) else ""
+                for pos in miss_positions[segment]:
+                    results[pos] = value
+                if aligned and succeeded[seg_idx] and isinstance(value, str) and value.strip():
+                    new_entries[segment] = value
+            self.store(new_entries, source_lang, target_lang, provider, series_name, glossary)
+        
+        return [r if r is not None else "" for r in results]
@@ -0,0 +1,34 @@
+"""
+Maintenance background tasks (run periodically by Celery beat)
+"""
+from loguru import logger
+from app.core.celery_app import celery_app
+from app.core.config import settings
+
+@celery_app.task(name="cleanup_blob_store")
+def cleanup_blob_store_task():
+    """
+    Delete page blobs no translation job references any more
+    
+    Blobs referenced by a job's stored result are kept; the others are
+    deleted once they are older than BLOB_STORE_TTL.
+    """
+    if settings.BLOB_STORE_TTL <= 0:
+        return {"deleted": 0}
+    
+    from app.db.session import SessionLocal
+    from app.models.job import TranslationJob
+    from app.services.blob_store import BlobStore, result_refs
+    
+    db = SessionLocal()
+    try:
+        rows = db.query(TranslationJob.result_data).filter(
+            TranslationJob.result_data.isnot(None)
+        ).yield_per(500)
+        referenced = result_refs(result_data for (result_data,) in rows)
+    finally:
+        db.close()
+    
+    deleted = BlobStore().cleanup(referenced)
+    logger.info(f"Blob store sweep: {len(referenced)} referenced blobs kept, {deleted} deleted")
+    return {"deleted": deleted}
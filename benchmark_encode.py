@@ -0,0 +1,137 @@
+"""
+Benchmark page encode profiles (encode time and output size)
+
+Usage:
+    python benchmark_encode.py page_001.jpg page_002.jpg
+    python benchmark_encode.py --sweep --repeat 5 storage/some-series/en_to_tr/chapter_0001/*.webp
+
+Without image paths a synthetic 800x12000 webtoon strip is used.
+"""
+import argparse
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+import cv2
+import numpy as np
+from app.core.config import settings
+from app.services.image_processor import ENCODE_PROFILES, ImageProcessor
+
+# Alternatives tried per profile with --sweep: (label, FORMAT, METHOD)
+SWEEP = [
+    ("webp m0", "webp", 0),
+    ("webp m2", "webp", 2),
+    ("webp m4", "webp", 4),
+    ("webp m6", "webp", 6),
+    ("avif", "avif", 0),
+    ("png lossless", "png", 0),
+    ("jpeg", "jpeg", 0),
+]
+
+
+def synthetic_page(width: int = 800, height: int = 12000) -> np.ndarray:
+    """Webtoon-like strip: flat panels, gradients, bubbles and text strokes"""
+    rng = np.random.default_rng(0)
+    img = np.full((height, width, 3), 245, dtype=np.uint8)
+    for top in range(0, height, 1500):
+        color = tuple(int(c) for c in rng.integers(40, 220, 3))
+        cv2.rectangle(img, (20, top + 40), (width - 20, top + 1400), color, -1)
+        gradient = np.linspace(0, 60, width - 40, dtype=np.uint8)
+        img[top + 700:top + 1400, 20:width - 20] += gradient[None, :, None]
+        cv2.ellipse(img, (width // 2, top + 400), (220, 120), 0, 0, 360, (255, 255, 255), -1)
+        for line in range(3):
+            cv2.putText(
+                img, "THIS IS A SPEECH BUBBLE", (width // 2 - 180, top + 370 + line * 35),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2
+            )
+    noise = rng.integers(0, 6, img.shape, dtype=np.uint8)
+    return cv2.add(img, noise)
+
+
+@contextmanager
+def override_settings(**values):
+    """Temporarily override settings (restored on exit)"""
+    previous = {name: getattr(settings, name) for name in values}
+    for name, value in values.items():
+        setattr(settings, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(settings, name, value)
+
+
+def load_pages(paths: List[str]) -> List[np.ndarray]:
+    """Decode input pages (synthetic strip if none given)"""
+    if not paths:
+        return [synthetic_page()]
+    pages = []
+    for path in paths:
+        with open(path, "rb") as f:
+            img = ImageProcessor.decode_image(f.read())
+        if img is None:
+            print(f"[SKIP] Could not decode {path}")
+            continue
+        pages.append(img)
+    return pages
+
+
+def run(processor: ImageProcessor, pages: List[np.ndarray], profile: str, repeat: int) -> Tuple[float, int]:
+    """Median encode time per page (ms) and total output size (bytes)"""
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        size = 0
+        start = time.perf_counter()
+        for img in pages:
+            size += len(processor.encode_page(img, profile))
+        timings.append((time.perf_counter() - start) * 1000 / len(pages))
+    return statistics.median(timings), size
+
+
+def benchmark(pages: List[np.ndarray], repeat: int, sweep: bool) -> List[Dict]:
+    """Benchmark the configured profiles (and alternatives with sweep)"""
+    processor = ImageProcessor()
+    rows = []
+    for profile in ENCODE_PROFILES:
+        prefix = f"ENCODE_{profile.upper()}_"
+        variants = [("configured", None, None)]
+        if sweep:
+            variants += SWEEP
+        for label, image_format, method in variants:
+            overrides = {}
+            if image_format is not None:
+                overrides = {prefix + "FORMAT": image_format, prefix + "METHOD": method}
+            with override_settings(**overrides):
+                ms, size = run(processor, pages, profile, repeat)
+            rows.append({"profile": profile, "variant": label, "ms": ms, "size": size})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark page encode profiles")
+    parser.add_argument("images", nargs="*", help="Page images (default: synthetic strip)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant (median is reported)")
+    parser.add_argument("--sweep", action="store_true", help="Also try other formats/methods per profile")
+    args = parser.parse_args()
+    
+    pages = load_pages(args.images)
+    if not pages:
+        print("[ERROR] No pages to encode")
+        return
+    raw_size = sum(img.nbytes for img in pages)
+    
+    print("=" * 60)
+    print("  ENCODE PROFILE BENCHMARK")
+    print("=" * 60)
+    print(f"Pages: {len(pages)} ({raw_size / 1024 / 1024:.1f} MB decoded), repeat: {args.repeat}\n")
+    print(f"{'profile':<10} {'variant':<14} {'ms/page':>9} {'size KB':>10} {'ratio':>7}")
+    for row in benchmark(pages, args.repeat, args.sweep):
+        print(
+            f"{row['profile']:<10} {row['variant']:<14} {row['ms']:>9.1f} "
+            f"{row['size'] / 1024:>10.1f} {raw_size / max(1, row['size']):>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
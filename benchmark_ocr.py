@@ -0,0 +1,127 @@
+"""
+Benchmark OCR backends (latency and recall on a fixture set)
+
+Usage:
+    python benchmark_ocr.py fixtures/ocr
+    python benchmark_ocr.py fixtures/ocr --backends easyocr easyocr_batched --repeat 3
+
+The fixture directory holds page images and an optional labels.json with
+the expected text blocks per image:
+
+    {"page_001.jpg": [{"text": "WHERE ARE YOU GOING?", "coords": [x, y, w, h]}, ...]}
+
+A labelled block counts as found when a detected block covers at least half
+of its box; text similarity is measured on the found blocks. Without labels
+only latency and block counts are reported.
+"""
+import argparse
+import difflib
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List
+from app.core.config import settings
+from app.services.ocr_backends import available_backends
+from app.services.ocr_service import OCRService, _box_overlap
+from app.services.translation_memory import TranslationMemory
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+
+
+def load_fixtures(fixture_dir: Path) -> Dict[str, Dict]:
+    """Page bytes and labels (None if unlabelled) by file name"""
+    labels_path = fixture_dir / "labels.json"
+    labels = json.loads(labels_path.read_text(encoding="utf-8")) if labels_path.exists() else {}
+    fixtures = {}
+    for path in sorted(fixture_dir.iterdir()):
+        if path.suffix.lower() in IMAGE_EXTENSIONS:
+            fixtures[path.name] = {"bytes": path.read_bytes(), "labels": labels.get(path.name)}
+    return fixtures
+
+
+def score_page(expected: List[Dict], detected: List[Dict]) -> Dict[str, float]:
+    """Found labelled blocks and their summed text similarity"""
+    found = 0
+    similarity = 0.0
+    for label in expected:
+        # Overlap relative to the smaller box, so a paragraph covering the line counts
+        matches = [b for b in detected if _box_overlap(label["coords"], b["coords"]) >= 0.5]
+        if not matches:
+            continue
+        found += 1
+        text = " ".join(b["text"] for b in matches)
+        similarity += difflib.SequenceMatcher(
+            None,
+            TranslationMemory.normalize_segment(label["text"]).lower(),
+            TranslationMemory.normalize_segment(text).lower()
+        ).ratio()
+    return {"found": found, "similarity": similarity}
+
+
+def benchmark_backend(name: str, fixtures: Dict[str, Dict], repeat: int) -> Dict:
+    """Run one backend over the fixture set"""
+    ocr = OCRService(backend=name)
+    ocr.cache = None  # Measure OCR, not the cache
+    
+    # First page once untimed: model loading is not part of per-page latency
+    ocr.detect_text_blocks(next(iter(fixtures.values()))["bytes"])
+    
+    timings = []
+    blocks = 0
+    labelled = found = 0
+    similarity = 0.0
+    for fixture in fixtures.values():
+        page_timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            detected = ocr.detect_text_blocks(fixture["bytes"])
+            page_timings.append((time.perf_counter() - start) * 1000)
+        timings.append(statistics.median(page_timings))
+        blocks += len(detected)
+        if fixture["labels"] is not None:
+            score = score_page(fixture["labels"], detected)
+            labelled += len(fixture["labels"])
+            found += score["found"]
+            similarity += score["similarity"]
+    
+    return {
+        "backend": name,
+        "ms": statistics.mean(timings),
+        "blocks": blocks,
+        "recall": found / labelled if labelled else None,
+        "similarity": similarity / found if found else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OCR backends")
+    parser.add_argument("fixtures", help="Directory with page images (and labels.json)")
+    parser.add_argument("--backends", nargs="*", help="Backends to compare (default: all available)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per page (median is reported)")
+    args = parser.parse_args()
+    
+    fixtures = load_fixtures(Path(args.fixtures))
+    if not fixtures:
+        print(f"[ERROR] No images in {args.fixtures}")
+        return
+    backends = args.backends or available_backends()
+    
+    print("=" * 60)
+    print("  OCR BACKEND BENCHMARK")
+    print("=" * 60)
+    print(f"Pages: {len(fixtures)}, languages: {settings.OCR_LANGUAGES}, repeat: {args.repeat}\n")
+    print(f"{'backend':<18} {'ms/page':>9} {'blocks':>7} {'recall':>7} {'text':>6}")
+    for name in backends:
+        try:
+            row = benchmark_backend(name, fixtures, args.repeat)
+        except Exception as e:
+            print(f"{name:<18} [ERROR] {e}")
+            continue
+        recall = f"{row['recall']:.2f}" if row["recall"] is not None else "-"
+        similarity = f"{row['similarity']:.2f}" if row["similarity"] is not None else "-"
+        print(f"{name:<18} {row['ms']:>9.1f} {row['blocks']:>7} {recall:>7} {similarity:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -125,6 +125,11 @@ async def health_check():
         health_status["redis"] = f"error: {str(e)}"
         health_status["status"] = "unhealthy"
     
+    # Warm Celery worker processes (see app.core.warmup)
+    if settings.WARMUP_ENABLED:
+        from app.core.warmup import ready_workers
+        health_status["ready_workers"] = ready_workers()
+    
     status_code = 200 if health_status["status"] == "healthy" else 503
     return health_status
 
@@ -1,3 +1,5 @@
+import os
+import tempfile
 import pytest
 import asyncio
 from typing import Generator, AsyncGenerator
@@ -7,6 +9,9 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from httpx import AsyncClient
 
+# The app's own engine (app.db.session) must not create a SQLite file in the working tree
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'webtoon_test.db')}")
+
 from main import app
 from app.db.base import Base
 from app.db.session import get_db
@@ -0,0 +1,46 @@
+import os
+import time
+import pytest
+from app.core.config import settings
+from app.services.blob_store import BlobStore, result_refs
+
+@pytest.fixture
+def blob_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "BLOB_STORE_BACKEND", "local")
+    monkeypatch.setattr(settings, "BLOB_STORE_PATH", str(tmp_path / "blobs"))
+    return BlobStore()
+
+def age(blob_store, ref, seconds):
+    # Backdate a blob as if it was last written or reused seconds ago
+    past = time.time() - seconds
+    os.utime(blob_store._local_path(ref), (past, past))
+
+def test_put_is_content_addressed(blob_store):
+    ref = blob_store.put(b"page")
+    
+    assert blob_store.put(b"page") == ref
+    assert blob_store.get(ref) == b"page"
+    assert blob_store.resolve(ref) == b"page"
+
+def test_cleanup_keeps_referenced_blobs(blob_store):
+    kept = blob_store.put(b"referenced by a job")
+    expired = blob_store.put(b"unreferenced")
+    recent = blob_store.put(b"unreferenced, recent")
+    for ref in (kept, expired):
+        age(blob_store, ref, 3600)
+    
+    referenced = result_refs([{"page_refs": [kept], "cleaned_page_refs": [None]}, None])
+    
+    assert blob_store.cleanup(referenced, max_age=60) == 1
+    assert blob_store.get(kept) == b"referenced by a job"
+    assert blob_store.get(expired) is None
+    assert blob_store.get(recent) == b"unreferenced, recent"
+
+def test_reuse_restarts_retention(blob_store):
+    ref = blob_store.put(b"page")
+    age(blob_store, ref, 3600)
+    
+    # A new result referencing the same page
+    blob_store.put(b"page")
+    
+    assert blob_store.cleanup(set(), max_age=60) == 0
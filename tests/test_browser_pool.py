@@ -0,0 +1,150 @@
+import threading
+import time
+import pytest
+from app.services.scrapers import browser_pool
+from app.services.scrapers.browser_pool import BrowserPool
+
+class FakeDriver:
+    # Stands in for an undetected-chromedriver Chrome instance
+    def __init__(self):
+        self.alive = True
+        self.quit_called = False
+        self.loaded = []
+    
+    def get(self, url):
+        self.loaded.append(url)
+    
+    def execute_script(self, script, *args):
+        if not self.alive:
+            raise RuntimeError("chrome not reachable")
+        return 1
+    
+    def quit(self):
+        self.quit_called = True
+
+@pytest.fixture
+def drivers(monkeypatch):
+    started = []
+    
+    def start_driver():
+        driver = FakeDriver()
+        started.append(driver)
+        return driver
+    
+    monkeypatch.setattr(browser_pool, "_start_driver", start_driver)
+    return started
+
+def test_lease_reuses_warm_session(drivers):
+    pool = BrowserPool(size=1, max_pages=10, lease_timeout=60)
+    
+    with pool.lease() as session:
+        session.get("https://example.com/1")
+    with pool.lease() as session:
+        session.get("https://example.com/2")
+    
+    assert len(drivers) == 1
+    assert drivers[0].loaded == ["https://example.com/1", "https://example.com/2"]
+    assert pool.stats() == {"size": 1, "idle": 1, "leased": 0, "starting": 0}
+
+def test_session_recycled_after_max_pages(drivers):
+    pool = BrowserPool(size=1, max_pages=2, lease_timeout=60)
+    
+    for page in range(3):
+        with pool.lease() as session:
+            session.get(f"https://example.com/{page}")
+            session.get(f"https://example.com/{page}/next")
+    
+    assert len(drivers) == 3
+    assert all(driver.quit_called for driver in drivers)
+
+def test_session_recycled_after_error(drivers):
+    pool = BrowserPool(size=1, max_pages=10, lease_timeout=60)
+    
+    with pytest.raises(ValueError):
+        with pool.lease() as session:
+            raise ValueError("page broke")
+    with pool.lease():
+        pass
+    
+    assert len(drivers) == 2
+    assert drivers[0].quit_called
+
+def test_unhealthy_idle_session_replaced(drivers):
+    pool = BrowserPool(size=1, max_pages=10, lease_timeout=60)
+    with pool.lease():
+        pass
+    drivers[0].alive = False
+    
+    with pool.lease() as session:
+        assert session.driver is drivers[1]
+    
+    assert drivers[0].quit_called
+
+def test_lease_waits_for_release(drivers):
+    pool = BrowserPool(size=1, max_pages=10, lease_timeout=60)
+    leased = threading.Event()
+    
+    def hold_session():
+        with pool.lease():
+            leased.set()
+            time.sleep(0.2)
+    
+    holder = threading.Thread(target=hold_session)
+    holder.start()
+    leased.wait()
+    
+    start = time.monotonic()
+    with pool.lease(timeout=5):
+        waited = time.monotonic() - start
+    holder.join()
+    
+    assert waited >= 0.1
+    assert len(drivers) == 1
+
+def test_lease_timeout_when_pool_busy(drivers):
+    pool = BrowserPool(size=1, max_pages=10, lease_timeout=60)
+    
+    with pool.lease():
+        with pytest.raises(TimeoutError):
+            with pool.lease(timeout=0.1):
+                pass
+
+def test_expired_lease_reclaimed(drivers):
+    pool = BrowserPool(size=1, max_pages=10, lease_timeout=0.1)
+    
+    with pool.lease() as hung:
+        with pool.lease(timeout=2) as session:
+            assert session.driver is drivers[1]
+        # The hung task cannot use its reclaimed browser any more
+        with pytest.raises(RuntimeError):
+            hung.get("https://example.com")
+    
+    assert drivers[0].quit_called
+
+def test_browser_pool_per_process(monkeypatch):
+    monkeypatch.setattr(browser_pool, "_browser_pool", None)
+    pool = browser_pool.get_browser_pool()
+    assert browser_pool.get_browser_pool() is pool
+    
+    # A forked child gets its own pool
+    monkeypatch.setattr(browser_pool, "_browser_pool_pid", -1)
+    assert browser_pool.get_browser_pool() is not pool
+
+def test_restarts_capped_per_lease(drivers, monkeypatch):
+    def start_dead_driver():
+        driver = FakeDriver()
+        driver.alive = False
+        drivers.append(driver)
+        return driver
+    
+    monkeypatch.setattr(browser_pool, "_start_driver", start_dead_driver)
+    pool = BrowserPool(size=1, max_pages=10, lease_timeout=60, max_restarts=2)
+    
+    with pytest.raises(RuntimeError):
+        with pool.lease():
+            pass
+    
+    # The first session and two restarts, all stopped, the slot freed
+    assert len(drivers) == 3
+    assert all(driver.quit_called for driver in drivers)
+    assert pool.stats() == {"size": 1, "idle": 0, "leased": 0, "starting": 0}
@@ -0,0 +1,51 @@
+import pytest
+from app.core.config import settings
+from app.services import hf_model_registry as registry_module
+from app.services.hf_model_registry import HFModelRegistry
+
+class FlakyRegistry(HFModelRegistry):
+    # Registry whose model loads fail a given number of times first
+    def __init__(self, failures):
+        super().__init__(max_bytes=0)
+        self.failures = failures
+        self.loads = 0
+    
+    def _load(self, source_lang, target_lang):
+        self.loads += 1
+        if self.loads <= self.failures:
+            return None, 0
+        return object(), 1
+
+@pytest.fixture(autouse=True)
+def registry_settings(monkeypatch):
+    monkeypatch.setattr(registry_module, "TRANSFORMERS_AVAILABLE", True)
+    monkeypatch.setattr(settings, "HF_LOAD_MAX_ATTEMPTS", 3)
+    monkeypatch.setattr(settings, "HF_LOAD_RETRY_SECONDS", 60)
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(registry_module.time, "monotonic", lambda: now[0])
+    return now
+
+def test_transient_failure_retried_after_backoff(clock):
+    registry = FlakyRegistry(failures=1)
+    
+    assert registry.get("en", "tr") is None
+    # Within the backoff window the load is not attempted again
+    assert registry.get("en", "tr") is None
+    assert registry.loads == 1
+    
+    clock[0] += 60
+    assert registry.get("en", "tr") is not None
+    assert registry.loads == 2
+
+def test_pair_unavailable_after_max_attempts(clock):
+    registry = FlakyRegistry(failures=10)
+    
+    for _ in range(5):
+        registry.get("en", "tr")
+        clock[0] += 3600
+    
+    assert registry.loads == 3
+    assert registry.get("en", "tr") is None
@@ -0,0 +1,142 @@
+import pytest
+import numpy as np
+import cv2
+from app.services.ocr_service import _may_contain_text, _merge_tile_blocks, _tile_ranges, group_text_blocks
+
+def blank_page(height=1600, width=800, value=255):
+    # Grayscale webtoon strip
+    return np.full((height, width), value, dtype=np.uint8)
+
+def sfx_page(text, scale, background=255, color=0):
+    # A single piece of large lettering, nothing else on the page
+    page = blank_page(value=background)
+    cv2.putText(page, text, (20, 850), cv2.FONT_HERSHEY_SIMPLEX, scale, color, int(scale * 3))
+    return page
+
+def test_precheck_dialogue_page():
+    page = blank_page()
+    cv2.putText(page, "WHERE ARE YOU GOING?", (40, 400), cv2.FONT_HERSHEY_SIMPLEX, 1, 0, 2)
+    
+    assert _may_contain_text(page)
+
+@pytest.mark.parametrize("text,scale", [("BOOM", 6), ("BOOM", 8), ("BAM", 12)])
+def test_precheck_sfx_only_page(text, scale):
+    # Large SFX must not be classified as textless
+    assert _may_contain_text(sfx_page(text, scale))
+
+def test_precheck_light_sfx_on_dark_page():
+    assert _may_contain_text(sfx_page("KRAK", 7, background=30, color=230))
+
+def test_precheck_blank_page():
+    assert not _may_contain_text(blank_page())
+    assert not _may_contain_text(blank_page(value=0))
+
+def test_precheck_gradient_page():
+    # Sky/background gradient without any lettering
+    page = np.tile(np.linspace(0, 255, 800, dtype=np.uint8), (1600, 1))
+    
+    assert not _may_contain_text(page)
+
+def test_precheck_flat_shapes_page():
+    # Large flat-colored art (panel fill, silhouette)
+    page = blank_page()
+    cv2.rectangle(page, (100, 200), (700, 1400), 60, -1)
+    cv2.ellipse(page, (400, 800), (250, 120), 30, 0, 360, 200, -1)
+    cv2.circle(page, (400, 300), 80, 120, -1)
+    
+    assert not _may_contain_text(page)
+
+def test_precheck_soft_texture_page():
+    # Blurred noise, like a painted background
+    rng = np.random.default_rng(0)
+    page = cv2.GaussianBlur(rng.integers(0, 255, (1600, 800), dtype=np.uint8), (31, 31), 0)
+    
+    assert not _may_contain_text(page)
+
+def line(text, x, y, w, h, confidence=0.9):
+    # One OCR line block as returned by detect_text_blocks
+    return {"text": text, "coords": [x, y, w, h], "confidence": confidence}
+
+def test_group_text_blocks_merges_bubble_lines():
+    blocks = [
+        line("WHERE ARE", 100, 100, 120, 20),
+        line("YOU GO-", 110, 124, 100, 20),
+        line("ing?", 130, 148, 40, 20),
+        # Another bubble further down the page
+        line("HEY!", 400, 600, 60, 22)
+    ]
+    
+    grouped = group_text_blocks(blocks, line_gap=0.6, max_height_ratio=1.8)
+    
+    assert len(grouped) == 2
+    assert grouped[0]["text"] == "WHERE ARE YOU GOing?"
+    assert grouped[0]["coords"] == [100, 100, 120, 68]
+    assert len(grouped[0]["lines"]) == 3
+    assert grouped[1]["text"] == "HEY!"
+
+def test_group_text_blocks_keeps_distant_and_mismatched_lines():
+    blocks = [
+        line("small", 100, 100, 60, 16),
+        # Title lettering right below, but three times taller
+        line("BIG", 100, 120, 200, 60),
+        # Same height as the first line, far below it
+        line("later", 100, 300, 60, 16)
+    ]
+    
+    grouped = group_text_blocks(blocks, line_gap=0.6, max_height_ratio=1.8)
+    
+    assert [block["text"] for block in grouped] == ["small", "BIG", "later"]
+
+def test_tile_ranges_cover_page_with_overlap():
+    assert _tile_ranges(1000, 2000, 200) == [(0, 1000)]
+    assert _tile_ranges(5000, 2000, 200) == [(0, 2000), (1800, 3800), (3600, 5000)]
+    
+    for height in (2001, 3799, 10000):
+        tiles = _tile_ranges(height, 2000, 200)
+        assert tiles[0][0] == 0 and tiles[-1][1] == height
+        for (_, bottom), (top, _) in zip(tiles, tiles[1:]):
+            assert bottom - top == 200
+
+def test_merge_tile_blocks_deduplicates_seam():
+    tiles = [(0, 2000), (1800, 3800)]
+    tile_blocks = [
+        [
+            line("top", 50, 500, 100, 20),
+            # Line in the overlap, seen whole by both tiles
+            line("seam", 50, 1850, 100, 20, confidence=0.7),
+            # Cut by the bottom edge of the first tile
+            line("cut", 50, 1990, 100, 10)
+        ],
+        [
+            line("seam", 52, 50, 98, 20, confidence=0.9),
+            line("cut whole", 50, 190, 100, 20),
+            line("bottom", 50, 1500, 100, 20)
+        ]
+    ]
+    
+    merged = _merge_tile_blocks(tile_blocks, tiles, 3800, 200)
+    
+    assert [block["text"] for block in merged] == ["top", "seam", "cut whole", "bottom"]
+    # The seam line lies above the middle of the overlap: the first tile owns it
+    assert merged[1]["coords"] == [50, 1850, 100, 20]
+    assert merged[1]["confidence"] == 0.7
+    assert merged[2]["coords"] == [50, 1990, 100, 20]
+    assert merged[3]["coords"] == [50, 3300, 100, 20]
+
+def test_merge_tile_blocks_keeps_text_taller_than_overlap():
+    tiles = [(0, 2000), (1800, 3800)]
+    tile_blocks = [
+        # SFX from 1700 to 2300: neither tile sees it whole
+        [line("BOO", 100, 1700, 300, 300, confidence=0.6)],
+        [
+            line("BOOM", 100, 0, 300, 500, confidence=0.8),
+            # Cut by the top edge, missed by the first tile
+            line("lost", 500, 0, 100, 30)
+        ]
+    ]
+    
+    merged = _merge_tile_blocks(tile_blocks, tiles, 3800, 200)
+    
+    assert [block["text"] for block in merged] == ["BOOM", "lost"]
+    assert merged[0]["coords"] == [100, 1700, 300, 600]
+    assert merged[1]["coords"] == [500, 1800, 100, 30]
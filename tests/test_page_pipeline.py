@@ -0,0 +1,90 @@
+import random
+import threading
+import time
+import numpy as np
+import pytest
+from app.core.config import settings
+from app.operations.page_pipeline import PagePipeline
+
+class FakeOCR:
+    # OCR stand-in: every page has one block naming the page, pages finish out of order
+    def __init__(self, supports_batch=False):
+        self.supports_batch = supports_batch
+        self.batches = []
+        self._lock = threading.Lock()
+    
+    def may_contain_text(self, image_bytes, image=None):
+        return image_bytes != b"textless"
+    
+    def detect_text_blocks(self, image_bytes, image=None):
+        time.sleep(random.uniform(0, 0.02))
+        return [{"text": image_bytes.decode(), "coords": [0, 0, 10, 10], "confidence": 0.9}]
+    
+    def detect_text_blocks_batch(self, pages, images=None):
+        with self._lock:
+            self.batches.append(len(pages))
+        return [self.detect_text_blocks(page) for page in pages]
+
+class FakeProcessor:
+    # In-painting stand-in working on tiny arrays
+    def decode_image(self, image_bytes):
+        return np.zeros((4, 4, 3), dtype=np.uint8)
+    
+    def clean_page(self, image, blocks):
+        time.sleep(random.uniform(0, 0.02))
+        return image
+    
+    def encode_page(self, image, profile):
+        return b"cleaned"
+    
+    def clean_image(self, image_bytes, blocks):
+        return b"cleaned"
+
+@pytest.fixture(autouse=True)
+def pipeline_settings(monkeypatch):
+    monkeypatch.setattr(settings, "TEXT_PRECHECK_ENABLED", True)
+    monkeypatch.setattr(settings, "BUBBLE_GROUPING_ENABLED", False)
+    monkeypatch.setattr(settings, "OCR_BATCH_PAGES", 3)
+
+def submit_shuffled(pipeline, pages):
+    # Pages arrive in download completion order, not chapter order
+    order = list(range(len(pages)))
+    random.Random(7).shuffle(order)
+    for index in order:
+        pipeline.submit_page(index, pages[index])
+
+@pytest.mark.parametrize("supports_batch", [False, True])
+def test_results_in_chapter_order(supports_batch):
+    ocr = FakeOCR(supports_batch=supports_batch)
+    pipeline = PagePipeline(ocr, FakeProcessor(), clean=True)
+    pages = [f"page-{index}".encode() for index in range(8)]
+    
+    submit_shuffled(pipeline, pages)
+    
+    assert pipeline.collect_pages() == pages
+    blocks = pipeline.collect_blocks()
+    assert [page_blocks[0]["text"] for page_blocks in blocks] == [page.decode() for page in pages]
+    assert pipeline.collect_cleaned() == [b"cleaned"] * len(pages)
+    if supports_batch:
+        # Two full groups of OCR_BATCH_PAGES, the rest flushed by collect_blocks()
+        assert sorted(ocr.batches) == [2, 3, 3]
+
+def test_textless_page_passes_through():
+    pipeline = PagePipeline(FakeOCR(), FakeProcessor(), clean=True)
+    pages = [b"page-0", b"textless", b"page-2"]
+    
+    submit_shuffled(pipeline, pages)
+    
+    assert pipeline.collect_blocks()[1] == []
+    # Original bytes stand in for the cleaned page
+    assert pipeline.collect_cleaned() == [b"cleaned", b"textless", b"cleaned"]
+    assert pipeline.skipped_pages == 1
+
+def test_duplicate_submission_ignored():
+    pipeline = PagePipeline(FakeOCR(), FakeProcessor(), clean=False)
+    
+    pipeline.submit_page(0, b"page-0")
+    pipeline.submit_page(0, b"page-0 again")
+    
+    assert pipeline.collect_pages() == [b"page-0"]
+    assert pipeline.collect_cleaned() == [None]
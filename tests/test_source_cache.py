@@ -0,0 +1,98 @@
+import asyncio
+import httpx
+import pytest
+from app.core.config import settings
+from app.services.scrapers.source_cache import SourceCache, cache_lifetime
+from app.services.scrapers.webtoons_scraper import WebtoonsScraper
+
+IMAGE_URL = "https://webtoon-phinf.pstatic.net/page1.jpg"
+
+@pytest.fixture
+def source_cache(tmp_path, monkeypatch):
+    # Scrapers must not open the default cache in the working tree
+    monkeypatch.setattr(settings, "SOURCE_CACHE_ENABLED", False)
+    return SourceCache(str(tmp_path / "sources"), max_bytes=1024 * 1024)
+
+def test_cache_lifetime():
+    assert cache_lifetime({}, 60) == 60
+    assert cache_lifetime({"cache-control": "public, max-age=300"}, 60) == 300
+    assert cache_lifetime({"cache-control": "no-cache"}, 60) == 0
+    assert cache_lifetime({"cache-control": "no-store"}, 60) is None
+    assert cache_lifetime({"cache-control": "private, max-age=300"}, 60) is None
+
+def test_put_and_get(source_cache):
+    source_cache.put(IMAGE_URL, b"page", 60, etag='"v1"', encoding="utf-8")
+    entry = source_cache.get(IMAGE_URL)
+    
+    assert entry["body"] == b"page"
+    assert entry["etag"] == '"v1"'
+    assert entry["encoding"] == "utf-8"
+    assert entry["fresh"]
+    assert source_cache.get("https://webtoon-phinf.pstatic.net/other.jpg") is None
+
+def test_stale_entry_needs_revalidation(source_cache):
+    source_cache.put(IMAGE_URL, b"page", 0, etag='"v1"')
+    assert not source_cache.get(IMAGE_URL)["fresh"]
+    
+    source_cache.refresh(IMAGE_URL, 60, etag='"v2"')
+    entry = source_cache.get(IMAGE_URL)
+    
+    assert entry["fresh"]
+    assert entry["etag"] == '"v2"'
+
+def test_eviction_keeps_recently_used(tmp_path):
+    cache = SourceCache(str(tmp_path / "sources"), max_bytes=250)
+    for page in range(3):
+        cache.put(f"https://cdn.example.com/{page}.jpg", bytes(100), 60)
+        # Page 0 is read after every write, so it stays the most recently used
+        assert cache.get("https://cdn.example.com/0.jpg") is not None
+    
+    assert cache.get("https://cdn.example.com/1.jpg") is None
+    assert cache.get("https://cdn.example.com/2.jpg") is not None
+
+def run_download(source_cache, handler):
+    # One image download through the source cache, against a mocked CDN
+    async def download():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        scraper = WebtoonsScraper(client=client)
+        scraper.source_cache = source_cache
+        try:
+            return await scraper.download_image(IMAGE_URL)
+        finally:
+            await client.aclose()
+    
+    return asyncio.run(download())
+
+def test_download_served_from_fresh_cache(source_cache):
+    requests = []
+    
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, content=b"page", headers={"cache-control": "max-age=300"})
+    
+    assert run_download(source_cache, handler) == b"page"
+    assert run_download(source_cache, handler) == b"page"
+    assert len(requests) == 1
+
+def test_download_revalidates_stale_entry(source_cache):
+    requests = []
+    
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=b"page", headers={"etag": '"v1"', "cache-control": "no-cache"})
+    
+    assert run_download(source_cache, handler) == b"page"
+    # Stale (no-cache): revalidated, the 304 serves the cached body
+    assert run_download(source_cache, handler) == b"page"
+    
+    assert len(requests) == 2
+    assert requests[1].headers["if-none-match"] == '"v1"'
+
+def test_no_store_response_not_cached(source_cache):
+    def handler(request):
+        return httpx.Response(200, content=b"page", headers={"cache-control": "no-store"})
+    
+    assert run_download(source_cache, handler) == b"page"
+    assert source_cache.get(IMAGE_URL) is None
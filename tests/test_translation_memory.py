@@ -0,0 +1,88 @@
+import pytest
+from app.services.translation_memory import TranslationMemory
+
+class FakeRedis:
+    # In-memory stand-in for the Redis hash commands used by the memory
+    def __init__(self):
+        self.hashes = {}
+    
+    def hmget(self, key, fields):
+        stored = self.hashes.get(key, {})
+        return [stored.get(field) for field in fields]
+    
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+    
+    def expire(self, key, ttl):
+        return True
+    
+    def pipeline(self):
+        return self
+    
+    def execute(self):
+        return []
+
+@pytest.fixture
+def memory():
+    tm = TranslationMemory()
+    tm.redis = FakeRedis()
+    return tm
+
+def backend(calls):
+    # Translation backend stand-in recording the segments sent to it
+    def translate(texts):
+        calls.append(list(texts))
+        return [f"tr:{text}" if text.isalpha() else text for text in texts], [True] * len(texts)
+    return translate
+
+def test_only_misses_sent_to_backend(memory):
+    calls = []
+    texts = ["Hello", "Bye", "Hello"]
+    
+    assert memory.translate_with_memory(texts, backend(calls), "en", "tr", "ai:test") == ["tr:Hello", "tr:Bye", "tr:Hello"]
+    # Repeated segments are translated once
+    assert calls == [["Hello", "Bye"]]
+    
+    assert memory.translate_with_memory(["Bye", "Thanks"], backend(calls), "en", "tr", "ai:test") == ["tr:Bye", "tr:Thanks"]
+    assert calls[1] == ["Thanks"]
+
+def test_segments_normalized(memory):
+    calls = []
+    memory.translate_with_memory(["Hello"], backend(calls), "en", "tr", "ai:test")
+    
+    assert memory.lookup(["  Hello ", "Ｈｅｌｌｏ"], "en", "tr", "ai:test") == ["tr:Hello", "tr:Hello"]
+
+def test_identity_translation_stored(memory):
+    calls = []
+    memory.translate_with_memory(["...", "?!"], backend(calls), "en", "tr", "ai:test")
+    
+    assert memory.lookup(["...", "?!"], "en", "tr", "ai:test") == ["...", "?!"]
+
+def test_backend_failure_not_stored(memory):
+    # Failed items come back untranslated and flagged
+    def translate(texts):
+        return ["tr:Hello", "Bye"], [True, False]
+    
+    assert memory.translate_with_memory(["Hello", "Bye"], translate, "en", "tr", "ai:test") == ["tr:Hello", "Bye"]
+    
+    assert memory.lookup(["Hello", "Bye"], "en", "tr", "ai:test") == ["tr:Hello", None]
+
+def test_misaligned_response_not_stored(memory):
+    # One translation short: the response can no longer be matched to the segments
+    def translate(texts):
+        return ["tr:Bye"], [True]
+    
+    assert memory.translate_with_memory(["Hello", "Bye"], translate, "en", "tr", "ai:test") == ["tr:Bye", ""]
+    
+    assert memory.lookup(["Hello", "Bye"], "en", "tr", "ai:test") == [None, None]
+
+def test_memory_scoped_by_series_provider_and_glossary(memory):
+    calls = []
+    memory.translate_with_memory(["Jin"], backend(calls), "en", "tr", "ai:test", series_name="A", glossary={"Jin": "Cin"})
+    
+    assert memory.lookup(["Jin"], "en", "tr", "ai:test", series_name="A", glossary={"Jin": "Cin"}) == ["tr:Jin"]
+    assert memory.lookup(["Jin"], "en", "tr", "ai:test", series_name="B", glossary={"Jin": "Cin"}) == [None]
+    assert memory.lookup(["Jin"], "en", "tr", "free:google", series_name="A", glossary={"Jin": "Cin"}) == [None]
+    # Editing the glossary starts a new memory
+    assert memory.lookup(["Jin"], "en", "tr", "ai:test", series_name="A", glossary={"Jin": "Jinu"}) == [None]
+    assert memory.lookup(["Jin"], "en", "tr", "ai:test", series_name="A") == [None]
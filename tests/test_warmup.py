@@ -0,0 +1,59 @@
+import threading
+import time
+import pytest
+from app.core import warmup
+from app.core.config import settings
+
+class FakeRedis:
+    # Records readiness announcements instead of writing them to Redis
+    def __init__(self):
+        self.keys = {}
+        self.writes = 0
+    
+    def setex(self, key, ttl, value):
+        self.keys[key] = value
+        self.writes += 1
+    
+    def delete(self, key):
+        self.keys.pop(key, None)
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = FakeRedis()
+    monkeypatch.setattr(warmup, "_redis_client", lambda: client)
+    yield client
+    warmup.mark_not_ready()
+
+def test_slow_step_does_not_block_warmup(fake_redis, monkeypatch):
+    release = threading.Event()
+    loaded = []
+    monkeypatch.setattr(settings, "WARMUP_TIMEOUT", 0.2)
+    monkeypatch.setattr(warmup, "_warmup_steps", lambda: [
+        ("fast", lambda: loaded.append("fast")),
+        ("slow", release.wait),
+        ("skipped", lambda: loaded.append("skipped"))
+    ])
+    
+    start = time.monotonic()
+    timings = warmup.warmup_worker()
+    release.set()
+    
+    assert time.monotonic() - start < 2
+    assert loaded == ["fast"]
+    assert "fast" in timings and "slow" not in timings
+    # Still announced as ready, the slow singleton loads lazily
+    assert list(fake_redis.keys) == [warmup._ready_key()]
+
+def test_readiness_refreshed_until_withdrawn(fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "WORKER_READY_TTL", 3)
+    warmup.mark_ready()
+    time.sleep(1.5)
+    
+    assert fake_redis.writes >= 2
+    
+    warmup.mark_not_ready()
+    writes = fake_redis.writes
+    time.sleep(1.2)
+    
+    assert fake_redis.keys == {}
+    assert fake_redis.writes == writes